@@ -10,223 +10,2593 @@ import xml.etree.ElementTree as ET
 import argparse
 import json
 import gzip
+import hashlib
+import sqlite3
 from pathlib import Path
-from typing import Dict, List, Set, Optional
+from typing import Callable, Dict, List, Set, Optional, Tuple, NamedTuple
 import sys
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 import threading
-import pandas as pd
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
+import queue
+import heapq
+import itertools
+import fnmatch
+import pickle
+import tempfile
+import re
+import time
+import zlib
+import contextlib
+import ctypes
+import ctypes.util
+import errno
+import select
+import struct
+import io
+from abc import ABC, abstractmethod
+import unicodedata
+import html
+import importlib
+import importlib.util
+from collections import Counter, deque
+from functools import lru_cache
+from array import array
+
+class LazyModule:
+    """Placeholder that imports a module on first attribute access.
+    
+    numpy, pandas and openpyxl are only needed by the Excel and columnar
+    exporters; loading them at startup would make every --json or --db run
+    pay for them.
+    """
+    
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+    
+    def __getattr__(self, attr: str):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+    
+    def __repr__(self) -> str:
+        return f"<lazy module '{self._name}'{' (loaded)' if self._module is not None else ''}>"
+
+
+# Schwere Abhängigkeiten der Exporter (erst bei Benutzung importiert)
+np = LazyModule('numpy')
+pd = LazyModule('pandas')
+openpyxl = LazyModule('openpyxl')
+openpyxl_styles = LazyModule('openpyxl.styles')
+openpyxl_utils = LazyModule('openpyxl.utils')
+openpyxl_cell = LazyModule('openpyxl.cell')
+
+# Optionales C-beschleunigtes Parser-Backend
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+# Bump whenever the extracted project structure changes (invalidates caches)
+PARSER_VERSION = '2'
+# Bump whenever the decoded sample references change (invalidates only --samples caches)
+SAMPLE_REF_VERSION = '2'
+# RelativePathType: der relative Pfad bezieht sich auf den Ordner des Sets
+RELATIVE_TO_PROJECT = '3'
+# Windows und macOS legen Dateisysteme standardmäßig ohne Unterscheidung der Groß-/Kleinschreibung an
+CASE_INSENSITIVE_PLATFORM = os.name == 'nt' or sys.platform == 'darwin'
+
+class PluginRecord:
+    """Interned VST plugin (one instance per distinct plugin).
+    
+    Supports item access like the plugin dicts it replaces, so exporters can
+    keep using vst['manufacturer'] / vst.get('filename').
+    """
+    
+    __slots__ = ('id', 'name', 'filename', 'version', 'manufacturer', 'key')
+    
+    def __init__(self, plugin_id: int, name: str, filename: str, version: str, manufacturer: str):
+        self.id = plugin_id
+        self.name = name
+        self.filename = filename
+        self.version = version
+        self.manufacturer = manufacturer
+        self.key = f"{manufacturer} - {name}"
+    
+    def __getitem__(self, field: str) -> str:
+        if field not in ('name', 'filename', 'version', 'manufacturer'):
+            raise KeyError(field)
+        return getattr(self, field)
+    
+    def get(self, field: str, default=None):
+        try:
+            return self[field]
+        except KeyError:
+            return default
+    
+    def as_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'filename': self.filename,
+            'version': self.version,
+            'manufacturer': self.manufacturer
+        }
+
+
+class PluginRegistry:
+    """Global table of interned plugins addressed by integer IDs"""
+    
+    def __init__(self):
+        self.records = []
+        self.ids = {}
+        self.lock = threading.Lock()
+    
+    def intern(self, vst: Dict) -> int:
+        identity = (vst['manufacturer'], vst['name'], vst.get('filename', ''), vst.get('version', ''))
+        plugin_id = self.ids.get(identity)
+        if plugin_id is None:
+            with self.lock:
+                plugin_id = self.ids.get(identity)
+                if plugin_id is None:
+                    plugin_id = len(self.records)
+                    self.records.append(PluginRecord(plugin_id, vst['name'], identity[2], identity[3],
+                                                     vst['manufacturer']))
+                    self.ids[identity] = plugin_id
+        return plugin_id
+    
+    def intern_all(self, vsts: List[Dict]) -> array:
+        return array('I', [self.intern(vst) for vst in vsts])
+    
+    def resolve(self, plugin_ids) -> List[PluginRecord]:
+        records = self.records
+        return [records[plugin_id] for plugin_id in plugin_ids]
+    
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+# Regeldatei für die Hersteller-Erkennung (liegt neben dem Skript)
+DEFAULT_MANUFACTURER_RULES = Path(__file__).with_name("manufacturer_rules.json")
+
+# Fallback, falls die Regeldatei fehlt
+BUILTIN_MANUFACTURER_RULES = {
+    'rules': [
+        {'contains': 'Maschine', 'manufacturer': 'Native Instruments'},
+        {'contains': 'Serum', 'manufacturer': 'Xfer Records'},
+        {'contains': 'Massive', 'manufacturer': 'Native Instruments'},
+        {'contains': 'FabFilter', 'manufacturer': 'FabFilter'},
+        {'contains': 'iZotope', 'manufacturer': 'iZotope'},
+        {'contains': 'Youlean', 'manufacturer': 'Youlean'},
+        {'contains': 'AR TG', 'manufacturer': 'AR TG'},
+    ],
+    'default': 'Unbekannt'
+}
+
+
+# Globale Inline-Flags am Anfang einer Regex-Regel, z.B. "(?i)serum"
+LEADING_FLAGS = re.compile(r'^\(\?([aiLmsux]+)\)')
+# Nicht einbettbar: Rückverweise (Gruppennummern verschieben sich im kombinierten Muster) und
+# Verbose-Modus (ein Kommentar würde die schließenden Klammern verschlucken)
+NOT_EMBEDDABLE = re.compile(r'\\[1-9]|\(\?P=|\\g<|\(\?[aiLmsu]*x')
+
+
+class ManufacturerResolver:
+    """Infers a plugin manufacturer from its filename using ordered rules.
+    
+    The rules are compiled into one regular expression (one lookahead
+    alternative per rule, in rule order), so a single scan finds the
+    highest-priority matching rule. Regex rules that cannot be embedded
+    (backreferences, named groups, verbose mode) are matched on their own
+    and merged by priority. Results are memoized per filename in a bounded
+    LRU cache.
+    """
+    
+    def __init__(self, rules: List[Dict], default: str = 'Unbekannt', cache_size: int = 4096):
+        self.default = default
+        self.manufacturers = []
+        # Einzeln geprüfte Regeln: (Index, kompiliertes Muster)
+        self.separate = []
+        alternatives = []
+        for index, rule in enumerate(rules):
+            if 'contains' in rule:
+                pattern = re.escape(rule['contains'])
+            elif 'prefix' in rule:
+                pattern = '^' + re.escape(rule['prefix'])
+            elif 'regex' in rule:
+                pattern = rule['regex']
+            else:
+                raise ValueError(f"Manufacturer rule {index} needs 'contains', 'prefix' or 'regex'")
+            # Jede Regel erst für sich kompilieren: Fehler nennen die Regel statt das kombinierte Muster
+            try:
+                compiled = re.compile(pattern, re.IGNORECASE if rule.get('ignore_case') else 0)
+            except re.error as e:
+                raise ValueError(f"Manufacturer rule {index}: invalid regex {pattern!r}: {e}") from None
+            self.manufacturers.append(rule['manufacturer'])
+            if compiled.groupindex or NOT_EMBEDDABLE.search(pattern):
+                self.separate.append((index, compiled))
+                continue
+            pattern = self.scoped_flags(pattern)
+            if rule.get('ignore_case'):
+                pattern = f'(?i:{pattern})'
+            alternatives.append(f'(?P<r{index}>{pattern})')
+        self.matcher = re.compile('(?=' + '|'.join(alternatives) + ')') if alternatives else None
+        self.fingerprint = hashlib.blake2b(
+            json.dumps([rules, default], sort_keys=True).encode('utf-8'), digest_size=8).hexdigest()
+        self.resolve = lru_cache(maxsize=cache_size)(self.match)
+    
+    @classmethod
+    def from_file(cls, rules_file: Optional[str] = None) -> 'ManufacturerResolver':
+        """Loads rules from a JSON file (default: manufacturer_rules.json next to the script)"""
+        path = Path(rules_file) if rules_file else DEFAULT_MANUFACTURER_RULES
+        if rules_file or path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        else:
+            config = BUILTIN_MANUFACTURER_RULES
+        return cls(config.get('rules', []), config.get('default', 'Unbekannt'))
+    
+    @staticmethod
+    def scoped_flags(pattern: str) -> str:
+        """Turns leading global flags ("(?i)x") into a scoped group ("(?i:x)") that can be embedded"""
+        flags = LEADING_FLAGS.match(pattern)
+        if flags is None:
+            return pattern
+        return f'(?{flags.group(1)}:{pattern[flags.end():]})'
+    
+    def match(self, filename: str) -> str:
+        best = None
+        if self.matcher is not None:
+            for match in self.matcher.finditer(filename):
+                for name, value in match.groupdict().items():
+                    if value is not None:
+                        index = int(name[1:])
+                        if best is None or index < best:
+                            best = index
+                        break
+                if best == 0:
+                    break
+        for index, compiled in self.separate:
+            if best is not None and index > best:
+                break
+            if compiled.search(filename):
+                best = index
+                break
+        return self.manufacturers[best] if best is not None else self.default
+
+
+# Track-Tags in der Reihenfolge, in der die Tracks ausgegeben werden
+TRACK_TAGS = ('AudioTrack', 'MidiTrack', 'ReturnTrack', 'MasterTrack', 'Track')
+
+# Track-Typ-Zuordnung (Tag -> Anzeigename), Reihenfolge = Priorität
+TRACK_TYPES = (
+    ('AudioTrack', 'Audio'),
+    ('MidiTrack', 'MIDI'),
+    ('ReturnTrack', 'Return'),
+    ('MasterTrack', 'Master'),
+)
+
+
+PARSER_BACKENDS = ('auto', 'etree', 'lxml')
+
+# 'full' baut Projekte inkl. Tracks, 'plugins-only' sucht nur VstPluginInfo-Blöcke im Bytestrom
+ANALYSIS_MODES = ('full', 'plugins-only')
+
+
+def resolve_parser_backend(parser: str) -> str:
+    """Maps 'auto' to the fastest available backend; falls back to etree without lxml"""
+    if parser not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend: {parser}")
+    if parser == 'etree':
+        return 'etree'
+    if lxml_etree is None:
+        if parser == 'lxml':
+            print("[WARN] lxml is not installed, falling back to xml.etree.ElementTree")
+        return 'etree'
+    return 'lxml'
+
+
+def iter_tree_events(root: ET.Element):
+    """Yields ('start', elem) / ('end', elem) pairs for an existing element tree"""
+    yield 'start', root
+    stack = [(root, iter(root))]
+    while stack:
+        elem, children = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            yield 'end', elem
+        else:
+            yield 'start', child
+            stack.append((child, iter(child)))
+
+
+class ProjectEventBuilder:
+    """Builds a project dict from start/end parser events in a single pass.
+    
+    Produces the same structure as the element-tree based extraction:
+    project VSTs in document order, tracks grouped by TRACK_TAGS, every plugin
+    inside a track's DeviceChain(s) once per enclosing chain, followed by the
+    remaining track plugins that are not already listed.
+    """
+    
+    def __init__(self, project_file: Path, decode_plugin, release: bool = False, samples: bool = False):
+        self.project_file = project_file
+        self.decode_plugin = decode_plugin
+        self.release = release
+        # Sample-Referenzen (FileRef direkt unter SampleRef) nur auf Wunsch sammeln
+        self.samples = samples
+        self.sample_refs = {}
+        self.sample_depth = 0
+        self.stack = []
+        self.open_tracks = []
+        self.plugin_depth = 0
+        self.scenes = 0
+        self.vsts = []
+        self.plugins = {}
+        self.tracks_by_tag = {tag: [] for tag in TRACK_TAGS}
+    
+    def parent_of(self, elem):
+        return self.stack[-1] if self.stack else None
+    
+    def start(self, elem) -> None:
+        tag = elem.tag
+        parent = self.parent_of(elem)
+        self.stack.append(elem)
+        
+        if tag == 'VstPluginInfo':
+            self.plugin_depth += 1
+        elif tag == 'SampleRef' and self.samples:
+            self.sample_depth += 1
+        elif tag == 'Scene':
+            self.scenes += 1
+        elif tag == 'DeviceChain':
+            for track in self.open_tracks:
+                chain = []
+                track['chains'].append(chain)
+                track['open_chains'].append(chain)
+        elif tag == 'Name' and self.open_tracks:
+            # Nur das erste direkte Name-Kind eines Tracks zählt
+            track = self.open_tracks[-1]
+            if parent is track['elem'] and not track['name_seen']:
+                track['name_seen'] = True
+                if 'Value' in elem.attrib:
+                    track['info']['name'] = elem.attrib['Value']
+        
+        if tag in TRACK_TAGS:
+            for track in self.open_tracks:
+                track['nested'].add(tag)
+            track_info = {
+                'name': 'Unbekannter Track',
+                'type': 'Audio',  # Default
+                'vsts': []
+            }
+            self.tracks_by_tag[tag].append(track_info)
+            self.open_tracks.append({
+                'elem': elem,
+                'info': track_info,
+                'name_seen': False,
+                'nested': set(),
+                'chains': [],
+                'open_chains': [],
+                'loose': []
+            })
+    
+    def end(self, elem) -> None:
+        tag = elem.tag
+        self.stack.pop()
+        
+        if tag == 'VstPluginInfo':
+            self.plugin_depth -= 1
+            plugin_data = self.decode_plugin(elem)
+            if plugin_data:
+                # Gleiche Plugins innerhalb eines Projekts teilen sich ein Dict
+                plugin_data = self.plugins.setdefault(tuple(plugin_data.values()), plugin_data)
+                self.vsts.append(plugin_data)
+                for track in self.open_tracks:
+                    if track['open_chains']:
+                        for chain in track['open_chains']:
+                            chain.append(plugin_data)
+                    else:
+                        track['loose'].append(plugin_data)
+        elif tag == 'DeviceChain':
+            for track in self.open_tracks:
+                track['open_chains'].pop()
+        elif self.sample_depth:
+            if tag == 'SampleRef':
+                self.sample_depth -= 1
+            elif tag == 'FileRef':
+                parent = self.parent_of(elem)
+                # FileRefs tiefer im SampleRef (z.B. OriginalFileRef) sind nicht das verwendete Sample
+                sample = decode_sample_ref(elem) if parent is not None and parent.tag == 'SampleRef' else None
+                if sample:
+                    self.sample_refs.setdefault(tuple(sample.values()), sample)
+        
+        if self.open_tracks and self.open_tracks[-1]['elem'] is elem:
+            self.finish_track(self.open_tracks.pop())
+        
+        # Verarbeitete Elemente freigeben (Inhalt von VstPluginInfo/SampleRef erst am Ende)
+        if self.release and self.plugin_depth == 0 and self.sample_depth == 0:
+            self.release_element(elem)
+    
+    def release_element(self, elem) -> None:
+        elem.clear()
+        if self.stack:
+            self.stack[-1].remove(elem)
+    
+    def finish_track(self, track: Dict) -> None:
+        track_info = track['info']
+        for tag, track_type in TRACK_TYPES:
+            if track['elem'].tag == tag or tag in track['nested']:
+                track_info['type'] = track_type
+                break
+        
+        track_vsts = [vst for chain in track['chains'] for vst in chain]
+        seen = {tuple(sorted(vst.items())) for vst in track_vsts}
+        for vst in track['loose']:
+            key = tuple(sorted(vst.items()))
+            if key not in seen:
+                seen.add(key)
+                track_vsts.append(vst)
+        track_info['vsts'] = track_vsts
+    
+    def result(self) -> Dict:
+        project = {
+            'name': self.project_file.stem,
+            'path': str(self.project_file),
+            'vsts': self.vsts,
+            'tracks': [track for tag in TRACK_TAGS for track in self.tracks_by_tag[tag]],
+            'scenes': self.scenes
+        }
+        if self.samples:
+            project['samples'] = list(self.sample_refs.values())
+        return project
+
+
+def decode_sample_ref(file_ref) -> Optional[Dict]:
+    """Sample location from a FileRef element (Live 10+ and the older element-based layout)
+    
+    path is the absolute path as stored in the set, relative_path is relative
+    to the set's folder; either may be empty. Relative paths of another
+    RelativePathType (e.g. relative to the User Library) are not kept, the
+    absolute path locates those samples.
+    """
+    path_elem = file_ref.find('Path')
+    path = path_elem.get('Value', '') if path_elem is not None else ''
+    name_elem = file_ref.find('Name')
+    name = name_elem.get('Value', '') if name_elem is not None else ''
+    
+    relative = ''
+    relative_elem = file_ref.find('RelativePath')
+    if relative_elem is not None:
+        if 'Value' in relative_elem.attrib:
+            relative = relative_elem.get('Value')
+        elif name:
+            # Live 9 und älter: ein RelativePathElement pro Ordner plus Name
+            folders = [elem.get('Dir', '') for elem in relative_elem.findall('RelativePathElement')]
+            relative = '/'.join(folders + [name]) if folders else ''
+    # Ohne RelativePathType (ältere Sets) ist der Pfad relativ zum Set
+    relative_type = file_ref.find('RelativePathType')
+    if relative_type is not None and relative_type.get('Value') != RELATIVE_TO_PROJECT:
+        relative = ''
+    
+    if not path and name:
+        hint = file_ref.find('SearchHint/PathHint')
+        folders = [elem.get('Dir', '') for elem in hint.findall('RelativePathElement')] if hint is not None else []
+        if folders:
+            path = '/'.join(folders + [name])
+            # Laufwerksbuchstabe (C:) unter Windows, sonst ein absoluter POSIX-Pfad
+            if not folders[0].endswith(':'):
+                path = '/' + path
+    
+    if not path and not relative:
+        return None
+    return {
+        'name': name or re.split(r'[\\/]', path or relative)[-1],
+        'path': path,
+        'relative_path': relative
+    }
+
+
+def file_content_hash(file_path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Streaming BLAKE2b hash of a file's content"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_hash_of(data: bytes) -> str:
+    """BLAKE2b hash of content already in memory (same digest as file_content_hash)"""
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+# Tags, die der Builder auswerten muss (lxml liefert nur Events für diese)
+BUILDER_TAGS = TRACK_TAGS + ('VstPluginInfo', 'DeviceChain', 'Name', 'Scene')
+SAMPLE_TAGS = ('SampleRef', 'FileRef')
+
+
+class LxmlProjectEventBuilder(ProjectEventBuilder):
+    """ProjectEventBuilder for lxml's tag-filtered iterparse.
+    
+    Only BUILDER_TAGS produce events, so parents come from getparent() and
+    memory is released by clearing processed elements and dropping their
+    already finished preceding siblings.
+    """
+    
+    def parent_of(self, elem):
+        return elem.getparent()
+    
+    def release_element(self, elem) -> None:
+        elem.clear(keep_tail=False)
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+
+
+PLUGIN_SCAN_CHUNK = 256 * 1024
+PLUGIN_OPEN = b'<VstPluginInfo'
+PLUGIN_CLOSE = b'</VstPluginInfo>'
+PLUGIN_FIELDS_PER_BLOCK = 4
+# Feld-Tag mit optionalem Value: Gruppe 2 behält das ' Value="' davor (leer = Element ohne Value);
+# Attributwerte in Anführungszeichen dürfen '>' enthalten
+PLUGIN_FIELD_PATTERN = re.compile(
+    rb'<(PlugName|FileName|VstVersion|Manufacturer)(?=[\s/>])(?:(?:[^>"]|"[^"]*")*?(\sValue="[^"]*)")?')
+VALUE_PREFIX_LENGTH = len(b' Value="')
+# Ende eines Start-Tags mit Inhalt (kein <X/>); davor stehen in einem Block nur leere Elemente
+ELEMENT_OPEN_END = re.compile(rb'[^/]>')
+ELEMENT_NAME_PATTERN = re.compile(rb'[A-Za-z_][\w.:-]*')
+ELEMENT_TAG_PATTERNS = {}
+SCENE_PATTERN = re.compile(rb'<Scene[\s/>]')
+# Bytes am Chunk-Ende, die erst mit dem nächsten Chunk ausgewertet werden (> längstes gesuchtes Tag)
+SCAN_TAIL = 16
+
+
+def scan_plugin_blocks(stream, chunk_size: int = PLUGIN_SCAN_CHUNK) -> Tuple[List[Dict[bytes, bytes]], int]:
+    """Scans a Project XML byte stream for VstPluginInfo blocks without building a tree.
+    
+    Returns the first PlugName, FileName, VstVersion and Manufacturer child
+    of every block in document order (see plugin_child_fields), plus the
+    number of Scene elements. Only an
+    unfinished block is carried over from one chunk to the next.
+    """
+    blocks = []
+    scenes = 0
+    buffer = bytearray()
+    scene_pos = 0
+    final = False
+    while not final:
+        chunk = stream.read(chunk_size)
+        final = not chunk
+        buffer += chunk
+        pos = 0
+        pending = None
+        while True:
+            start = buffer.find(PLUGIN_OPEN, pos)
+            if start < 0:
+                break
+            name_end = start + len(PLUGIN_OPEN)
+            if name_end >= len(buffer):
+                pending = start
+                break
+            # <VstPluginInfoX> wäre ein anderes Element
+            if buffer[name_end] not in b' \t\r\n/>':
+                pos = name_end
+                continue
+            tag_end = buffer.find(b'>', name_end)
+            if tag_end < 0:
+                pending = start
+                break
+            if buffer[tag_end - 1] == 0x2f:  # <VstPluginInfo/> ohne Inhalt
+                pos = tag_end + 1
+                continue
+            end = buffer.find(PLUGIN_CLOSE, tag_end)
+            if end < 0:
+                pending = start
+                break
+            blocks.append(plugin_child_fields(buffer, tag_end + 1, end))
+            pos = end + len(PLUGIN_CLOSE)
+        
+        if final:
+            scenes += len(SCENE_PATTERN.findall(buffer, scene_pos))
+            break
+        # Szenen nur zählen, wenn ihr Tag vollständig im Puffer liegt
+        limit = max(scene_pos, len(buffer) - SCAN_TAIL)
+        scenes += len(SCENE_PATTERN.findall(buffer, scene_pos, limit + 6))
+        keep = limit if pending is None else min(pending, limit)
+        del buffer[:keep]
+        scene_pos = limit - keep
+    return blocks, scenes
+
+
+def plugin_child_fields(buffer: bytearray, start: int, end: int) -> Dict[bytes, bytes]:
+    """First direct PlugName, FileName, VstVersion and Manufacturer child in buffer[start:end]
+    
+    Values are the raw (still escaped) attribute with the ' Value="' in front
+    of it, b'' for an element without Value (see raw_value). Matches
+    Element.find() in extract_vst_from_element: elements nested deeper (e.g.
+    inside Preset) are skipped, and a first child without a Value attribute
+    is not replaced by a later one.
+    """
+    fields = {}
+    pos = start
+    while True:
+        # Bis zum nächsten Element mit Inhalt sind alle Tags direkte Kinder
+        nested = ELEMENT_OPEN_END.search(buffer, pos, end)
+        if nested is None:
+            for name, value in PLUGIN_FIELD_PATTERN.findall(buffer, pos, end):
+                fields.setdefault(name, value)
+            return fields
+        stop = nested.end()
+        for name, value in PLUGIN_FIELD_PATTERN.findall(buffer, pos, stop):
+            fields.setdefault(name, value)
+        if len(fields) == PLUGIN_FIELDS_PER_BLOCK:
+            return fields
+        name = ELEMENT_NAME_PATTERN.match(buffer, buffer.rfind(b'<', pos, stop) + 1).group()
+        close = buffer.find(b'</' + name + b'>', stop, end)
+        if close >= 0 and buffer.find(b'<' + name, stop, close) < 0:
+            pos = close + len(name) + 3
+        else:
+            # Gleichnamiges Element darin (oder End-Tag mit Leerzeichen): Tags einzeln zählen
+            pos = element_end(buffer, name, stop, end)
+
+
+def raw_value(field: bytes) -> bytes:
+    """Value of a plugin_child_fields entry (b'' stays b'')"""
+    return field[VALUE_PREFIX_LENGTH:]
+
+
+def element_end(buffer: bytearray, name: bytes, pos: int, end: int) -> int:
+    """Position after the end tag of the element name whose start tag ends at pos (nested same-named ones skipped)"""
+    pattern = ELEMENT_TAG_PATTERNS.get(name)
+    if pattern is None:
+        pattern = ELEMENT_TAG_PATTERNS[name] = re.compile(
+            rb'<(/?)' + re.escape(name) + rb'(?=[\s/>])(?:[^>"]|"[^"]*")*>')
+    depth = 1
+    for tag in pattern.finditer(buffer, pos, end):
+        if tag.group(1):
+            depth -= 1
+            if depth == 0:
+                return tag.end()
+        elif not tag.group().endswith(b'/>'):
+            depth += 1
+    return end
+
+
+def decode_attribute(value: bytes) -> str:
+    """XML attribute value as the parser reports it (whitespace normalized, entities resolved)"""
+    text = value.decode('utf-8')
+    if '&' in text or '\n' in text or '\t' in text or '\r' in text:
+        text = html.unescape(text.replace('\r\n', ' ').translate(ATTRIBUTE_WHITESPACE))
+    return text
+
+
+ATTRIBUTE_WHITESPACE = str.maketrans('\t\n\r', '   ')
+
+# Reihenfolge der Felder eines Plugin-Dicts (wie extract_vst_from_element)
+PLUGIN_FIELDS = ('name', 'filename', 'version', 'manufacturer')
+DECODED_PLUGIN_CACHE_SIZE = 65536
+
+
+class FileTiming:
+    """Time and bytes of one project file, split into I/O, decompression and parsing"""
+    
+    __slots__ = ('io_seconds', 'decompress_seconds', 'bytes_read', 'bytes_decompressed')
+    
+    def __init__(self):
+        self.io_seconds = 0.0
+        self.decompress_seconds = 0.0
+        self.bytes_read = 0
+        self.bytes_decompressed = 0
+
+
+class CountingReader:
+    """File-like wrapper that books read() time and bytes on a FileTiming.
+    
+    kind='io' wraps the file on disk; kind='stream' wraps the (decompressed)
+    stream the parser reads, whose time minus the nested disk reads is the
+    decompression time.
+    """
+    
+    def __init__(self, raw, timing: FileTiming, kind: str):
+        self.raw = raw
+        self.timing = timing
+        self.kind = kind
+    
+    def read(self, size: int = -1) -> bytes:
+        timing = self.timing
+        io_before = timing.io_seconds
+        start = time.perf_counter()
+        data = self.raw.read(size)
+        elapsed = time.perf_counter() - start
+        if self.kind == 'io':
+            timing.io_seconds += elapsed
+            timing.bytes_read += len(data)
+        else:
+            timing.decompress_seconds += max(0.0, elapsed - (timing.io_seconds - io_before))
+            timing.bytes_decompressed += len(data)
+        return data
+    
+    def __getattr__(self, name: str):
+        return getattr(self.raw, name)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.raw.close()
+
+
+class NullProfiler:
+    """Profiler interface that does nothing (used unless --profile is given)"""
+    
+    enabled = False
+    
+    def open(self, project_file: Path):
+        return open(project_file, 'rb')
+    
+    def wrap_stream(self, stream):
+        return stream
+    
+    def begin_file(self) -> None:
+        pass
+    
+    def end_file(self, project_file: Path, started: float) -> None:
+        pass
+    
+    def failure(self, project_file: Path, error, category: Optional[str] = None) -> None:
+        pass
+    
+    def stage(self, name: str):
+        return NULL_STAGE
+
+
+NULL_STAGE = contextlib.nullcontext()
+NULL_PROFILER = NullProfiler()
+
+
+class Profiler(NullProfiler):
+    """Collects per-file and per-stage timings for the --profile report.
+    
+    Memory stays bounded: per-file timings go into log2 histograms, only the
+    N slowest files are kept, and each failure category keeps a few samples.
+    """
+    
+    enabled = True
+    FILE_STAGES = ('io', 'decompress', 'parse', 'total')
+    BUCKETS = 20  # 2^0 .. 2^19 ms
+    FAILURE_SAMPLES = 50
+    
+    def __init__(self, top: int = 20):
+        self.top = top
+        self.files = 0
+        self.bytes_read = 0
+        self.bytes_decompressed = 0
+        self.file_seconds = {stage: 0.0 for stage in self.FILE_STAGES}
+        self.histograms = {stage: [0] * (self.BUCKETS + 1) for stage in self.FILE_STAGES}
+        self.slowest = []
+        self.failures = {}
+        self.stages = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+    
+    def __getstate__(self):
+        # Lock und Thread-Lokales nicht mitpicklen (Rückgabe aus Worker-Prozessen)
+        state = dict(self.__dict__)
+        del state['lock'], state['local']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+        self.local = threading.local()
+    
+    def current(self) -> FileTiming:
+        timing = getattr(self.local, 'timing', None)
+        if timing is None:
+            timing = self.local.timing = FileTiming()
+        return timing
+    
+    def open(self, project_file: Path):
+        return CountingReader(open(project_file, 'rb'), self.current(), 'io')
+    
+    def wrap_stream(self, stream):
+        return CountingReader(stream, self.current(), 'stream')
+    
+    def begin_file(self) -> None:
+        self.local.timing = FileTiming()
+    
+    def end_file(self, project_file: Path, started: float) -> None:
+        total = time.perf_counter() - started
+        timing = self.current()
+        self.local.timing = None
+        seconds = {
+            'io': timing.io_seconds,
+            'decompress': timing.decompress_seconds,
+            'parse': max(0.0, total - timing.io_seconds - timing.decompress_seconds),
+            'total': total
+        }
+        with self.lock:
+            self.files += 1
+            self.bytes_read += timing.bytes_read
+            self.bytes_decompressed += timing.bytes_decompressed
+            for stage, value in seconds.items():
+                self.file_seconds[stage] += value
+                self.histograms[stage][self.bucket(value)] += 1
+            entry = (total, str(project_file), seconds, timing.bytes_read, timing.bytes_decompressed)
+            if len(self.slowest) < self.top:
+                heapq.heappush(self.slowest, entry)
+            elif total > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, entry)
+    
+    def bucket(self, seconds: float) -> int:
+        milliseconds = seconds * 1000
+        return min(self.BUCKETS, max(0, int(milliseconds).bit_length()))
+    
+    def failure(self, project_file: Path, error, category: Optional[str] = None) -> None:
+        category = category or failure_category(error)
+        with self.lock:
+            entry = self.failures.setdefault(category, {'count': 0, 'files': []})
+            entry['count'] += 1
+            if len(entry['files']) < self.FAILURE_SAMPLES:
+                entry['files'].append({'path': str(project_file), 'error': str(error)})
+    
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self.lock:
+                stage = self.stages.setdefault(name, {'seconds': 0.0, 'count': 0})
+                stage['seconds'] += elapsed
+                stage['count'] += 1
+    
+    def merge(self, other: 'Profiler') -> None:
+        """Adds the measurements of a worker-process profiler"""
+        with self.lock:
+            self.files += other.files
+            self.bytes_read += other.bytes_read
+            self.bytes_decompressed += other.bytes_decompressed
+            for stage in self.FILE_STAGES:
+                self.file_seconds[stage] += other.file_seconds[stage]
+                self.histograms[stage] = [a + b for a, b in zip(self.histograms[stage], other.histograms[stage])]
+            self.slowest = heapq.nlargest(self.top, self.slowest + other.slowest, key=lambda entry: entry[0])
+            heapq.heapify(self.slowest)
+            for category, entry in other.failures.items():
+                mine = self.failures.setdefault(category, {'count': 0, 'files': []})
+                mine['count'] += entry['count']
+                mine['files'] = (mine['files'] + entry['files'])[:self.FAILURE_SAMPLES]
+    
+    def report(self, run: Optional[Dict] = None) -> Dict:
+        histograms = {}
+        for stage, counts in self.histograms.items():
+            histograms[stage] = [
+                {'le_ms': (2 ** index if index < self.BUCKETS else None), 'count': count}
+                for index, count in enumerate(counts) if count
+            ]
+        file_seconds = self.file_seconds['total']
+        return {
+            'run': dict(run or {}, files=self.files,
+                        failed=sum(entry['count'] for entry in self.failures.values())),
+            'stages': {name: dict(stage, seconds=round(stage['seconds'], 6)) for name, stage in self.stages.items()},
+            'file_stages': {
+                stage: {
+                    'seconds': round(seconds, 6),
+                    'mean_ms': round(seconds / self.files * 1000, 3) if self.files else 0.0,
+                    'share': round(seconds / file_seconds, 4) if file_seconds else 0.0
+                }
+                for stage, seconds in self.file_seconds.items()
+            },
+            'bytes': {
+                'read': self.bytes_read,
+                'decompressed': self.bytes_decompressed,
+                'read_mb_per_s': round(self.bytes_read / self.file_seconds['io'] / 1024 / 1024, 2)
+                if self.file_seconds['io'] else None,
+                'decompressed_mb_per_s': round(self.bytes_decompressed / self.file_seconds['decompress'] / 1024 / 1024, 2)
+                if self.file_seconds['decompress'] else None
+            },
+            'histograms': histograms,
+            'slowest_files': [
+                {'path': path, 'seconds': {stage: round(value, 6) for stage, value in seconds.items()},
+                 'bytes_read': bytes_read, 'bytes_decompressed': bytes_decompressed}
+                for _, path, seconds, bytes_read, bytes_decompressed in sorted(self.slowest, reverse=True)
+            ],
+            'failures': self.failures
+        }
+    
+    def write_report(self, filename: str, run: Optional[Dict] = None) -> None:
+        report = self.report(run)
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Profile saved to {filename}: {report['run']['files']} files, {report['run']['failed']} failed")
+
+
+def failure_category(error) -> str:
+    """Groups extraction errors for the profile report"""
+    if isinstance(error, str):
+        return error
+    if isinstance(error, zipfile.BadZipFile):
+        return 'bad_zip'
+    if isinstance(error, (gzip.BadGzipFile, zlib.error)):
+        return 'bad_gzip'
+    if isinstance(error, EOFError):
+        return 'truncated'
+    if isinstance(error, ET.ParseError) or (lxml_etree is not None and isinstance(error, lxml_etree.XMLSyntaxError)):
+        return 'xml_syntax'
+    if isinstance(error, PermissionError):
+        return 'permission_denied'
+    if isinstance(error, FileNotFoundError):
+        return 'not_found'
+    if isinstance(error, OSError):
+        return 'io_error'
+    return f"other:{type(error).__name__}"
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """'2/4' -> (2, 4); shards are numbered from 1"""
+    index, _, count = value.partition('/')
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/N, e.g. 1/4, got {value!r}")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard {value!r} out of range, i must be between 1 and N")
+    return index, count
+
+
+def shard_of(relative_path: str, count: int) -> int:
+    """Shard number (1..count) of a path relative to the analyzed directory.
+    
+    Uses a stable hash of the NFC-normalized POSIX path, so every node
+    computes the same partition regardless of platform or mount point.
+    """
+    key = unicodedata.normalize('NFC', relative_path.replace(os.sep, '/')).encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'big') % count + 1
+
+
+class ProjectCache:
+    """Persistent SQLite cache of extracted project dicts.
+    
+    Entries are keyed by absolute path and validated against size and mtime;
+    with use_hash=True a changed mtime is forgiven if the content hash still
+    matches. Failed extractions are cached too, so broken files are not
+    reparsed on every run. A different result version (PARSER_VERSION plus
+    the manufacturer rules in use) empties the cache.
+    """
+    
+    COMMIT_EVERY = 500
+    
+    def __init__(self, cache_dir: str, use_hash: bool = False, version: Optional[str] = None):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / "project_cache.sqlite"
+        self.use_hash = use_hash
+        self.lock = threading.Lock()
+        self.pending_writes = 0
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS projects ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, content_hash TEXT, project TEXT)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, content_hash TEXT)"
+        )
+        version = version or PARSER_VERSION
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'parser_version'").fetchone()
+        if row is None or row[0] != version:
+            self.conn.execute("DELETE FROM projects")
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('parser_version', ?)", (version,))
+        self.conn.commit()
+    
+    @staticmethod
+    def cache_key(project_file: Path) -> str:
+        return os.path.abspath(str(project_file))
+    
+    def lookup(self, project_file: Path, stat: Optional[os.stat_result] = None
+               ) -> Tuple[bool, Optional[Dict], os.stat_result]:
+        """Returns (hit, project_or_None, stat) for a project file"""
+        if stat is None:
+            stat = os.stat(project_file)
+        key = self.cache_key(project_file)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT size, mtime_ns, content_hash, project FROM projects WHERE path = ?", (key,)
+            ).fetchone()
+        if row is None or row[0] != stat.st_size:
+            return False, None, stat
+        
+        size, mtime_ns, content_hash, project_json = row
+        if mtime_ns != stat.st_mtime_ns:
+            # Inhalt prüfen, wenn nur der Zeitstempel abweicht
+            if not (self.use_hash and content_hash and file_content_hash(project_file) == content_hash):
+                return False, None, stat
+            with self.lock:
+                self.conn.execute("UPDATE projects SET mtime_ns = ? WHERE path = ?", (stat.st_mtime_ns, key))
+                self.note_write()
+        
+        project = json.loads(project_json)
+        if project is not None:
+            project['name'] = project_file.stem
+            project['path'] = str(project_file)
+        return True, project, stat
+    
+    def store(self, project_file: Path, stat: os.stat_result, project: Optional[Dict],
+              content_hash: Optional[str] = None) -> None:
+        """Stores an extraction result (None for files that could not be parsed)
+        
+        content_hash is the hash of the bytes that were parsed (computed by the
+        worker with use_hash); entries without it are only validated by size
+        and mtime.
+        """
+        content_hash = content_hash if self.use_hash else None
+        project_json = json.dumps(project, ensure_ascii=False, separators=(',', ':'))
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO projects VALUES (?, ?, ?, ?, ?)",
+                (self.cache_key(project_file), stat.st_size, stat.st_mtime_ns, content_hash, project_json)
+            )
+            self.note_write()
+    
+    def content_hash(self, project_file: Path) -> str:
+        """Content hash of a file, recomputed only when size or mtime changed"""
+        stat = os.stat(project_file)
+        key = self.cache_key(project_file)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT size, mtime_ns, content_hash FROM hashes WHERE path = ?", (key,)
+            ).fetchone()
+        if row is not None and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[2]
+        
+        content_hash = file_content_hash(project_file)
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?)",
+                              (key, stat.st_size, stat.st_mtime_ns, content_hash))
+            self.note_write()
+        return content_hash
+    
+    def note_write(self) -> None:
+        self.pending_writes += 1
+        if self.pending_writes >= self.COMMIT_EVERY:
+            self.conn.commit()
+            self.pending_writes = 0
+    
+    def discard(self, project_files: List[Path]) -> None:
+        """Removes the entries of deleted files (watch mode)"""
+        keys = [(self.cache_key(f),) for f in project_files]
+        with self.lock:
+            self.conn.executemany("DELETE FROM projects WHERE path = ?", keys)
+            self.conn.executemany("DELETE FROM hashes WHERE path = ?", keys)
+            self.pending_writes += len(keys)
+    
+    def commit(self) -> None:
+        with self.lock:
+            self.conn.commit()
+            self.pending_writes = 0
+    
+    def evict_missing(self, root: Path, project_files: List[Path], keep: Optional[List[str]] = None) -> int:
+        """Removes entries below root whose files no longer exist; returns the count
+        
+        Entries below the paths in keep (directories that could not be listed)
+        are left alone: their files were not seen, but may still exist.
+        """
+        prefix = os.path.join(os.path.abspath(str(root)), '')
+        with self.lock:
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS current_paths (path TEXT PRIMARY KEY)")
+            self.conn.execute("DELETE FROM current_paths")
+            self.conn.executemany("INSERT OR IGNORE INTO current_paths VALUES (?)",
+                                  ((self.cache_key(f),) for f in project_files))
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS kept_prefixes (prefix TEXT PRIMARY KEY)")
+            self.conn.execute("DELETE FROM kept_prefixes")
+            self.conn.executemany("INSERT OR IGNORE INTO kept_prefixes VALUES (?)",
+                                  ((os.path.join(os.path.abspath(path), ''),) for path in keep or ()))
+            condition = ("substr(path, 1, ?) = ? AND path NOT IN (SELECT path FROM current_paths) "
+                         "AND NOT EXISTS (SELECT 1 FROM kept_prefixes "
+                         "WHERE substr(path, 1, length(prefix)) = prefix OR path || ? = prefix)")
+            cursor = self.conn.execute(f"DELETE FROM projects WHERE {condition}", (len(prefix), prefix, os.sep))
+            self.conn.execute(f"DELETE FROM hashes WHERE {condition}", (len(prefix), prefix, os.sep))
+            self.conn.commit()
+            return cursor.rowcount
+    
+    def close(self) -> None:
+        with self.lock:
+            self.conn.commit()
+            self.conn.close()
+
+
+class ProjectScanner:
+    """Concurrent os.scandir walk that streams found .als files.
+    
+    Several walker threads list directories in parallel (directory listings
+    dominate on network shares) and push project files into a bounded
+    queue, so consumers can start parsing while the walk is still running.
+    Exclude patterns are fnmatch globs matched against entry names and
+    against paths relative to the root. Paths that could not be listed (or
+    a start directory that is not available) are collected in unlisted.
+    """
+    
+    def __init__(self, root: Path, exclude: Optional[List[str]] = None,
+                 walkers: int = 8, queue_size: int = 1000):
+        self.root = Path(root)
+        self.exclude = list(exclude or [])
+        self.walkers = walkers
+        self.found = queue.Queue(maxsize=queue_size)
+        self.directories = queue.Queue()
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.errors = 0
+        self.unlisted = []
+    
+    def is_excluded(self, entry_path: str, name: str) -> bool:
+        if not self.exclude:
+            return False
+        relative = os.path.relpath(entry_path, self.root).replace(os.sep, '/')
+        return any(fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(relative, pattern)
+                   for pattern in self.exclude)
+    
+    def scan(self, start: Optional[Path] = None):
+        """Yields project file paths as they are found (below start, default: the root)"""
+        start = Path(start) if start is not None else self.root
+        if not start.is_dir():
+            # Nicht eingehängte oder umbenannte Freigabe: nichts gesehen heißt nicht "alles gelöscht"
+            self.unlisted.append(str(start))
+            return
+        self.pending = 1
+        self.directories.put(str(start))
+        threads = [threading.Thread(target=self.walk, daemon=True) for _ in range(self.walkers)]
+        for thread in threads:
+            thread.start()
+        
+        while True:
+            project_file = self.found.get()
+            if project_file is None:
+                break
+            yield project_file
+        
+        for thread in threads:
+            thread.join()
+    
+    def walk(self) -> None:
+        while True:
+            directory = self.directories.get()
+            if directory is None:
+                return
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if self.is_excluded(entry.path, entry.name):
+                            continue
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                with self.lock:
+                                    self.pending += 1
+                                self.directories.put(entry.path)
+                            elif os.path.normcase(entry.name).endswith('.als') and entry.is_file():
+                                self.found.put(Path(entry.path))
+                        except OSError:
+                            self.listing_failed(entry.path)
+            except OSError:
+                self.listing_failed(directory)
+            finally:
+                with self.lock:
+                    self.pending -= 1
+                    finished = self.pending == 0
+                if finished:
+                    # Walk complete: stop all walkers and the consumer
+                    for _ in range(self.walkers):
+                        self.directories.put(None)
+                    self.found.put(None)
+    
+    def listing_failed(self, path: str) -> None:
+        with self.lock:
+            self.errors += 1
+            self.unlisted.append(path)
+
+
+class WorkQueue:
+    """Largest-first work queue that hands out size-aware chunks to idle workers.
+    
+    The biggest sets are started first so they do not end up as stragglers.
+    A chunk holds a single large file or several small ones, bounded by a
+    share of the remaining bytes that shrinks as the queue drains (guided
+    self-scheduling), which keeps every worker busy until the end.
+    """
+    
+    DONE = object()
+    
+    def __init__(self, workers: int, max_chunk: int = 16, max_pending: int = 10000):
+        self.workers = max(1, workers)
+        self.max_chunk = max_chunk
+        self.max_pending = max_pending
+        self.heap = []
+        self.pending_bytes = 0
+        self.counter = itertools.count()
+        self.closed = False
+        self.condition = threading.Condition()
+    
+    def put(self, project_file: Path, size: int) -> None:
+        with self.condition:
+            while len(self.heap) >= self.max_pending:
+                self.condition.wait()
+            heapq.heappush(self.heap, (-size, next(self.counter), project_file))
+            self.pending_bytes += size
+            self.condition.notify()
+    
+    def close(self) -> None:
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+    
+    def get_chunk(self) -> Optional[List[Path]]:
+        """Blocks until work is available; returns None once the queue is closed and empty"""
+        with self.condition:
+            while not self.heap and not self.closed:
+                self.condition.wait()
+            if not self.heap:
+                return None
+            
+            target_bytes = self.pending_bytes / (self.workers * 4)
+            chunk = []
+            chunk_bytes = 0
+            while self.heap and len(chunk) < self.max_chunk:
+                size = -self.heap[0][0]
+                if chunk and chunk_bytes + size > target_bytes:
+                    break
+                chunk.append(heapq.heappop(self.heap)[2])
+                chunk_bytes += size
+            self.pending_bytes -= chunk_bytes
+            self.condition.notify_all()
+            return chunk
+
+
+class Prefetcher:
+    """Read-ahead stage that separates file I/O from decompression and parsing.
+    
+    io_workers threads take size-ordered chunks from the WorkQueue and read
+    the raw files into memory; parse workers take the buffered files as
+    they become ready. At most max_bytes of file content is held at once
+    (readers block when the buffer is full), so network concurrency and CPU
+    concurrency are limited independently. The stats show which side waits
+    for the other.
+    """
+    
+    def __init__(self, work: WorkQueue, io_workers: int, max_bytes: int):
+        self.work = work
+        self.io_workers = io_workers
+        self.max_bytes = max_bytes
+        self.condition = threading.Condition()
+        self.ready = deque()
+        self.buffered = 0
+        self.readers_running = io_workers
+        self.stats = {'io_workers': io_workers, 'max_bytes': max_bytes, 'files': 0, 'bytes': 0,
+                      'read_seconds': 0.0, 'reader_wait_seconds': 0.0, 'parser_wait_seconds': 0.0,
+                      'peak_bytes': 0, 'read_errors': 0}
+        self.readers = [threading.Thread(target=self.read_loop, daemon=True) for _ in range(io_workers)]
+        for reader in self.readers:
+            reader.start()
+    
+    def read_loop(self) -> None:
+        try:
+            while True:
+                chunk = self.work.get_chunk()
+                if chunk is None:
+                    return
+                for project_file in chunk:
+                    data = self.read(project_file)
+                    with self.condition:
+                        self.ready.append((project_file, data))
+                        self.condition.notify_all()
+        finally:
+            with self.condition:
+                self.readers_running -= 1
+                self.condition.notify_all()
+    
+    def read(self, project_file: Path) -> Optional[bytes]:
+        """Raw file content, or None if the file could not be read (the parse worker retries and reports it)"""
+        try:
+            size = os.stat(project_file).st_size
+        except OSError:
+            size = 0
+        self.reserve(size)
+        started = time.perf_counter()
+        try:
+            with open(project_file, 'rb') as f:
+                data = f.read()
+        except OSError:
+            data = None
+        elapsed = time.perf_counter() - started
+        
+        with self.condition:
+            stats = self.stats
+            stats['read_seconds'] += elapsed
+            if data is None:
+                stats['read_errors'] += 1
+                self.buffered -= size
+                self.condition.notify_all()
+                return None
+            # Datei seit dem stat() gewachsen oder geschrumpft
+            self.buffered += len(data) - size
+            stats['files'] += 1
+            stats['bytes'] += len(data)
+            stats['peak_bytes'] = max(stats['peak_bytes'], self.buffered)
+        return data
+    
+    def reserve(self, size: int) -> None:
+        with self.condition:
+            started = time.perf_counter()
+            # Eine Datei über dem Limit darf allein in den Puffer
+            while self.buffered and self.buffered + size > self.max_bytes:
+                self.condition.wait()
+            self.stats['reader_wait_seconds'] += time.perf_counter() - started
+            self.buffered += size
+    
+    def get_batch(self, max_items: int) -> Optional[List[Tuple[Path, Optional[bytes]]]]:
+        """Up to max_items read files (at least one; blocks until ready); None when everything was read"""
+        with self.condition:
+            started = time.perf_counter()
+            while not self.ready and self.readers_running:
+                self.condition.wait()
+            self.stats['parser_wait_seconds'] += time.perf_counter() - started
+            if not self.ready:
+                return None
+            batch = []
+            while self.ready and len(batch) < max_items:
+                batch.append(self.ready.popleft())
+            return batch
+    
+    def release(self, batch: List[Tuple[Path, Optional[bytes]]]) -> None:
+        """Frees the buffer space of parsed files"""
+        with self.condition:
+            self.buffered -= sum(len(data) for _, data in batch if data is not None)
+            self.condition.notify_all()
+    
+    def summary(self, wall_seconds: float, parse_workers: int) -> str:
+        stats = self.stats
+        megabytes = stats['bytes'] / 1024 / 1024
+        reader_busy = stats['read_seconds'] / max(wall_seconds * self.io_workers, 1e-9)
+        parser_idle = stats['parser_wait_seconds'] / max(wall_seconds * parse_workers, 1e-9)
+        bottleneck = 'file I/O' if stats['parser_wait_seconds'] > stats['reader_wait_seconds'] else 'parsing (CPU)'
+        return (f"Read-ahead: {stats['files']} files, {megabytes:.1f} MB at {megabytes / max(wall_seconds, 1e-9):.1f} MB/s "
+                f"with {self.io_workers} readers ({reader_busy:.0%} busy, {stats['reader_wait_seconds']:.1f}s "
+                f"waiting for buffer space, peak {stats['peak_bytes'] / 1024 / 1024:.1f} of "
+                f"{self.max_bytes / 1024 / 1024:.0f} MB); parsers idle {parser_idle:.0%} - bottleneck: {bottleneck}")
+
+
+class ProjectWatcher(ABC):
+    """Change detection for watch mode.
+    
+    read_events() returns the paths touched since the last call: .als files
+    and directories (created, moved or deleted folders, or the root after
+    lost events). Whether a path was added, modified or removed is decided
+    by the analyzer when it applies the changes.
+    """
+    
+    description = 'none'
+    # Bei Dauer-Speichern spätestens nach debounce * MAX_DELAY_FACTOR aktualisieren
+    MAX_DELAY_FACTOR = 10
+    
+    @abstractmethod
+    def read_events(self, timeout: Optional[float]) -> Set[Path]:
+        """Waits up to timeout seconds (None waits forever) for the next events.
+        
+        Returns the changed .als files and directories, or an empty set if
+        nothing changed within timeout.
+        """
+    
+    def changes(self, debounce: float, timeout: Optional[float] = None) -> Set[Path]:
+        """Blocks until something changed, then keeps collecting until no event arrived for debounce seconds.
+        
+        A burst of saves therefore becomes a single update. Returns an empty
+        set if nothing changed within timeout (None waits forever).
+        """
+        paths = self.read_events(timeout)
+        if not paths:
+            return paths
+        deadline = time.monotonic() + debounce * self.MAX_DELAY_FACTOR
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return paths
+            more = self.read_events(min(debounce, remaining))
+            if not more:
+                return paths
+            paths |= more
+    
+    def close(self) -> None:
+        pass
+
+
+class PollingWatcher(ProjectWatcher):
+    """Compares (size, mtime) snapshots of all .als files every interval seconds.
+    
+    Works everywhere, including network shares where inotify does not see
+    changes made by other machines, at the cost of one directory walk per
+    interval.
+    """
+    
+    description = 'polling'
+    
+    def __init__(self, root: Path, exclude: Optional[List[str]] = None, interval: float = 5.0):
+        self.root = Path(root)
+        self.exclude = list(exclude or [])
+        self.interval = interval
+        self.snapshot = self.take_snapshot()
+    
+    def take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for project_file in ProjectScanner(self.root, exclude=self.exclude).scan():
+            try:
+                stat = os.stat(project_file)
+            except OSError:
+                continue
+            snapshot[str(project_file)] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+    
+    def read_events(self, timeout: Optional[float]) -> Set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval if deadline is None else min(self.interval, max(0.0, deadline - time.monotonic()))
+            time.sleep(delay)
+            snapshot = self.take_snapshot()
+            paths = {Path(path) for path, signature in snapshot.items() if self.snapshot.get(path) != signature}
+            paths.update(Path(path) for path in self.snapshot if path not in snapshot)
+            self.snapshot = snapshot
+            if paths or (deadline is not None and time.monotonic() >= deadline):
+                return paths
+
+
+class InotifyWatcher(ProjectWatcher):
+    """Linux inotify (via ctypes) with one watch per directory below the root.
+    
+    Only reacts to finished writes (IN_CLOSE_WRITE), renames and deletions,
+    so a set that is still being saved is not parsed half-written. New
+    directories are watched as they appear. Raises OSError where inotify is
+    not available or the watch limit is reached.
+    """
+    
+    description = 'inotify'
+    
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT = struct.Struct('iIII')
+    
+    def __init__(self, root: Path, exclude: Optional[List[str]] = None):
+        libc_name = ctypes.util.find_library('c')
+        if not sys.platform.startswith('linux') or libc_name is None:
+            raise OSError("inotify is only available on Linux")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"inotify_init1 failed: {os.strerror(error)}")
+        self.root = Path(root)
+        self.scanner = ProjectScanner(self.root, exclude=exclude)
+        self.watches = {}
+        try:
+            self.add_tree(str(self.root))
+        except OSError:
+            os.close(self.fd)
+            raise
+    
+    def add_tree(self, directory: str) -> None:
+        """Watches directory and every non-excluded directory below it"""
+        pending = [directory]
+        while pending:
+            current = pending.pop()
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(current), self.MASK)
+            if wd < 0:
+                error = ctypes.get_errno()
+                # Verzeichnis schon wieder weg oder nicht lesbar: überspringen
+                if error in (errno.ENOENT, errno.EACCES, errno.ENOTDIR):
+                    continue
+                raise OSError(error, f"inotify_add_watch failed for {current}: {os.strerror(error)}")
+            self.watches[wd] = current
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False) and not self.scanner.is_excluded(entry.path, entry.name):
+                            pending.append(entry.path)
+            except OSError:
+                pass
+    
+    def remove_tree(self, directory: str) -> None:
+        """Drops the watches of a directory that was moved away"""
+        prefix = os.path.join(directory, '')
+        for wd, path in list(self.watches.items()):
+            if path == directory or path.startswith(prefix):
+                self.libc.inotify_rm_watch(self.fd, wd)
+                del self.watches[wd]
+    
+    def read_events(self, timeout: Optional[float]) -> Set[Path]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        data = b''
+        while True:
+            try:
+                data += os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+        
+        paths = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT.unpack_from(data, offset)
+            name = os.fsdecode(data[offset + self.EVENT.size:offset + self.EVENT.size + length].rstrip(b'\0'))
+            offset += self.EVENT.size + length
+            if mask & self.IN_Q_OVERFLOW:
+                # Ereignisse verloren: den ganzen Baum neu abgleichen
+                paths.add(self.root)
+                continue
+            if mask & self.IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            directory = self.watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if self.scanner.is_excluded(path, name):
+                continue
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    try:
+                        self.add_tree(path)
+                    except OSError as e:
+                        print(f"Warning: cannot watch {path}: {e}")
+                elif mask & self.IN_MOVED_FROM:
+                    self.remove_tree(path)
+                paths.add(Path(path))
+            elif not mask & self.IN_CREATE and os.path.normcase(name).endswith('.als'):
+                paths.add(Path(path))
+        return paths
+    
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def create_watcher(root: Path, exclude: Optional[List[str]] = None,
+                   poll_interval: Optional[float] = None) -> ProjectWatcher:
+    """inotify where available, polling otherwise or when a poll interval is given"""
+    if poll_interval is None:
+        try:
+            return InotifyWatcher(root, exclude)
+        except (OSError, AttributeError) as e:
+            print(f"inotify not available ({e}), falling back to polling")
+    return PollingWatcher(root, exclude, poll_interval or 5.0)
+
+
+class PluginUsage(NamedTuple):
+    """Usage of one plugin (manufacturer + name) across the counted projects"""
+    key: str
+    manufacturer: str
+    name: str
+    filename: str
+    version: str
+    usage_count: int
+    projects: Tuple[str, ...]
+    main_dirs: Tuple[str, ...]
+
+
+class ManufacturerUsage(NamedTuple):
+    manufacturer: str
+    plugin_count: int
+    usage_count: int
+
+
+class MainDirGroup(NamedTuple):
+    """Projects of one main directory (first level below the search path)
+    
+    projects is empty when the run does not retain projects; project_files
+    always holds the number of project files.
+    """
+    name: str
+    projects: Tuple[Dict, ...]
+    counted_projects: int
+    plugin_keys: Tuple[str, ...]
+    project_files: int
+
+
+class InventoryIndex(NamedTuple):
+    """Immutable aggregation of an analysis run shared by all exporters.
+    
+    entries holds (project, main directory) pairs in path order; plugins and
+    manufacturers are ranked by usage (ties keep first-seen order).
+    """
+    entries: Tuple[Tuple[Dict, str], ...]
+    main_dirs: Tuple[MainDirGroup, ...]
+    plugins: Tuple[PluginUsage, ...]
+    manufacturers: Tuple[ManufacturerUsage, ...]
+    all_plugin_keys: Tuple[str, ...]
+    total_projects: int
+    total_tracks: int
+    total_plugin_uses: int
+    copies: int
+
+
+class InventoryAccumulator:
+    """Collects the inventory aggregates in a single pass over the projects.
+    
+    Projects can be taken out again with remove(), so watch mode keeps the
+    aggregates current by removing and re-adding only the changed projects.
+    With retain=False projects may arrive in any order and are not kept:
+    only counts and plugin keys stay in memory, the project names per plugin
+    go to a ProjectNameSpool (remove() is not available then).
+    """
+    
+    def __init__(self, plugins: PluginRegistry, retain: bool = True):
+        self.plugins = plugins
+        self.retain = retain
+        self.names = None if retain else ProjectNameSpool()
+        self.entries = {}
+        self.main_dirs = {}
+        self.usage = {}
+        self.all_plugin_keys = Counter()
+        self.total_projects = 0
+        self.total_tracks = 0
+        self.total_plugin_uses = 0
+        self.copies = 0
+        # Wird ein Pfad außer der Reihe hinzugefügt, sortiert freeze() wieder nach Pfad
+        self.last_path = ''
+        self.unordered = False
+    
+    def add(self, project: Dict, main_dir: str, counted: bool = True) -> None:
+        path = project['path']
+        if path < self.last_path:
+            self.unordered = True
+        else:
+            self.last_path = path
+        group = self.main_dirs.get(main_dir)
+        if group is None:
+            group = self.main_dirs[main_dir] = {'projects': {}, 'files': 0, 'first': path,
+                                                'counted': 0, 'keys': Counter()}
+        if self.retain:
+            self.entries[path] = (project, main_dir, counted)
+            group['projects'][path] = project
+        group['files'] += 1
+        group['first'] = min(group['first'], path)
+        if 'duplicate_of' in project:
+            self.copies += 1
+        
+        records = self.plugins.resolve(project['vsts'])
+        for vst in records:
+            group['keys'][vst.key] += 1
+            self.all_plugin_keys[vst.key] += 1
+        if not counted:
+            return
+        
+        group['counted'] += 1
+        self.total_projects += 1
+        self.total_tracks += len(project['tracks'])
+        self.total_plugin_uses += len(records)
+        for position, vst in enumerate(records):
+            # Pro Plugin-Schlüssel zählt die erste Variante (Dateiname/Version) in Pfad-Reihenfolge
+            usage = self.usage.get(vst.key)
+            if usage is None:
+                usage = self.usage[vst.key] = [vst, 0, Counter() if self.retain else None, Counter(), (path, position)]
+            elif (path, position) < usage[4] and not self.retain:
+                usage[0] = vst
+                usage[4] = (path, position)
+            usage[1] += 1
+            if self.retain:
+                usage[2][project['name']] += 1
+            else:
+                self.names.add(vst.key, project['name'])
+            usage[3][main_dir] += 1
+    
+    def remove(self, path: str) -> Optional[Dict]:
+        """Takes a project back out of all aggregates; returns it (None if unknown)"""
+        entry = self.entries.pop(path, None)
+        if entry is None:
+            return None
+        project, main_dir, counted = entry
+        group = self.main_dirs[main_dir]
+        del group['projects'][path]
+        group['files'] -= 1
+        if 'duplicate_of' in project:
+            self.copies -= 1
+        
+        records = self.plugins.resolve(project['vsts'])
+        for vst in records:
+            release(group['keys'], vst.key)
+            release(self.all_plugin_keys, vst.key)
+        if counted:
+            group['counted'] -= 1
+            self.total_projects -= 1
+            self.total_tracks -= len(project['tracks'])
+            self.total_plugin_uses -= len(records)
+            for vst in records:
+                usage = self.usage[vst.key]
+                usage[1] -= 1
+                release(usage[2], project['name'])
+                release(usage[3], main_dir)
+                if not usage[1]:
+                    del self.usage[vst.key]
+        if not group['projects']:
+            del self.main_dirs[main_dir]
+        return project
+    
+    def freeze(self) -> InventoryIndex:
+        if self.unordered and self.retain:
+            self.entries = dict(sorted(self.entries.items()))
+            for group in self.main_dirs.values():
+                group['projects'] = dict(sorted(group['projects'].items()))
+            # Hauptverzeichnisse in der Reihenfolge ihres ersten Projektpfads, wie beim vollständigen Aufbau
+            self.main_dirs = dict(sorted(self.main_dirs.items(), key=lambda item: next(iter(item[1]['projects']))))
+            self.unordered = False
+        elif self.unordered:
+            # Ohne Projekte ordnen die gemerkten ersten Pfade wie beim Aufbau in Pfad-Reihenfolge
+            self.main_dirs = dict(sorted(self.main_dirs.items(), key=lambda item: item[1]['first']))
+            self.usage = dict(sorted(self.usage.items(), key=lambda item: item[1][4]))
+            self.unordered = False
+        
+        plugins = tuple(sorted(
+            (PluginUsage(key, vst.manufacturer, vst.name, vst.filename or '', vst.version or '', count,
+                         tuple(sorted(projects)) if self.retain else SpooledProjectNames(self.names, key),
+                         tuple(sorted(main_dirs)))
+             for key, (vst, count, projects, main_dirs, _) in self.usage.items()),
+            key=lambda usage: usage.usage_count, reverse=True))
+        
+        manufacturer_stats = {}
+        for usage in self.usage_in_order(plugins):
+            stats = manufacturer_stats.setdefault(usage.manufacturer, [0, 0])
+            stats[0] += 1
+            stats[1] += usage.usage_count
+        manufacturers = tuple(sorted(
+            (ManufacturerUsage(manufacturer, count, uses) for manufacturer, (count, uses) in manufacturer_stats.items()),
+            key=lambda stats: stats.usage_count, reverse=True))
+        
+        return InventoryIndex(
+            entries=tuple((project, main_dir) for project, main_dir, _ in self.entries.values()),
+            main_dirs=tuple(MainDirGroup(name, tuple(group['projects'].values()), group['counted'],
+                                         tuple(sorted(group['keys'])), group['files'])
+                            for name, group in self.main_dirs.items()),
+            plugins=plugins,
+            manufacturers=manufacturers,
+            all_plugin_keys=tuple(sorted(self.all_plugin_keys)),
+            total_projects=self.total_projects,
+            total_tracks=self.total_tracks,
+            total_plugin_uses=self.total_plugin_uses,
+            copies=self.copies
+        )
+    
+    def usage_in_order(self, plugins: Tuple[PluginUsage, ...]) -> List[PluginUsage]:
+        """Plugins in first-seen order, so manufacturer ties rank like before"""
+        position = {key: index for index, key in enumerate(self.usage)}
+        return sorted(plugins, key=lambda usage: position[usage.key])
+    
+    def close(self) -> None:
+        """Deletes the name spool of a bounded-memory run once the exporters have read it"""
+        if self.names is not None:
+            self.names.close()
+            self.names = None
+
+
+class ProjectNameSpool:
+    """Plugin key -> project name pairs in a temporary SQLite database.
+    
+    Bounded-memory runs keep the project names per plugin (the 'Projects'
+    column of the VST Requirements sheet) here instead of in memory; SQLite
+    deletes the database when the connection closes.
+    """
+    
+    BATCH_SIZE = 10000
+    
+    def __init__(self):
+        # Leerer Dateiname: private temporäre Datenbank, die bei Bedarf auf die Platte ausgelagert wird
+        self.connection = sqlite3.connect('', check_same_thread=False)
+        self.connection.execute("CREATE TABLE uses (key TEXT NOT NULL, name TEXT NOT NULL)")
+        self.pending = []
+        self.indexed = False
+        self.lock = threading.Lock()
+    
+    def add(self, key: str, name: str) -> None:
+        self.pending.append((key, name))
+        if len(self.pending) >= self.BATCH_SIZE:
+            self.flush()
+    
+    def flush(self) -> None:
+        with self.lock:
+            if self.pending:
+                self.connection.executemany("INSERT INTO uses VALUES (?, ?)", self.pending)
+                self.pending = []
+    
+    def names(self, key: str):
+        """Sorted distinct project names of a plugin key"""
+        self.flush()
+        with self.lock:
+            if not self.indexed:
+                self.connection.execute("CREATE INDEX uses_key ON uses (key, name)")
+                self.indexed = True
+            rows = self.connection.execute("SELECT DISTINCT name FROM uses WHERE key = ? ORDER BY name",
+                                           (key,)).fetchall()
+        return (name for (name,) in rows)
+    
+    def close(self) -> None:
+        self.connection.close()
+
+
+class SpooledProjectNames:
+    """PluginUsage.projects of a bounded-memory run, read from the spool when iterated"""
+    
+    __slots__ = ('spool', 'key')
+    
+    def __init__(self, spool: ProjectNameSpool, key: str):
+        self.spool = spool
+        self.key = key
+    
+    def __iter__(self):
+        return self.spool.names(self.key)
+
+
+def release(counter: Counter, key: str) -> None:
+    """Decrements a reference count and drops the key when it reaches zero"""
+    counter[key] -= 1
+    if not counter[key]:
+        del counter[key]
+
+
+class ProjectStreamWriter:
+    """Writes projects to disk as soon as they are analyzed.
+    
+    format='ndjson' writes one project per line and finishes with a trailer
+    record ({"type": "summary", ...}) holding the totals and all_vsts; a file
+    without trailer is the partial result of an interrupted run.
+    format='json' streams the regular --json document (same keys; the totals
+    follow the projects list because they are only known at the end).
+    """
+    
+    # Erwartet aufgelöste Projekt-Dicts (siehe InventoryDatabase)
+    compact = False
+    
+    def __init__(self, filename: str, project_path: Path, format: str = 'ndjson', shard: Optional[Dict] = None):
+        self.path = Path(filename)
+        self.format = format
+        self.written = 0
+        self.file = open(self.path, 'w', encoding='utf-8')
+        if format == 'json':
+            self.file.write('{\n')
+            self.write_json_fields({
+                'timestamp': datetime.now().isoformat(),
+                'project_path': str(project_path),
+                **({'shard': shard} if shard is not None else {})
+            }, last=False)
+            self.file.write('  "projects": [')
+    
+    def write_projects(self, projects: List[Dict]) -> None:
+        for project in projects:
+            if self.format == 'ndjson':
+                self.file.write(json.dumps(project, ensure_ascii=False) + '\n')
+            else:
+                text = json.dumps(project, indent=2, ensure_ascii=False).replace('\n', '\n    ')
+                self.file.write(('\n    ' if self.written == 0 else ',\n    ') + text)
+            self.written += 1
+        # Teilergebnisse überleben einen Abbruch
+        self.file.flush()
+    
+    def finish(self, summary: Dict) -> None:
+        """Writes the trailer (totals, all_vsts) and closes the file"""
+        if self.format == 'ndjson':
+            self.file.write(json.dumps(dict(type='summary', projects=self.written, **summary),
+                                       ensure_ascii=False) + '\n')
+        else:
+            self.file.write('\n  ],\n' if self.written else '],\n')
+            self.write_json_fields(summary, last=True)
+            self.file.write('}')
+        self.file.close()
+        print(f"Results saved to {self.path}!")
+    
+    def abort(self) -> None:
+        if not self.file.closed:
+            self.file.close()
+    
+    def write_json_fields(self, fields: Dict, last: bool) -> None:
+        items = list(fields.items())
+        for position, (key, value) in enumerate(items):
+            text = json.dumps(value, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+            separator = '\n' if last and position == len(items) - 1 else ',\n'
+            self.file.write(f'  {json.dumps(key)}: {text}{separator}')
+
+
+class InventoryDatabase:
+    """SQLite sink with normalized, indexed tables for plugin lookups (--db).
+    
+    Projects arrive in chunks during the analysis and are inserted in
+    batches (one transaction per BATCH_SIZE projects) into a temporary
+    file; indexes are created at the end and the finished database replaces
+    the previous one, so it stays queryable while a new run is in progress.
+    Takes compact projects: plugin rows are the interned registry records.
+    """
+    
+    BATCH_SIZE = 1000
+    compact = True
+    SCHEMA = (
+        "CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)",
+        "CREATE TABLE projects (id INTEGER PRIMARY KEY, path TEXT NOT NULL UNIQUE, name TEXT, main_dir TEXT, "
+        "scenes INTEGER, track_count INTEGER, plugin_count INTEGER, duplicate_of TEXT)",
+        "CREATE TABLE tracks (id INTEGER PRIMARY KEY, project_id INTEGER NOT NULL REFERENCES projects(id), "
+        "position INTEGER, name TEXT, type TEXT)",
+        "CREATE TABLE plugins (id INTEGER PRIMARY KEY, manufacturer TEXT, name TEXT, filename TEXT, version TEXT, "
+        "UNIQUE (manufacturer, name, filename, version))",
+        "CREATE TABLE project_plugins (project_id INTEGER NOT NULL REFERENCES projects(id), "
+        "plugin_id INTEGER NOT NULL REFERENCES plugins(id))",
+        "CREATE TABLE track_plugins (track_id INTEGER NOT NULL REFERENCES tracks(id), "
+        "plugin_id INTEGER NOT NULL REFERENCES plugins(id), position INTEGER)",
+    )
+    INDEXES = (
+        "CREATE INDEX projects_main_dir ON projects (main_dir COLLATE NOCASE)",
+        "CREATE INDEX tracks_project ON tracks (project_id)",
+        "CREATE INDEX tracks_type ON tracks (type COLLATE NOCASE)",
+        "CREATE INDEX plugins_name ON plugins (name COLLATE NOCASE)",
+        "CREATE INDEX plugins_manufacturer ON plugins (manufacturer COLLATE NOCASE)",
+        "CREATE INDEX plugins_version ON plugins (version)",
+        "CREATE INDEX project_plugins_plugin ON project_plugins (plugin_id, project_id)",
+        "CREATE INDEX project_plugins_project ON project_plugins (project_id)",
+        "CREATE INDEX track_plugins_plugin ON track_plugins (plugin_id, track_id)",
+        "CREATE INDEX track_plugins_track ON track_plugins (track_id)",
+    )
+    
+    def __init__(self, filename: str, project_path: Path, plugins: PluginRegistry, main_dir_of):
+        self.path = Path(filename)
+        self.temp_path = self.path.with_name(self.path.name + '.tmp')
+        self.project_path = project_path
+        self.plugins = plugins
+        self.main_dir_of = main_dir_of
+        self.plugin_count = 0
+        self.written = 0
+        self.track_count = 0
+        self.pending = {'projects': [], 'tracks': [], 'plugins': [], 'project_plugins': [], 'track_plugins': []}
+        self.pending_projects = 0
+        self.temp_path.unlink(missing_ok=True)
+        self.conn = sqlite3.connect(str(self.temp_path))
+        # Temporäre Datei: Journal und fsync sind hier überflüssig
+        self.conn.execute("PRAGMA journal_mode=OFF")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        for statement in self.SCHEMA:
+            self.conn.execute(statement)
+    
+    def write_projects(self, projects: List[Dict]) -> None:
+        pending = self.pending
+        for project in projects:
+            self.written += 1
+            project_id = self.written
+            pending['projects'].append((project_id, project['path'], project['name'], self.main_dir_of(project),
+                                       project['scenes'], len(project['tracks']), len(project['vsts']),
+                                       project.get('duplicate_of')))
+            # Registry-IDs sind 0-basiert, SQLite-Schlüssel beginnen bei 1
+            pending['project_plugins'].extend((project_id, plugin_id + 1) for plugin_id in project['vsts'])
+            for position, track in enumerate(project['tracks'], 1):
+                self.track_count += 1
+                track_id = self.track_count
+                pending['tracks'].append((track_id, project_id, position, track['name'], track['type']))
+                pending['track_plugins'].extend((track_id, plugin_id + 1, plugin_position)
+                                                for plugin_position, plugin_id in enumerate(track['vsts'], 1))
+        self.pending_projects += len(projects)
+        if self.pending_projects >= self.BATCH_SIZE:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Inserts all buffered rows (and plugins interned since the last flush) in one transaction"""
+        records = self.plugins.records[self.plugin_count:]
+        self.pending['plugins'].extend((vst.id + 1, vst.manufacturer, vst.name, vst.filename or '', vst.version or '')
+                                       for vst in records)
+        self.plugin_count += len(records)
+        with self.conn:
+            for table, rows in self.pending.items():
+                if rows:
+                    placeholders = ', '.join('?' * len(rows[0]))
+                    self.conn.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rows)
+                    rows.clear()
+        self.pending_projects = 0
+    
+    def finish(self, summary: Dict) -> None:
+        """Creates the indexes and replaces the previous database"""
+        self.flush()
+        with self.conn:
+            for statement in self.INDEXES:
+                self.conn.execute(statement)
+            self.conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+                ('timestamp', datetime.now().isoformat()),
+                ('project_path', str(self.project_path)),
+                ('total_projects', str(summary['total_projects'])),
+                ('total_vsts', str(summary['total_vsts']))
+            ])
+        self.conn.execute("ANALYZE")
+        self.conn.close()
+        os.replace(self.temp_path, self.path)
+        print(f"Inventory database saved to {self.path}: {self.written} projects, {self.track_count} tracks, "
+              f"{self.plugin_count} plugins")
+    
+    def abort(self) -> None:
+        try:
+            self.conn.close()
+        except sqlite3.Error:
+            pass
+        self.temp_path.unlink(missing_ok=True)
+
+
+def query_inventory_db(filename: str, plugin: Optional[str] = None, manufacturer: Optional[str] = None,
+                       version: Optional[str] = None, main_dir: Optional[str] = None,
+                       track_type: Optional[str] = None, tracks: bool = False) -> List[Dict]:
+    """Plugin occurrences in a --db inventory matching all given filters.
+    
+    plugin and manufacturer match case-insensitive substrings, version,
+    main_dir and track_type exact values. With tracks=True (implied by
+    track_type) every row names the track the plugin sits on.
+    """
+    if not Path(filename).is_file():
+        raise FileNotFoundError(f"Inventory database not found: {filename}")
+    tracks = tracks or track_type is not None
+    columns = ["p.path", "p.name", "p.main_dir", "pl.manufacturer", "pl.name", "pl.filename", "pl.version"]
+    if tracks:
+        columns += ["t.position", "t.name", "t.type"]
+        joins = ("FROM track_plugins o JOIN plugins pl ON pl.id = o.plugin_id "
+                 "JOIN tracks t ON t.id = o.track_id JOIN projects p ON p.id = t.project_id")
+        order = "p.path, t.position, o.position"
+    else:
+        joins = "FROM project_plugins o JOIN plugins pl ON pl.id = o.plugin_id JOIN projects p ON p.id = o.project_id"
+        order = "p.path, pl.manufacturer, pl.name, pl.version"
+    
+    conditions = []
+    params = []
+    for column, value in (("pl.name", plugin), ("pl.manufacturer", manufacturer)):
+        if value is not None:
+            escaped = value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            conditions.append(f"{column} LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+    for column, value in (("pl.version", version), ("p.main_dir", main_dir), ("t.type", track_type)):
+        if value is not None:
+            conditions.append(f"{column} = ?" + (" COLLATE NOCASE" if column != "pl.version" else ""))
+            params.append(value)
+    where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+    
+    conn = sqlite3.connect(f"file:{Path(filename).resolve()}?mode=ro", uri=True)
+    try:
+        rows = conn.execute(f"SELECT DISTINCT {', '.join(columns)} {joins} {where}ORDER BY {order}", params).fetchall()
+    finally:
+        conn.close()
+    
+    keys = ['path', 'project', 'main_dir', 'manufacturer', 'name', 'filename', 'version']
+    if tracks:
+        keys += ['track_position', 'track', 'track_type']
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def query_main(argv: List[str]) -> None:
+    """'query' subcommand: looks up plugin usage in a --db inventory without reading .als files"""
+    parser = argparse.ArgumentParser(prog='ableton_project_analyzer.py query',
+                                     description='Look up plugin usage in an inventory database created with --db')
+    parser.add_argument('db', help='Inventory database (SQLite) written by --db')
+    parser.add_argument('--plugin', help='Plugin name (case-insensitive substring)')
+    parser.add_argument('--manufacturer', help='Manufacturer (case-insensitive substring)')
+    parser.add_argument('--version', help='Exact plugin version')
+    parser.add_argument('--main-dir', help='Main directory (first level below the analyzed path)')
+    parser.add_argument('--track-type', help='Track type, e.g. Audio, MIDI, Return or Master')
+    parser.add_argument('--tracks', action='store_true', help='List the tracks the plugins are used on')
+    parser.add_argument('--json', action='store_true', help='Print the matching rows as JSON')
+    args = parser.parse_args(argv)
+    
+    started = time.perf_counter()
+    try:
+        rows = query_inventory_db(args.db, plugin=args.plugin, manufacturer=args.manufacturer, version=args.version,
+                                  main_dir=args.main_dir, track_type=args.track_type, tracks=args.tracks)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - started
+    
+    if args.json:
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+        return
+    
+    current = None
+    for row in rows:
+        if row['path'] != current:
+            current = row['path']
+            print(f"\n{row['path']}  [{row['main_dir']}]")
+        vst_info = f"{row['manufacturer']} - {row['name']}"
+        if row['filename']:
+            vst_info += f" ({row['filename']})"
+        if row['version']:
+            vst_info += f" [Version: {row['version']}]"
+        if 'track' in row:
+            vst_info = f"{row['track_position']}. [{row['track_type']}] {row['track']}: {vst_info}"
+        print(f"  {vst_info}")
+    projects = len({row['path'] for row in rows})
+    print(f"\n{projects} project(s), {len(rows)} match(es) in {elapsed * 1000:.1f} ms")
+
+
+class DirectoryListingCache:
+    """Answers existence checks from one os.scandir per distinct directory.
+    
+    Listings are shared by all threads; a directory that another thread is
+    already listing is waited for instead of being listed twice. Missing or
+    unreadable directories list as empty. With ignore_case, names are
+    compared case-folded (case-insensitive shares and file systems).
+    """
+    
+    def __init__(self, ignore_case: bool = False):
+        self.ignore_case = ignore_case
+        self.listings = {}
+        self.lock = threading.Lock()
+        self.scans = 0
+    
+    def listing(self, directory: str) -> frozenset:
+        with self.lock:
+            pending = self.listings.get(directory)
+            owner = pending is None
+            if owner:
+                pending = self.listings[directory] = Future()
+                self.scans += 1
+        if owner:
+            try:
+                with os.scandir(directory or '.') as entries:
+                    if self.ignore_case:
+                        names = frozenset(entry.name.casefold() for entry in entries)
+                    else:
+                        names = frozenset(entry.name for entry in entries)
+            except OSError:
+                names = frozenset()
+            pending.set_result(names)
+        return pending.result()
+    
+    def exists(self, path: str) -> bool:
+        directory, name = os.path.split(path)
+        if self.ignore_case:
+            name = name.casefold()
+        return bool(name) and name in self.listing(directory)
+
+
+def sample_candidates(sample: Dict, project_folder: str) -> List[str]:
+    """Where a referenced sample may be: relative to the set's folder first, then the stored absolute path"""
+    candidates = []
+    if sample['relative_path']:
+        parts = sample['relative_path'].replace('\\', '/').split('/')
+        candidates.append(os.path.normpath(os.path.join(project_folder, *parts)))
+    if sample['path']:
+        candidates.append(sample['path'])
+    return candidates
+
+
+class SampleReport:
+    """Checks the sample references of analyzed projects and keeps the missing ones.
+    
+    Projects are checked on a small thread pool while the analysis runs; all
+    checks share one DirectoryListingCache, so each directory is listed once
+    however many sets use it. Only missing references stay in memory.
+    """
+    
+    def __init__(self, max_workers: int = 8, listings: Optional[DirectoryListingCache] = None,
+                 ignore_case: bool = CASE_INSENSITIVE_PLATFORM):
+        self.listings = listings or DirectoryListingCache(ignore_case)
+        self.pool = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        # Begrenzt die wartenden Projekte, damit der Speicher konstant bleibt
+        self.slots = threading.BoundedSemaphore(max(1, max_workers) * 4)
+        self.lock = threading.Lock()
+        self.projects = 0
+        self.references = 0
+        self.missing = []
+        self.missing_counts = Counter()
+        self.finished = False
+    
+    def submit(self, projects: List[Dict]) -> None:
+        for project in projects:
+            samples = project.get('samples')
+            if samples is None:
+                continue
+            self.slots.acquire()
+            future = self.pool.submit(self.check_project, project['name'], project['path'], samples)
+            future.add_done_callback(lambda _: self.slots.release())
+    
+    def check_project(self, name: str, path: str, samples: List[Dict]) -> None:
+        folder = os.path.dirname(path)
+        missing = []
+        for sample in samples:
+            candidates = sample_candidates(sample, folder)
+            if not any(self.listings.exists(candidate) for candidate in candidates):
+                missing.append(dict(sample, location=candidates[0]))
+        with self.lock:
+            self.projects += 1
+            self.references += len(samples)
+            if missing:
+                self.missing.append({'name': name, 'path': path, 'missing': missing})
+                self.missing_counts.update(sample['location'] for sample in missing)
+    
+    def finish(self) -> None:
+        if not self.finished:
+            self.pool.shutdown(wait=True)
+            self.finished = True
+    
+    def report(self) -> Dict:
+        """Totals, missing files ranked by the number of sets using them, and the affected sets"""
+        self.finish()
+        projects = sorted(self.missing, key=lambda project: project['path'])
+        return {
+            'total_projects': self.projects,
+            'total_references': self.references,
+            'missing_references': sum(len(project['missing']) for project in projects),
+            'projects_with_missing_samples': len(projects),
+            'directories_listed': self.listings.scans,
+            'missing_samples': [{'location': location, 'projects': count} for location, count
+                                in sorted(self.missing_counts.items(), key=lambda item: (-item[1], item[0]))],
+            'projects': projects
+        }
+
+
+class ChangeAwareWriter:
+    """Writes text files only if their content changed (ignoring 'Created:' timestamp lines).
+    
+    The size of the existing file is compared first, the file is only read
+    when the sizes match. Thread-safe; counts written/unchanged/failed files.
+    """
+    
+    TIMESTAMP_PREFIX = "Created: "
+    
+    def __init__(self):
+        self.counts = {'written': 0, 'unchanged': 0, 'failed': 0}
+        self.lock = threading.Lock()
+    
+    def write(self, path: Path, lines: List[str]) -> str:
+        content = '\n'.join(lines)
+        try:
+            status = 'unchanged' if self.is_unchanged(path, content) else 'written'
+            if status == 'written':
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+        except Exception as e:
+            print(f"  Error creating {path}: {e}")
+            status = 'failed'
+        with self.lock:
+            self.counts[status] += 1
+        return status
+    
+    def is_unchanged(self, path: Path, content: str) -> bool:
+        try:
+            # Der Zeitstempel hat eine feste Länge, also ändert er die Dateigröße nicht
+            if os.stat(path).st_size != len(content.encode('utf-8')):
+                return False
+            with open(path, 'r', encoding='utf-8') as f:
+                existing = f.read()
+        except (OSError, UnicodeDecodeError):
+            return False
+        return self.strip_timestamps(existing) == self.strip_timestamps(content)
+    
+    @classmethod
+    def strip_timestamps(cls, text: str) -> List[str]:
+        return [line for line in text.split('\n') if not line.startswith(cls.TIMESTAMP_PREFIX)]
+
+
+class VstListSink:
+    """Writes the per-project TXT VST lists while projects are analyzed (bounded-memory runs).
+    
+    Produces the files of export_vst_lists_recursive(); finish() adds the
+    inventory summary and the VST requirements list from the aggregates.
+    Only the owning project path per file is remembered, so same-named
+    projects resolve like in the full export (the last path wins).
+    """
+    
+    compact = True
+    
+    def __init__(self, analyzer: 'AbletonProjectAnalyzer', base_output_dir: str = "vst_lists"):
+        self.analyzer = analyzer
+        self.base_path = Path(base_output_dir)
+        self.base_path.mkdir(exist_ok=True)
+        self.writer = ChangeAwareWriter()
+        self.owners = {}
+    
+    def write_projects(self, projects: List[Dict]) -> None:
+        analyzer = self.analyzer
+        for project in projects:
+            main_dir = analyzer.main_dir_of(project)
+            main_dir_path = self.base_path / main_dir
+            txt_filepath = main_dir_path / f"{analyzer.safe_file_name(project['name'])}_VSTs.txt"
+            owner = self.owners.get(str(txt_filepath))
+            if owner is not None and owner > project['path']:
+                continue
+            if owner is None:
+                main_dir_path.mkdir(exist_ok=True)
+            self.owners[str(txt_filepath)] = project['path']
+            analyzer.write_vst_list(self.writer, txt_filepath, project, main_dir)
+    
+    def finish(self, summary: Dict) -> None:
+        index = self.analyzer.inventory()
+        self.analyzer.create_recursive_summary(self.base_path, index, self.writer)
+        self.analyzer.create_vst_requirements_list(self.base_path, index, self.writer)
+        counts = self.writer.counts
+        print(f"\n[OK] Recursive inventory complete!")
+        print(f"Total {counts['written']} files written, {counts['unchanged']} unchanged"
+              + (f", {counts['failed']} failed" if counts['failed'] else "")
+              + f" in {len(index.main_dirs)} main directories")
+        print(f"Saved in: {self.base_path}")
+    
+    def abort(self) -> None:
+        pass
+
+
+class ExcelSink:
+    """Fills the per-project Excel sheets while projects are analyzed (bounded-memory runs).
+    
+    Project Overview, VST Overview and Track Details rows are spooled by
+    StreamingSheet as projects arrive (in completion order) and written in
+    project path order, like a regular run; finish() adds VST Requirements
+    and Statistics from the aggregates and saves the file.
+    """
+    
+    compact = True
+    
+    def __init__(self, analyzer: 'AbletonProjectAnalyzer', filename: str):
+        self.analyzer = analyzer
+        self.filename = filename
+        self.sheets = (analyzer.project_overview_sheet(sort_by_key=True),
+                       analyzer.vst_overview_sheet(sort_by_key=True),
+                       analyzer.track_details_sheet(sort_by_key=True))
+    
+    def write_projects(self, projects: List[Dict]) -> None:
+        overview, vsts, tracks = self.sheets
+        for project in projects:
+            self.analyzer.append_project_overview_row(overview, project, self.analyzer.main_dir_of(project))
+            self.analyzer.append_vst_overview_rows(vsts, project)
+            self.analyzer.append_track_detail_rows(tracks, project)
+    
+    def finish(self, summary: Dict) -> None:
+        self.analyzer.export_to_excel(self.filename, project_sheets=self.sheets)
+    
+    def abort(self) -> None:
+        for sheet in self.sheets:
+            sheet.spool.close()
+
 
 class AbletonProjectAnalyzer:
-    def __init__(self, project_path: str):
+    def __init__(self, project_path: str, cache: Optional[ProjectCache] = None,
+                 dedup: bool = False, count_mode: str = 'paths', exclude: Optional[List[str]] = None,
+                 parser: str = 'auto', manufacturer_rules: Optional[str] = None,
+                 profiler: Optional[NullProfiler] = None, shard: Optional[Tuple[int, int]] = None,
+                 mode: str = 'full', retain_projects: bool = True, samples: bool = False,
+                 samples_ignore_case: bool = CASE_INSENSITIVE_PLATFORM):
+        if mode not in ANALYSIS_MODES:
+            raise ValueError(f"Unknown analysis mode: {mode}")
         self.project_path = Path(project_path)
+        # 'plugins-only' liefert nur die Plugin-Liste und Szenen, keine Tracks
+        self.mode = mode
+        self.decoded_plugins = {}
+        # Sample-Referenzen sammeln und (im Elternprozess) auf Existenz prüfen
+        self.samples = samples
+        self.samples_ignore_case = samples_ignore_case
+        self.sample_report = None
+        # (i, N): nur Dateien aus Shard i von N analysieren
+        self.shard = shard
+        # False: fertige Projekte gehen nur an die stream_writers und die laufenden Aggregate
+        self.retain_projects = retain_projects
         self.projects = []
+        self.analyzed = 0
         self.all_vsts = set()
         self.lock = threading.Lock()
+        self.cache = cache
+        self.dedup = dedup
+        # 'paths' zählt jede Datei, 'unique' zählt identische Kopien nur einmal
+        self.count_mode = count_mode
+        self.exclude = list(exclude or [])
+        self.parser = resolve_parser_backend(parser)
+        self.plugins = PluginRegistry()
+        self.manufacturer_rules = manufacturer_rules
+        self.manufacturers = ManufacturerResolver.from_file(manufacturer_rules)
+        self.inventory_index = None
+        self.accumulator = None
+        # Position jedes Projekts in self.projects (erst im Watch-Modus aufgebaut)
+        self.project_positions = None
+        # Kennzahlen der Read-ahead-Stufe (nur mit io_workers)
+        self.prefetch_stats = None
+        # Ausgaben, die fertige Projekte schon während der Analyse schreiben
+        self.stream_writers = []
+        self.profiler = profiler or NULL_PROFILER
         
-    def find_ableton_projects(self) -> List[Path]:
+    def find_ableton_projects(self, scanner: Optional[ProjectScanner] = None) -> List[Path]:
         """Finds all Ableton Live projects in the specified directory"""
-        projects = []
-        for file_path in self.project_path.rglob("*.als"):
-            projects.append(file_path)
-        return projects
+        scanner = scanner or ProjectScanner(self.project_path, exclude=self.exclude)
+        return sorted(f for f in scanner.scan() if self.in_shard(f))
+    
+    def in_shard(self, project_file: Path) -> bool:
+        """True if the file belongs to this node's shard (always without shard)"""
+        if self.shard is None:
+            return True
+        index, count = self.shard
+        return shard_of(os.path.relpath(project_file, self.project_path), count) == index
+    
+    def shard_info(self) -> Optional[Dict]:
+        if self.shard is None:
+            return None
+        return {'index': self.shard[0], 'count': self.shard[1]}
+    
+    def extract_project_info(self, project_file: Path, data: Optional[bytes] = None,
+                             hashes: Optional[Dict[str, str]] = None) -> Optional[Dict]:
+        """Extracts information from an Ableton project file - OPTIMIZED
+        
+        data is the raw file content if the read-ahead stage already read it.
+        If hashes is given, the file is read into memory once (through the
+        profiler, like any other read) and the content hash of exactly the
+        parsed bytes is stored in it by path.
+        """
+        profiler = self.profiler
+        if profiler.enabled:
+            started = time.perf_counter()
+            profiler.begin_file()
+            try:
+                return self.extract_by_format(project_file, self.hashed_source(project_file, data, hashes))
+            finally:
+                profiler.end_file(project_file, started)
+        return self.extract_by_format(project_file, self.hashed_source(project_file, data, hashes))
+    
+    def hashed_source(self, project_file: Path, data: Optional[bytes],
+                      hashes: Optional[Dict[str, str]]) -> Optional[bytes]:
+        """data unchanged without hashes, otherwise the file content whose hash was stored in hashes"""
+        if hashes is None:
+            return data
+        # Hash und Ergebnis aus denselben Bytes, auch wenn die Datei zwischendurch neu gespeichert wird
+        if data is None:
+            with self.profiler.open(project_file) as f:
+                data = f.read()
+        hashes[str(project_file)] = content_hash_of(data)
+        return data
+    
+    def open_source(self, project_file: Path, data: Optional[bytes] = None):
+        """The prefetched bytes if there are any, otherwise the file itself"""
+        if data is not None:
+            return io.BytesIO(data)
+        return self.profiler.open(project_file)
     
-    def extract_project_info(self, project_file: Path) -> Optional[Dict]:
-        """Extracts information from an Ableton project file - OPTIMIZED"""
+    def extract_by_format(self, project_file: Path, data: Optional[bytes] = None) -> Optional[Dict]:
+        """Dispatches on the file header (ZIP, gzip or plain XML)"""
         try:
             # Schnelle Header-Erkennung
-            with open(project_file, 'rb') as f:
+            with self.open_source(project_file, data) as f:
                 header = f.read(4)
             
             # ZIP-Datei (neue Ableton-Versionen)
             if header.startswith(b'PK'):
-                return self.extract_from_zip_fast(project_file)
+                return self.extract_from_zip_fast(project_file, data)
             
             # GZIP file (older Ableton versions)  
             elif header.startswith(b'\x1f\x8b'):
-                return self.extract_from_gzip_fast(project_file)
+                return self.extract_from_gzip_fast(project_file, data)
             
             # Direkte XML-Datei (sehr alte Versionen)
             elif header.startswith(b'<'):
-                return self.extract_from_xml_fast(project_file)
+                return self.extract_from_xml_fast(project_file, data)
             
+            self.profiler.failure(project_file, f"unknown header {header!r}", 'unknown_format')
             return None
             
-        except Exception:
+        except Exception as e:
+            self.profiler.failure(project_file, e)
             return None
     
-    def extract_from_zip_fast(self, project_file: Path) -> Optional[Dict]:
-        """Schnelle ZIP-Extraktion"""
+    def extract_from_zip_fast(self, project_file: Path, data: Optional[bytes] = None) -> Optional[Dict]:
+        """Schnelle ZIP-Extraktion (streamend)"""
         try:
-            with zipfile.ZipFile(project_file, 'r') as zip_file:
+            with self.open_source(project_file, data) as raw, zipfile.ZipFile(raw, 'r') as zip_file:
                 if 'Project.xml' not in zip_file.namelist():
+                    self.profiler.failure(project_file, "Project.xml missing in ZIP", 'missing_project_xml')
                     return None
-                xml_content = zip_file.read('Project.xml')
-                root = ET.fromstring(xml_content)
-                return self.parse_xml_fast(root, project_file)
-        except Exception:
+                with zip_file.open('Project.xml') as stream:
+                    return self.parse_stream_fast(self.profiler.wrap_stream(stream), project_file)
+        except Exception as e:
+            self.profiler.failure(project_file, e)
             return None
     
-    def extract_from_gzip_fast(self, project_file: Path) -> Optional[Dict]:
-        """Schnelle GZIP-Extraktion"""
+    def extract_from_gzip_fast(self, project_file: Path, data: Optional[bytes] = None) -> Optional[Dict]:
+        """Schnelle GZIP-Extraktion (streamend)"""
         try:
-            with gzip.open(project_file, 'rb') as f:
-                xml_content = f.read()
-            root = ET.fromstring(xml_content)
-            return self.parse_xml_fast(root, project_file)
-        except Exception:
+            with self.open_source(project_file, data) as raw, gzip.GzipFile(fileobj=raw, mode='rb') as stream:
+                return self.parse_stream_fast(self.profiler.wrap_stream(stream), project_file)
+        except Exception as e:
+            self.profiler.failure(project_file, e)
             return None
     
-    def extract_from_xml_fast(self, project_file: Path) -> Optional[Dict]:
-        """Schnelle XML-Extraktion"""
+    def extract_from_xml_fast(self, project_file: Path, data: Optional[bytes] = None) -> Optional[Dict]:
+        """Schnelle XML-Extraktion (streamend)"""
         try:
-            with open(project_file, 'rb') as f:
-                xml_content = f.read()
-            root = ET.fromstring(xml_content)
-            return self.parse_xml_fast(root, project_file)
-        except Exception:
+            with self.open_source(project_file, data) as stream:
+                return self.parse_stream_fast(self.profiler.wrap_stream(stream), project_file)
+        except Exception as e:
+            self.profiler.failure(project_file, e)
             return None
     
-    def parse_xml_fast(self, root: ET.Element, project_file: Path) -> Dict:
-        """Schnelle XML-Parsing mit Track-Details"""
-        project_info = {
+    def parse_stream_fast(self, stream, project_file: Path) -> Dict:
+        """Parses the project XML incrementally from a (decompression) stream.
+        
+        Elements are released as soon as they are processed, so memory stays
+        flat regardless of the size of the Project XML.
+        """
+        if self.mode == 'plugins-only':
+            return self.scan_plugins_fast(stream, project_file)
+        if self.parser == 'lxml':
+            events = lxml_etree.iterparse(stream, events=('start', 'end'),
+                                          tag=BUILDER_TAGS + SAMPLE_TAGS if self.samples else BUILDER_TAGS,
+                                          resolve_entities=False, huge_tree=True)
+            builder = LxmlProjectEventBuilder(project_file, self.extract_vst_from_element, release=True,
+                                              samples=self.samples)
+            return self.build_project(events, project_file, builder=builder)
+        events = ET.iterparse(stream, events=('start', 'end'))
+        return self.build_project(events, project_file, release=True)
+    
+    def scan_plugins_fast(self, stream, project_file: Path) -> Dict:
+        """Plugins-only scan: project VSTs and scene count straight from the byte stream.
+        
+        Yields the same 'vsts' list as the full parser (same order, same
+        manufacturer fallback, one shared dict per distinct plugin) but no
+        track details.
+        """
+        blocks, scenes = scan_plugin_blocks(stream)
+        vsts = []
+        plugins = {}
+        for fields in blocks:
+            # Ohne PlugName mit Value überspringt auch der volle Parser das Plugin
+            name = fields.get(b'PlugName')
+            if not name:
+                continue
+            key = (name, fields.get(b'FileName', b''), fields.get(b'VstVersion', b''),
+                   fields.get(b'Manufacturer') or None)
+            plugin_data = plugins.get(key)
+            if plugin_data is None:
+                values = self.decode_plugin_fields(key)
+                # Verschieden escapte, aber gleiche Werte teilen sich ebenfalls ein Dict
+                plugin_data = plugins.setdefault(values, dict(zip(PLUGIN_FIELDS, values)))
+                plugins[key] = plugin_data
+            vsts.append(plugin_data)
+        return {
             'name': project_file.stem,
             'path': str(project_file),
-            'vsts': [],
+            'vsts': vsts,
             'tracks': [],
-            'scenes': 0
+            'scenes': scenes
         }
-        
-        # VST-Plugins extrahieren
-        project_info['vsts'] = self.extract_vsts_fast(root)
-        
-        # Track-Details extrahieren
-        project_info['tracks'] = self.extract_tracks_with_vsts(root)
-        
-        # Scene Anzahl extrahieren
-        project_info['scenes'] = len(root.findall('.//Scene'))
-        
-        return project_info
     
-    def extract_vsts_fast(self, root: ET.Element) -> List[Dict]:
-        """Extrahiert VST-Plugin-Informationen - OPTIMIERT"""
-        vsts = []
-        
-        # Suche nach VstPluginInfo-Elementen
-        for vst_info in root.findall('.//VstPluginInfo'):
-            plugin_data = {}
-            
-            # Plugin-Name
-            plug_name_elem = vst_info.find('PlugName')
-            if plug_name_elem is not None and 'Value' in plug_name_elem.attrib:
-                plugin_data['name'] = plug_name_elem.attrib['Value']
-            else:
-                continue  # Skip if no name found
-            
-            # Dateiname
-            file_name_elem = vst_info.find('FileName')
-            plugin_data['filename'] = file_name_elem.attrib.get('Value', '') if file_name_elem is not None else ''
-            
-            # Version
-            version_elem = vst_info.find('VstVersion')
-            plugin_data['version'] = version_elem.attrib.get('Value', '') if version_elem is not None else ''
-            
-            # Hersteller
-            manufacturer_elem = vst_info.find('Manufacturer')
-            if manufacturer_elem is not None and 'Value' in manufacturer_elem.attrib:
-                plugin_data['manufacturer'] = manufacturer_elem.attrib['Value']
-            else:
-                # Fallback: Hersteller aus Dateiname ableiten
-                filename = plugin_data['filename']
-                if 'Maschine' in filename:
-                    plugin_data['manufacturer'] = 'Native Instruments'
-                elif 'Serum' in filename:
-                    plugin_data['manufacturer'] = 'Xfer Records'
-                elif 'Massive' in filename:
-                    plugin_data['manufacturer'] = 'Native Instruments'
-                elif 'FabFilter' in filename:
-                    plugin_data['manufacturer'] = 'FabFilter'
-                elif 'iZotope' in filename:
-                    plugin_data['manufacturer'] = 'iZotope'
-                elif 'Youlean' in filename:
-                    plugin_data['manufacturer'] = 'Youlean'
-                elif 'AR TG' in filename:
-                    plugin_data['manufacturer'] = 'AR TG'
-                else:
-                    plugin_data['manufacturer'] = 'Unbekannt'
-            
-            vsts.append(plugin_data)
-            self.all_vsts.add(f"{plugin_data['manufacturer']} - {plugin_data['name']}")
-        
-        return vsts
+    def decode_plugin_fields(self, raw: Tuple[bytes, bytes, bytes, Optional[bytes]]) -> Tuple[str, str, str, str]:
+        """(name, filename, version, manufacturer) for raw scanned values, cached across files"""
+        values = self.decoded_plugins.get(raw)
+        if values is None:
+            name, filename, version, manufacturer = raw
+            filename = decode_attribute(raw_value(filename))
+            values = (decode_attribute(raw_value(name)), filename, decode_attribute(raw_value(version)),
+                      decode_attribute(raw_value(manufacturer)) if manufacturer is not None
+                      else self.manufacturers.resolve(filename))
+            if len(self.decoded_plugins) >= DECODED_PLUGIN_CACHE_SIZE:
+                self.decoded_plugins.clear()
+            self.decoded_plugins[raw] = values
+        return values
     
-    def extract_tracks_with_vsts(self, root: ET.Element) -> List[Dict]:
-        """Extrahiert Track-Details mit verwendeten VSTs"""
-        tracks = []
-        
-        # Suche nach allen Tracks (verschiedene Ableton-Versionen)
-        track_elements = []
-        
-        # Verschiedene Track-Typen in Ableton
-        track_types = [
-            './/AudioTrack',
-            './/MidiTrack', 
-            './/ReturnTrack',
-            './/MasterTrack',
-            './/Track'  # Fallback for all tracks
-        ]
-        
-        for track_type in track_types:
-            for track in root.findall(track_type):
-                if track not in track_elements:  # Vermeide Duplikate
-                    track_elements.append(track)
-        
-        for track in track_elements:
-            track_info = {
-                'name': 'Unbekannter Track',
-                'type': 'Audio',  # Default
-                'vsts': []
-            }
-            
-            # Track-Name extrahieren
-            name_elem = track.find('Name')
-            if name_elem is not None and 'Value' in name_elem.attrib:
-                track_info['name'] = name_elem.attrib['Value']
-            
-            # Track-Typ bestimmen
-            if track.tag == 'AudioTrack' or track.find('.//AudioTrack') is not None:
-                track_info['type'] = 'Audio'
-            elif track.tag == 'MidiTrack' or track.find('.//MidiTrack') is not None:
-                track_info['type'] = 'MIDI'
-            elif track.tag == 'ReturnTrack' or track.find('.//ReturnTrack') is not None:
-                track_info['type'] = 'Return'
-            elif track.tag == 'MasterTrack' or track.find('.//MasterTrack') is not None:
-                track_info['type'] = 'Master'
-            
-            # VST-Devices auf diesem Track finden
-            track_vsts = []
-            
-            # Suche in DeviceChain
-            for device_chain in track.findall('.//DeviceChain'):
-                for vst_info in device_chain.findall('.//VstPluginInfo'):
-                    plugin_data = self.extract_vst_from_element(vst_info)
-                    if plugin_data:
-                        track_vsts.append(plugin_data)
-            
-            # Suche direkt im Track
-            for vst_info in track.findall('.//VstPluginInfo'):
-                plugin_data = self.extract_vst_from_element(vst_info)
-                if plugin_data and plugin_data not in track_vsts:
-                    track_vsts.append(plugin_data)
-            
-            track_info['vsts'] = track_vsts
-            tracks.append(track_info)
-        
-        return tracks
+    def parse_xml_fast(self, root: ET.Element, project_file: Path) -> Dict:
+        """Schnelles XML-Parsing mit Track-Details (ein einziger Durchlauf)"""
+        return self.build_project(iter_tree_events(root), project_file)
+    
+    def build_project(self, events, project_file: Path, release: bool = False,
+                      builder: Optional[ProjectEventBuilder] = None) -> Dict:
+        """Builds the project dict from (event, element) pairs in one traversal"""
+        if builder is None:
+            builder = ProjectEventBuilder(project_file, self.extract_vst_from_element, release=release,
+                                          samples=self.samples)
+        for event, elem in events:
+            if event == 'start':
+                builder.start(elem)
+            else:
+                builder.end(elem)
+        return builder.result()
     
     def extract_vst_from_element(self, vst_info: ET.Element) -> Optional[Dict]:
         """Extrahiert VST-Daten aus einem VstPluginInfo-Element"""
@@ -253,110 +2623,594 @@ class AbletonProjectAnalyzer:
             plugin_data['manufacturer'] = manufacturer_elem.attrib['Value']
         else:
             # Fallback: Hersteller aus Dateiname ableiten
-            filename = plugin_data['filename']
-            if 'Maschine' in filename:
-                plugin_data['manufacturer'] = 'Native Instruments'
-            elif 'Serum' in filename:
-                plugin_data['manufacturer'] = 'Xfer Records'
-            elif 'Massive' in filename:
-                plugin_data['manufacturer'] = 'Native Instruments'
-            elif 'FabFilter' in filename:
-                plugin_data['manufacturer'] = 'FabFilter'
-            elif 'iZotope' in filename:
-                plugin_data['manufacturer'] = 'iZotope'
-            elif 'Youlean' in filename:
-                plugin_data['manufacturer'] = 'Youlean'
-            elif 'AR TG' in filename:
-                plugin_data['manufacturer'] = 'AR TG'
-            else:
-                plugin_data['manufacturer'] = 'Unbekannt'
+            plugin_data['manufacturer'] = self.manufacturers.resolve(plugin_data['filename'])
+        
+        return plugin_data
+    
+    def analyze_projects(self, quiet: bool = False, max_workers: int = 16, executor: str = 'thread',
+                         io_workers: int = 0, prefetch_mb: int = 256) -> None:
+        """Analyzes all found projects in parallel - OPTIMIZED for speed
+        
+        Discovery streams into a largest-first WorkQueue, so parsing starts
+        with the first file found and idle workers keep pulling size-aware
+        chunks until everything is done. executor='thread' parses in worker
+        threads, executor='process' parses in worker processes so the
+        CPU-bound XML traversal scales across cores. With io_workers > 0 a
+        Prefetcher reads the files ahead (at most prefetch_mb buffered) and
+        max_workers only limits decompression and parsing.
+        """
+        print(f"Searching for Ableton projects in: {self.project_path}")
+        
+        duplicates = {}
+        project_files = None
+        scanner = ProjectScanner(self.project_path, exclude=self.exclude)
+        if self.dedup:
+            # Duplikaterkennung braucht die vollständige Dateiliste
+            project_files = self.find_ableton_projects(scanner)
+            print(f"Found: {len(project_files)} project(s)")
+            source = []
+            if project_files:
+                with self.profiler.stage('dedup'):
+                    source, duplicates = self.find_duplicates(project_files)
+        else:
+            source = scanner.scan()
+            if self.shard is not None:
+                print(f"Shard {self.shard[0]}/{self.shard[1]}: analyzing only this node's share of the files")
+                source = (project_file for project_file in source if self.in_shard(project_file))
+        
+        if self.mode == 'plugins-only':
+            print("Plugins-only scan: collecting plugins and scenes without track details")
+        if executor == 'process':
+            print(f"Starting parallel analysis with {max_workers} processes...")
+            process_pool = ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            print(f"Starting parallel analysis with {max_workers} threads...")
+            process_pool = None
+        
+        work = WorkQueue(max_workers)
+        prefetcher = None
+        if io_workers > 0:
+            print(f"Reading ahead with {io_workers} I/O threads (buffer: {prefetch_mb} MB)")
+            work = WorkQueue(io_workers)
+            prefetcher = Prefetcher(work, io_workers, prefetch_mb * 1024 * 1024)
+        started = time.perf_counter()
+        # Begrenzt: kommt das Einsammeln nicht hinterher, warten die Worker, statt Ergebnisse anzuhäufen
+        results = queue.Queue(maxsize=max(1, max_workers) * 4)
+        # Mit --cache-hash hashen die Worker genau die Bytes, die sie parsen
+        hash_content = self.cache is not None and self.cache.use_hash
+        discovered = []
+        file_stats = {}
+        completed = 0
+        
+        def known_files() -> int:
+            return len(project_files) if project_files is not None else len(discovered)
+        
+        def feed() -> None:
+            # Discovery (+ cache lookup) fills the work queue while workers run
+            try:
+                with self.profiler.stage('discovery'):
+                    feed_files()
+                if not self.dedup:
+                    print(f"Found: {len(discovered)} project(s)")
+            finally:
+                work.close()
+        
+        def feed_files() -> None:
+            for project_file in source:
+                discovered.append(project_file)
+                try:
+                    stat = os.stat(project_file)
+                except OSError:
+                    stat = None
+                if self.cache is not None and stat is not None:
+                    with self.profiler.stage('cache_lookup'):
+                        cached = self.lookup_cached_project(project_file, file_stats, stat)
+                    if cached is not None:
+                        results.put((None, cached, None))
+                        continue
+                work.put(project_file, stat.st_size if stat is not None else 0)
+        
+        def work_loop() -> None:
+            # Idle workers keep pulling chunks until the queue is drained
+            try:
+                while True:
+                    sources = None
+                    hashes = {} if hash_content else None
+                    if prefetcher is not None:
+                        prefetched = prefetcher.get_batch(work.max_chunk)
+                        if prefetched is None:
+                            break
+                        chunk = [project_file for project_file, _ in prefetched]
+                        sources = [data for _, data in prefetched]
+                    else:
+                        chunk = work.get_chunk()
+                        if chunk is None:
+                            break
+                    try:
+                        if process_pool is not None:
+                            chunk_results, hashes, worker_profiler = process_pool.submit(
+                                extract_batch_worker, str(self.project_path), self.worker_options(), chunk,
+                                sources, hash_content).result()
+                            if worker_profiler is not None:
+                                self.profiler.merge(worker_profiler)
+                        else:
+                            chunk_results = self.extract_batch(chunk, sources, hashes)
+                    except Exception as e:
+                        chunk_results = e
+                    finally:
+                        if prefetcher is not None:
+                            prefetcher.release(prefetched)
+                    results.put((chunk, chunk_results, hashes))
+            finally:
+                results.put(WorkQueue.DONE)
+        
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+        workers = [threading.Thread(target=work_loop, daemon=True) for _ in range(max_workers)]
+        for worker in workers:
+            worker.start()
+        
+        # Collect results (merged in the parent, workers never touch shared state)
+        running = len(workers)
+        while running:
+            item = results.get()
+            if item is WorkQueue.DONE:
+                running -= 1
+                continue
+            
+            chunk, chunk_results, hashes = item
+            if chunk is None:
+                # Unveränderte Datei aus dem Cache
+                with self.profiler.stage('collect'):
+                    chunk_results = self.fan_out_duplicates(chunk_results, duplicates)
+                    self.stream_projects(self.add_projects(chunk_results))
+                completed += len(chunk_results)
+                continue
+            
+            if isinstance(chunk_results, Exception):
+                if not quiet:
+                    print(f"Batch error: {chunk_results}")
+                for project_file in chunk:
+                    self.profiler.failure(project_file, chunk_results, 'batch_error')
+                continue
+            
+            if self.cache is not None:
+                with self.profiler.stage('cache_store'):
+                    self.store_cached_projects(chunk, chunk_results, file_stats, hashes)
+            with self.profiler.stage('collect'):
+                chunk_results = self.fan_out_duplicates(chunk_results, duplicates)
+                self.stream_projects(self.add_projects(chunk_results))
+            completed += len(chunk_results)
+            
+            if not quiet:
+                print(f"Progress: {completed}/{known_files()} projects analyzed")
+            elif completed % 200 < len(chunk_results):  # Less frequent updates
+                print(f"Progress: {completed}/{known_files()} projects analyzed...")
         
-        return plugin_data
-    
-    def analyze_projects(self, quiet: bool = False, max_workers: int = 16) -> None:
-        """Analyzes all found projects in parallel - OPTIMIZED for speed"""
-        print(f"Searching for Ableton projects in: {self.project_path}")
-        project_files = self.find_ableton_projects()
+        feeder.join()
+        if process_pool is not None:
+            process_pool.shutdown()
+        if prefetcher is not None:
+            self.prefetch_stats = prefetcher.stats
+            print(prefetcher.summary(time.perf_counter() - started, max_workers))
         
-        if not project_files:
+        all_files = project_files if project_files is not None else discovered
+        if self.cache is not None:
+            # Mit --shard fehlen die Dateien der anderen Shards in der Liste: nichts entfernen
+            evicted = 0
+            if self.shard is None:
+                evicted = self.cache.evict_missing(self.project_path, all_files, keep=scanner.unlisted)
+            if scanner.unlisted:
+                print(f"Warning: {len(scanner.unlisted)} path(s) could not be listed (e.g. {scanner.unlisted[0]}); "
+                      f"their cache entries were kept")
+            print(f"Cache: {len(discovered) - len(file_stats)} unchanged, {len(file_stats)} analyzed, "
+                  f"{evicted} removed")
+        
+        if not all_files:
             print("No Ableton projects found!")
             return
         
-        print(f"Found: {len(project_files)} project(s)")
-        print(f"Starting parallel analysis with {max_workers} threads...")
+        print(f"Analysis complete: {self.analyzed} projects successfully processed")
+    
+    def find_duplicates(self, project_files: List[Path], report: bool = True
+                        ) -> Tuple[List[Path], Dict[str, List[Path]]]:
+        """Groups byte-identical project files (size prefilter, then content hash).
         
-        # Batch processing for better performance
-        batch_size = max(1, len(project_files) // max_workers)
-        completed = 0
+        Returns the files that need parsing and a mapping from each parsed
+        original to its identical copies. Non-Backup paths are preferred as
+        the original of a group.
+        """
+        files_by_size = {}
+        unique_files = []
+        for project_file in project_files:
+            try:
+                files_by_size.setdefault(os.stat(project_file).st_size, []).append(project_file)
+            except OSError:
+                unique_files.append(project_file)
         
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Batch processing instead of individual projects
-            futures = []
-            for i in range(0, len(project_files), batch_size):
-                batch = project_files[i:i + batch_size]
-                future = executor.submit(self.process_batch, batch)
-                futures.append(future)
+        duplicates = {}
+        for files in files_by_size.values():
+            if len(files) == 1:
+                unique_files.extend(files)
+                continue
             
-            # Collect results
-            for future in as_completed(futures):
+            files_by_hash = {}
+            for project_file in files:
                 try:
-                    batch_results = future.result()
-                    completed += len(batch_results)
-                    
-                    if not quiet:
-                        print(f"Progress: {completed}/{len(project_files)} projects analyzed")
-                    elif completed % 200 == 0:  # Less frequent updates
-                        print(f"Progress: {completed}/{len(project_files)} projects analyzed...")
-                        
-                except Exception as e:
-                    if not quiet:
-                        print(f"Batch error: {e}")
-        
-        print(f"Analysis complete: {len(self.projects)} projects successfully processed")
+                    if self.cache is not None:
+                        content_hash = self.cache.content_hash(project_file)
+                    else:
+                        content_hash = file_content_hash(project_file)
+                except OSError:
+                    unique_files.append(project_file)
+                    continue
+                files_by_hash.setdefault(content_hash, []).append(project_file)
+            
+            for group in files_by_hash.values():
+                group.sort(key=lambda f: ('Backup' in f.parts, str(f)))
+                unique_files.append(group[0])
+                if len(group) > 1:
+                    duplicates[str(group[0])] = group[1:]
+        
+        copies = sum(len(group) for group in duplicates.values())
+        if report:
+            print(f"Duplicates: {copies} identical copies of {len(duplicates)} sets will not be parsed again")
+        return unique_files, duplicates
     
-    def process_batch(self, project_batch: List[Path]) -> List[Dict]:
-        """Processes a batch of projects"""
-        batch_results = []
+    def fan_out_duplicates(self, project_infos: List[Dict], duplicates: Dict[str, List[Path]]) -> List[Dict]:
+        """Adds a project entry for every identical copy of a parsed project"""
+        if not duplicates:
+            return project_infos
+        
+        copies = []
+        for project in project_infos:
+            for duplicate in duplicates.get(project['path'], ()):
+                copy = dict(project, name=duplicate.stem, path=str(duplicate))
+                copy['duplicate_of'] = project['path']
+                copies.append(copy)
+        return project_infos + copies
+    
+    def is_counted(self, project: Dict) -> bool:
+        """True if the project counts towards totals in the current count mode"""
+        return self.count_mode != 'unique' or 'duplicate_of' not in project
+    
+    def lookup_cached_project(self, project_file: Path, file_stats: Dict,
+                              stat: Optional[os.stat_result] = None) -> Optional[List[Dict]]:
+        """Returns the cached result ([] for cached failures) or None if the file needs parsing"""
+        try:
+            hit, project, stat = self.cache.lookup(project_file, stat)
+        except OSError:
+            return None
+        if not hit:
+            file_stats[str(project_file)] = stat
+            return None
+        return [project] if project is not None else []
+    
+    def store_cached_projects(self, project_batch: List[Path], batch_results: List[Dict], file_stats: Dict,
+                              hashes: Optional[Dict[str, str]] = None) -> None:
+        """Writes the results of a batch (including failed files) to the cache"""
+        results_by_path = {project['path']: project for project in batch_results}
         for project_file in project_batch:
+            stat = file_stats.get(str(project_file))
+            if stat is None:
+                continue
+            try:
+                self.cache.store(project_file, stat, results_by_path.get(str(project_file)),
+                                 hashes.get(str(project_file)) if hashes else None)
+            except OSError:
+                pass
+    
+    def worker_options(self) -> Dict:
+        """Constructor options a worker process needs to extract like this analyzer"""
+        options = {'parser': self.parser, 'manufacturer_rules': self.manufacturer_rules, 'mode': self.mode,
+                   'samples': self.samples}
+        if self.profiler.enabled:
+            # Jeder Worker-Aufruf misst mit einem eigenen Profiler, der zurückgeschickt wird
+            options['profiler'] = Profiler(self.profiler.top)
+        return options
+    
+    def result_version(self) -> str:
+        """Identifies everything that shapes extracted results (for caches)"""
+        version = f"{PARSER_VERSION}:{self.manufacturers.fingerprint}"
+        if self.mode != 'full':
+            # Ergebnisse ohne Tracks dürfen keinen vollen Lauf bedienen
+            version += f":{self.mode}"
+        if self.samples:
+            version += f":samples{SAMPLE_REF_VERSION}"
+        return version
+    
+    def extract_batch(self, project_batch: List[Path], sources: Optional[List[Optional[bytes]]] = None,
+                      hashes: Optional[Dict[str, str]] = None) -> List[Dict]:
+        """Extracts a batch of projects without touching the analyzer state
+        
+        sources holds the prefetched raw content per file (None entries are read from disk).
+        hashes collects the content hashes of the parsed bytes (see extract_project_info).
+        """
+        batch_results = []
+        for project_file, data in zip(project_batch, sources or itertools.repeat(None)):
             try:
-                project_info = self.extract_project_info(project_file)
+                # Ohne vorab gelesene Daten liest extract_project_info die Datei selbst
+                if data is None and hashes is None:
+                    project_info = self.extract_project_info(project_file)
+                else:
+                    project_info = self.extract_project_info(project_file, data, hashes)
                 if project_info:
                     batch_results.append(project_info)
-            except Exception:
-                # Silent error handling for better performance
-                pass
+            except Exception as e:
+                # Fehler nur zählen (--profile), die Analyse läuft weiter
+                self.profiler.failure(project_file, e)
+        return batch_results
+    
+    def process_batch(self, project_batch: List[Path]) -> List[Dict]:
+        """Processes a batch of projects"""
+        batch_results = self.extract_batch(project_batch)
+        self.add_projects(batch_results)
+        return batch_results
+    
+    def add_projects(self, project_infos: List[Dict]) -> List[Dict]:
+        """Merges extracted projects and their VSTs into the analyzer state, returns the compacted projects"""
+        compact_projects = []
+        compact_tracks = {}
+        for project in project_infos:
+            compact_projects.append(self.compact_project(project, compact_tracks))
         
         # Thread-safe addition to main list
         with self.lock:
-            self.projects.extend(batch_results)
+            self.analyzed += len(compact_projects)
+            self.inventory_index = None
+            if self.retain_projects:
+                self.projects.extend(compact_projects)
+                self.accumulator = None
+                self.project_positions = None
+            else:
+                # Nur die Aggregate wachsen mit; die Projekte gehen danach an die stream_writers
+                if self.accumulator is None:
+                    self.accumulator = InventoryAccumulator(self.plugins, retain=False)
+                for project in compact_projects:
+                    self.accumulator.add(project, self.main_dir_of(project), self.is_counted(project))
+            for project in compact_projects:
+                for vst in self.plugins.resolve(project['vsts']):
+                    self.all_vsts.add(vst.key)
+            if self.samples and self.sample_report is None:
+                self.sample_report = SampleReport(ignore_case=self.samples_ignore_case)
+        if self.samples:
+            self.sample_report.submit(compact_projects)
+        return compact_projects
+    
+    def stream_projects(self, projects: List[Dict]) -> None:
+        """Hands freshly analyzed projects to the streaming outputs"""
+        if self.stream_writers:
+            expanded = None
+            for writer in self.stream_writers:
+                if writer.compact:
+                    writer.write_projects(projects)
+                    continue
+                if expanded is None:
+                    expanded = [self.expand_project(project) for project in projects]
+                writer.write_projects(expanded)
+    
+    def finish_stream_writers(self) -> None:
+        summary = self.json_summary()
+        for writer in self.stream_writers:
+            writer.finish(summary)
+        self.stream_writers = []
+    
+    def compact_project(self, project: Dict, compact_tracks: Optional[Dict] = None) -> Dict:
+        """Replaces plugin dicts by arrays of registry IDs (tracks of identical copies are shared)"""
+        compact = dict(project)
+        compact['vsts'] = self.plugins.intern_all(project['vsts'])
+        tracks = None if compact_tracks is None else compact_tracks.get(id(project['tracks']))
+        if tracks is None:
+            tracks = [dict(track, vsts=self.plugins.intern_all(track['vsts'])) for track in project['tracks']]
+            if compact_tracks is not None:
+                compact_tracks[id(project['tracks'])] = tracks
+        compact['tracks'] = tracks
+        return compact
+    
+    def expand_project(self, project: Dict) -> Dict:
+        """Resolves plugin IDs back into the plain project dict structure"""
+        expanded = dict(project)
+        expanded['vsts'] = [vst.as_dict() for vst in self.plugins.resolve(project['vsts'])]
+        expanded['tracks'] = [
+            dict(track, vsts=[vst.as_dict() for vst in self.plugins.resolve(track['vsts'])])
+            for track in project['tracks']
+        ]
+        return expanded
+    
+    def expanded_projects(self):
+        """Yields all analyzed projects as plain dicts (plugin IDs resolved lazily)"""
+        for project in self.projects:
+            yield self.expand_project(project)
+    
+    def main_dir_of(self, project: Dict) -> str:
+        """Hauptverzeichnis eines Projekts (erste Ebene unter dem Suchpfad)"""
+        project_path = Path(project['path'])
+        try:
+            relative_path = project_path.relative_to(self.project_path)
+            # Nur die erste Ebene verwenden, nicht den kompletten Pfad
+            return relative_path.parts[0] if relative_path.parts else "Root"
+        except ValueError:
+            # Falls der Pfad nicht relativ ist, verwende den Ordnernamen
+            return project_path.parent.name if project_path.parent.name else "Root"
+    
+    def inventory(self) -> InventoryIndex:
+        """Returns the aggregated inventory, built once per analysis and shared by all exporters"""
+        with self.lock:
+            if self.inventory_index is None:
+                with self.profiler.stage('aggregation'):
+                    if self.accumulator is None:
+                        self.accumulator = InventoryAccumulator(self.plugins)
+                        # Pfad-Reihenfolge statt Abschlussreihenfolge der Worker: gleiche Daten ergeben gleiche Berichte
+                        for project in sorted(self.projects, key=lambda project: project['path']):
+                            self.accumulator.add(project, self.main_dir_of(project), self.is_counted(project))
+                    self.inventory_index = self.accumulator.freeze()
+            return self.inventory_index
+    
+    def apply_changes(self, paths: Set[Path]) -> Tuple[List[Dict], List[Dict]]:
+        """Re-analyzes changed project files and drops deleted ones (watch mode).
         
-        return batch_results
+        Only the affected files are parsed (or taken from the cache) and the
+        inventory aggregates are updated in place, so the cost follows the
+        number of changes, not the archive size. Returns the updated and
+        the removed projects. With dedup, the copies of changed or removed
+        originals are grouped again, like in a fresh run.
+        """
+        self.inventory()
+        with self.lock:
+            if self.project_positions is None:
+                self.project_positions = {project['path']: index for index, project in enumerate(self.projects)}
+            changed, removed = self.split_changes(paths, self.project_positions)
+        
+        to_resolve = changed
+        duplicates = {}
+        if self.dedup and (changed or removed):
+            # Kopien eines geänderten Originals sind nicht mehr identisch (oder gehören zu einem neuen Original)
+            changed = changed | self.duplicate_relatives(changed | removed)
+            removed = removed | {f for f in changed if not f.is_file()}
+            changed = changed - removed
+            unique_files, duplicates = self.find_duplicates(sorted(changed), report=False)
+            to_resolve = set(unique_files)
+        
+        fresh = []
+        to_parse = []
+        file_stats = {}
+        for project_file in sorted(to_resolve):
+            cached = self.lookup_cached_project(project_file, file_stats) if self.cache is not None else None
+            if cached is None:
+                to_parse.append(project_file)
+            else:
+                fresh.extend(cached)
+        if to_parse:
+            hashes = {} if self.cache is not None and self.cache.use_hash else None
+            parsed = self.extract_batch(to_parse, hashes=hashes)
+            if self.cache is not None:
+                self.store_cached_projects(to_parse, parsed, file_stats, hashes)
+            fresh.extend(parsed)
+        if self.cache is not None:
+            self.cache.discard(sorted(removed))
+            self.cache.commit()
+        fresh = self.fan_out_duplicates(fresh, duplicates)
+        
+        compact_projects = [self.compact_project(project) for project in fresh]
+        fresh_paths = {project['path'] for project in compact_projects}
+        removed_projects = []
+        with self.lock:
+            positions = self.project_positions
+            for path in sorted({str(f) for f in changed} | {str(f) for f in removed}):
+                old = self.accumulator.remove(path)
+                index = positions.pop(path, None)
+                if index is not None:
+                    # Lücke mit dem letzten Projekt füllen statt die Liste zu verschieben
+                    last = self.projects.pop()
+                    if index < len(self.projects):
+                        self.projects[index] = last
+                        positions[last['path']] = index
+                if old is not None and path not in fresh_paths:
+                    removed_projects.append(old)
+            for project in compact_projects:
+                positions[project['path']] = len(self.projects)
+                self.projects.append(project)
+                self.accumulator.add(project, self.main_dir_of(project), self.is_counted(project))
+            self.all_vsts = set(self.accumulator.all_plugin_keys)
+            self.inventory_index = None
+        return compact_projects, removed_projects
+    
+    def duplicate_relatives(self, project_files: Set[Path]) -> Set[Path]:
+        """Known copies of the given project files plus the originals of those that are copies"""
+        targets = {str(project_file) for project_file in project_files}
+        relatives = set()
+        with self.lock:
+            for project in self.projects:
+                original = project.get('duplicate_of')
+                if original in targets:
+                    relatives.add(Path(project['path']))
+                elif original is not None and project['path'] in targets:
+                    relatives.add(Path(original))
+        return relatives
+    
+    def split_changes(self, paths: Set[Path], known: Dict[str, int]) -> Tuple[Set[Path], Set[Path]]:
+        """Turns watcher paths into project files to (re)parse and project files that are gone"""
+        changed = set()
+        removed = set()
+        for path in paths:
+            path = Path(path)
+            if path.is_dir():
+                # Neuer, verschobener oder (nach verlorenen Ereignissen) der ganze Ordner
+                changed.update(f for f in ProjectScanner(self.project_path, exclude=self.exclude).scan(path)
+                               if self.in_shard(f))
+            elif os.path.normcase(path.name).endswith('.als'):
+                if path.is_file() and self.in_shard(path):
+                    changed.add(path)
+                elif str(path) in known:
+                    removed.add(path)
+                continue
+            prefix = os.path.join(str(path), '')
+            removed.update(Path(known_path) for known_path in known
+                           if known_path.startswith(prefix) and not os.path.exists(known_path))
+        return changed, removed
+    
+    def watch(self, watcher: ProjectWatcher, debounce: float = 2.0, json_file: Optional[str] = None,
+              txt_dir: Optional[str] = None, max_workers: int = 16) -> None:
+        """Keeps the inventory and the JSON/TXT outputs current until interrupted (Ctrl+C)"""
+        print(f"\nWatching {self.project_path} for changes ({watcher.description}), press Ctrl+C to stop")
+        try:
+            while True:
+                paths = watcher.changes(debounce)
+                started = time.perf_counter()
+                updated, removed = self.apply_changes(paths)
+                if not updated and not removed:
+                    continue
+                if json_file:
+                    self.export_to_json(json_file)
+                if txt_dir:
+                    self.update_vst_lists(txt_dir, updated, removed, max_workers=max_workers)
+                index = self.inventory()
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] {len(updated)} updated, {len(removed)} removed "
+                      f"in {time.perf_counter() - started:.2f}s - {index.total_projects} projects, "
+                      f"{len(index.all_plugin_keys)} VSTs")
+        except KeyboardInterrupt:
+            print("\nWatch mode stopped")
+        finally:
+            watcher.close()
     
     def print_summary(self) -> None:
         """Druckt eine Zusammenfassung der Analyse"""
-        if not self.projects:
+        if not self.analyzed:
             print("No projects analyzed!")
             return
         
-        total_vsts = sum(len(project['vsts']) for project in self.projects)
+        index = self.inventory()
         
         print("\n=== SUMMARY ===")
-        print(f"Analyzed projects: {len(self.projects)}")
-        print(f"Total VSTs: {len(self.all_vsts)}")
+        print(f"Analyzed projects: {index.total_projects}")
+        if index.copies:
+            print(f"Identical copies: {index.copies} ({'not counted' if self.count_mode == 'unique' else 'counted'})")
+        print(f"Total VSTs: {len(index.all_plugin_keys)}")
 
         print("\n=== ALL USED VSTs ===")
-        for vst in sorted(self.all_vsts):
+        for vst in index.all_plugin_keys:
             print(f"- {vst}")
     
+    def json_summary(self) -> Dict:
+        """Totals and all_vsts as written by the JSON/NDJSON exports"""
+        index = self.inventory()
+        return {
+            'total_projects': index.total_projects,
+            'total_vsts': len(index.all_plugin_keys),
+            'all_vsts': list(index.all_plugin_keys)
+        }
+    
     def export_to_json(self, filename: str) -> None:
         """Exports analysis results as JSON"""
+        summary = self.json_summary()
         data = {
             'timestamp': datetime.now().isoformat(),
             'project_path': str(self.project_path),
-            'total_projects': len(self.projects),
-            'total_vsts': len(self.all_vsts),
-            'projects': self.projects,
-            'all_vsts': sorted(list(self.all_vsts))
+            **({'shard': self.shard_info()} if self.shard is not None else {}),
+            'total_projects': summary['total_projects'],
+            'total_vsts': summary['total_vsts'],
+            'projects': list(self.expanded_projects()),
+            'all_vsts': summary['all_vsts']
         }
         
         with open(filename, 'w', encoding='utf-8') as f:
@@ -364,123 +3218,185 @@ class AbletonProjectAnalyzer:
         
         print(f"Results saved to {filename}!")
     
-    def export_vst_lists_recursive(self, base_output_dir: str = "vst_lists") -> None:
-        """Exports VST lists recursively for all main directories"""
+    def missing_samples(self) -> Dict:
+        """Report of the sample references that could not be found (waits for pending checks)"""
+        report = (self.sample_report or SampleReport(max_workers=1)).report()
+        return {'project_path': str(self.project_path), **report}
+    
+    def export_missing_samples(self, filename: str) -> None:
+        """Exports the missing-samples report as JSON"""
+        data = {'timestamp': datetime.now().isoformat(), **self.missing_samples()}
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        
+        print(f"Samples: {data['total_references']} references in {data['total_projects']} projects, "
+              f"{data['missing_references']} missing in {data['projects_with_missing_samples']} projects "
+              f"({data['directories_listed']} directories listed)")
+        print(f"Missing-samples report saved to {filename}!")
+    
+    def export_vst_lists_recursive(self, base_output_dir: str = "vst_lists", max_workers: int = 16) -> None:
+        """Exports VST lists recursively for all main directories
+        
+        Files are rendered and written on a thread pool; files whose content
+        (apart from the 'Created:' timestamp) is unchanged are not rewritten.
+        """
         base_path = Path(base_output_dir)
         base_path.mkdir(exist_ok=True)
         
-        # Gruppiere Projekte nach Hauptverzeichnis (erste Ebene)
-        projects_by_main_dir = {}
-        for project in self.projects:
-            project_path = Path(project['path'])
-            # Finde das Hauptverzeichnis (erste Ebene unter dem Suchpfad)
-            try:
-                relative_path = project_path.relative_to(self.project_path)
-                # Nur die erste Ebene verwenden, nicht den kompletten Pfad
-                if len(relative_path.parts) > 0:
-                    main_dir = relative_path.parts[0]
-                else:
-                    main_dir = "Root"
-            except ValueError:
-                # Falls der Pfad nicht relativ ist, verwende den Ordnernamen
-                main_dir = project_path.parent.name if project_path.parent.name else "Root"
+        # Projekte sind im Index bereits nach Hauptverzeichnis (erste Ebene) gruppiert
+        index = self.inventory()
+        writer = ChangeAwareWriter()
+        
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            futures_by_main_dir = []
+            # Create a subdirectory for each main directory
+            for main_dir, projects, _, _, _ in index.main_dirs:
+                main_dir_path = base_path / main_dir
+                main_dir_path.mkdir(exist_ok=True)
+                
+                targets = self.vst_list_targets(main_dir_path, projects)
+                futures = [pool.submit(self.write_vst_list, writer, txt_filepath, project, main_dir)
+                           for txt_filepath, project in targets.items()]
+                futures_by_main_dir.append((main_dir, len(projects), futures))
             
-            if main_dir not in projects_by_main_dir:
-                projects_by_main_dir[main_dir] = []
-            projects_by_main_dir[main_dir].append(project)
+            for main_dir, project_count, futures in futures_by_main_dir:
+                results = [future.result() for future in futures]
+                print(f"\nMain directory: {main_dir} ({project_count} projects) - "
+                      f"{results.count('written')} VST lists written, {results.count('unchanged')} unchanged"
+                      + (f", {results.count('failed')} failed" if 'failed' in results else ""))
         
-        total_exported = 0
+        # Create summary
+        self.create_recursive_summary(base_path, index, writer)
         
-        # Create a subdirectory for each main directory
-        for main_dir, projects in projects_by_main_dir.items():
-            main_dir_path = base_path / main_dir
-            main_dir_path.mkdir(exist_ok=True)
-            
-            print(f"\nProcessing main directory: {main_dir} ({len(projects)} projects)")
-            
-            exported_count = 0
-            # Create all VST lists for this main directory in parallel
-            for project in projects:
-                # Erstelle Dateiname basierend auf Projektname (Windows-kompatibel)
-                # Entferne ungültige Zeichen für Windows: < > : " / \ | ? *
-                invalid_chars = '<>:"/\\|?*'
-                safe_name = "".join(c for c in project['name'] if (c.isalnum() or c in (' ', '-', '_')) and c not in invalid_chars).rstrip()
-                # Ersetze Leerzeichen durch Unterstriche für bessere Kompatibilität
-                safe_name = safe_name.replace(' ', '_')
-                txt_filename = f"{safe_name}_VSTs.txt"
-                txt_filepath = main_dir_path / txt_filename
-                
-                # Erstelle VST-Liste mit Track-Details
-                vst_list = []
-                vst_list.append(f"PROJECT PATH: {project['path']}")
-                vst_list.append("=" * 60)
-                vst_list.append(f"VST List for Project: {project['name']}")
-                vst_list.append(f"Main Directory: {main_dir}")
-                vst_list.append(f"Tracks: {len(project['tracks'])}")
-                vst_list.append(f"Scenes: {project['scenes']}")
-                vst_list.append(f"VST Count: {len(project['vsts'])}")
-                vst_list.append("=" * 60)
-                
-                # Track details with VSTs
-                if project['tracks']:
-                    vst_list.append("TRACK DETAILS:")
-                    vst_list.append("-" * 40)
-                    for i, track in enumerate(project['tracks'], 1):
-                        vst_list.append(f"{i}. [{track['type']}] {track['name']}")
-                        if track['vsts']:
-                            for j, vst in enumerate(track['vsts'], 1):
-                                vst_info = f"   {j}. {vst['manufacturer']} - {vst['name']}"
-                                if vst.get('filename'):
-                                    vst_info += f" ({vst['filename']})"
-                                if vst.get('version'):
-                                    vst_info += f" [Version: {vst['version']}]"
-                                vst_list.append(vst_info)
-                        else:
-                            vst_list.append("   (No VSTs on this track)")
-                        vst_list.append("")
-                else:
-                    vst_list.append("No tracks found.")
-                
-                vst_list.append("=" * 60)
-                vst_list.append("ALL VSTs (OVERVIEW):")
-                vst_list.append("-" * 40)
-                if project['vsts']:
-                    for i, vst in enumerate(project['vsts'], 1):
-                        vst_info = f"{i}. {vst['manufacturer']} - {vst['name']}"
+        # Create VST requirements list
+        self.create_vst_requirements_list(base_path, index, writer)
+        
+        print(f"\n[OK] Recursive inventory complete!")
+        print(f"Total {writer.counts['written']} files written, {writer.counts['unchanged']} unchanged"
+              + (f", {writer.counts['failed']} failed" if writer.counts['failed'] else "")
+              + f" in {len(index.main_dirs)} main directories")
+        print(f"Saved in: {base_path}")
+    
+    def update_vst_lists(self, base_output_dir: str, updated: List[Dict], removed: List[Dict],
+                         max_workers: int = 16) -> None:
+        """Rewrites only the VST lists of changed projects (watch mode) plus the two summary files"""
+        base_path = Path(base_output_dir)
+        base_path.mkdir(exist_ok=True)
+        index = self.inventory()
+        groups = {group.name: group for group in index.main_dirs}
+        
+        affected = {}
+        for project in updated + removed:
+            main_dir = self.main_dir_of(project)
+            affected.setdefault(main_dir, set()).add(f"{self.safe_file_name(project['name'])}_VSTs.txt")
+        
+        writer = ChangeAwareWriter()
+        deleted = 0
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            futures = []
+            for main_dir, file_names in affected.items():
+                main_dir_path = base_path / main_dir
+                group = groups.get(main_dir)
+                targets = self.vst_list_targets(main_dir_path, group.projects if group else ())
+                for file_name in file_names:
+                    txt_filepath = main_dir_path / file_name
+                    project = targets.get(txt_filepath)
+                    if project is not None:
+                        main_dir_path.mkdir(exist_ok=True)
+                        futures.append(pool.submit(self.write_vst_list, writer, txt_filepath, project, main_dir))
+                        continue
+                    # Kein Projekt mehr mit diesem Dateinamen
+                    try:
+                        txt_filepath.unlink()
+                        deleted += 1
+                    except OSError:
+                        pass
+                if group is None:
+                    with contextlib.suppress(OSError):
+                        main_dir_path.rmdir()
+            for future in futures:
+                future.result()
+        
+        self.create_recursive_summary(base_path, index, writer)
+        self.create_vst_requirements_list(base_path, index, writer)
+        print(f"VST lists: {writer.counts['written']} written, {writer.counts['unchanged']} unchanged, "
+              f"{deleted} deleted")
+    
+    def vst_list_targets(self, main_dir_path: Path, projects) -> Dict[Path, Dict]:
+        """TXT file of every project in a main directory"""
+        # Gleichnamige Projekte: wie beim sequentiellen Schreiben gewinnt das letzte
+        targets = {}
+        for project in projects:
+            targets[main_dir_path / f"{self.safe_file_name(project['name'])}_VSTs.txt"] = project
+        return targets
+    
+    @staticmethod
+    def safe_file_name(project_name: str) -> str:
+        """Windows-kompatibler Dateiname aus dem Projektnamen"""
+        # Entferne ungültige Zeichen für Windows: < > : " / \ | ? *
+        invalid_chars = '<>:"/\\|?*'
+        safe_name = "".join(c for c in project_name if (c.isalnum() or c in (' ', '-', '_')) and c not in invalid_chars).rstrip()
+        # Ersetze Leerzeichen durch Unterstriche für bessere Kompatibilität
+        return safe_name.replace(' ', '_')
+    
+    def write_vst_list(self, writer: 'ChangeAwareWriter', txt_filepath: Path, project: Dict, main_dir: str) -> str:
+        return writer.write(txt_filepath, self.render_vst_list(project, main_dir))
+    
+    def render_vst_list(self, project: Dict, main_dir: str) -> List[str]:
+        """Lines of the per-project VST list with track details"""
+        # Erstelle VST-Liste mit Track-Details
+        vst_list = []
+        vst_list.append(f"PROJECT PATH: {project['path']}")
+        if 'duplicate_of' in project:
+            vst_list.append(f"IDENTICAL COPY OF: {project['duplicate_of']}")
+        vst_list.append("=" * 60)
+        vst_list.append(f"VST List for Project: {project['name']}")
+        vst_list.append(f"Main Directory: {main_dir}")
+        vst_list.append(f"Tracks: {len(project['tracks'])}")
+        vst_list.append(f"Scenes: {project['scenes']}")
+        vst_list.append(f"VST Count: {len(project['vsts'])}")
+        vst_list.append("=" * 60)
+        
+        # Track details with VSTs
+        if project['tracks']:
+            vst_list.append("TRACK DETAILS:")
+            vst_list.append("-" * 40)
+            for i, track in enumerate(project['tracks'], 1):
+                vst_list.append(f"{i}. [{track['type']}] {track['name']}")
+                if track['vsts']:
+                    for j, vst in enumerate(self.plugins.resolve(track['vsts']), 1):
+                        vst_info = f"   {j}. {vst['manufacturer']} - {vst['name']}"
                         if vst.get('filename'):
                             vst_info += f" ({vst['filename']})"
                         if vst.get('version'):
                             vst_info += f" [Version: {vst['version']}]"
                         vst_list.append(vst_info)
                 else:
-                    vst_list.append("No VSTs found.")
-                
-                vst_list.append("=" * 60)
-                vst_list.append(f"Created: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                
-                # Schreibe Datei
-                try:
-                    with open(txt_filepath, 'w', encoding='utf-8') as f:
-                        f.write('\n'.join(vst_list))
-                    exported_count += 1
-                    print(f"  VST list created: {txt_filename}")
-                except Exception as e:
-                    print(f"  Error creating {txt_filename}: {e}")
-            
-            print(f"  {exported_count} VST lists created in: {main_dir}")
-            total_exported += exported_count
-        
-        # Create summary
-        self.create_recursive_summary(base_path, projects_by_main_dir)
+                    vst_list.append("   (No VSTs on this track)")
+                vst_list.append("")
+        else:
+            vst_list.append("No tracks found.")
         
-        # Create VST requirements list
-        self.create_vst_requirements_list(base_path, projects_by_main_dir)
+        vst_list.append("=" * 60)
+        vst_list.append("ALL VSTs (OVERVIEW):")
+        vst_list.append("-" * 40)
+        if project['vsts']:
+            for i, vst in enumerate(self.plugins.resolve(project['vsts']), 1):
+                vst_info = f"{i}. {vst['manufacturer']} - {vst['name']}"
+                if vst.get('filename'):
+                    vst_info += f" ({vst['filename']})"
+                if vst.get('version'):
+                    vst_info += f" [Version: {vst['version']}]"
+                vst_list.append(vst_info)
+        else:
+            vst_list.append("No VSTs found.")
         
-        print(f"\n[OK] Recursive inventory complete!")
-        print(f"Total {total_exported} VST lists created in {len(projects_by_main_dir)} main directories")
-        print(f"Saved in: {base_path}")
+        vst_list.append("=" * 60)
+        vst_list.append(f"Created: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        return vst_list
     
-    def create_recursive_summary(self, base_path: Path, projects_by_main_dir: dict) -> None:
+    def create_recursive_summary(self, base_path: Path, index: InventoryIndex,
+                                 writer: Optional['ChangeAwareWriter'] = None) -> None:
         """Creates a summary of the recursive inventory"""
         summary_file = base_path / "00_INVENTORY_SUMMARY.txt"
         
@@ -491,108 +3407,66 @@ class AbletonProjectAnalyzer:
         summary_lines.append(f"Analyzed main directory: {self.project_path}")
         summary_lines.append("=" * 60)
         
-        total_projects = 0
-        all_vsts_global = set()
-        
-        for main_dir, projects in projects_by_main_dir.items():
-            summary_lines.append(f"\n📁 {main_dir.upper()}")
+        for group in index.main_dirs:
+            summary_lines.append(f"\n📁 {group.name.upper()}")
             summary_lines.append("-" * 40)
-            summary_lines.append(f"Projects: {len(projects)}")
-            
-            # Collect all VSTs for this main directory
-            main_dir_vsts = set()
-            for project in projects:
-                total_projects += 1
-                for vst in project['vsts']:
-                    vst_key = f"{vst['manufacturer']} - {vst['name']}"
-                    main_dir_vsts.add(vst_key)
-                    all_vsts_global.add(vst_key)
+            summary_lines.append(f"Projects: {group.counted_projects}")
             
-            summary_lines.append(f"Different VSTs: {len(main_dir_vsts)}")
-            if main_dir_vsts:
+            # All VSTs of this main directory
+            summary_lines.append(f"Different VSTs: {len(group.plugin_keys)}")
+            if group.plugin_keys:
                 summary_lines.append("Used VSTs:")
-                for vst in sorted(main_dir_vsts):
+                for vst in group.plugin_keys:
                     summary_lines.append(f"  • {vst}")
         
         summary_lines.append("\n" + "=" * 60)
         summary_lines.append("OVERALL SUMMARY")
         summary_lines.append("=" * 60)
-        summary_lines.append(f"Total projects: {total_projects}")
-        summary_lines.append(f"Main directories: {len(projects_by_main_dir)}")
-        summary_lines.append(f"Different VSTs total: {len(all_vsts_global)}")
+        summary_lines.append(f"Total projects: {index.total_projects}")
+        summary_lines.append(f"Main directories: {len(index.main_dirs)}")
+        summary_lines.append(f"Different VSTs total: {len(index.all_plugin_keys)}")
         summary_lines.append("\nAll used VSTs:")
-        for vst in sorted(all_vsts_global):
+        for vst in index.all_plugin_keys:
             summary_lines.append(f"  • {vst}")
         
         summary_lines.append("\n" + "=" * 60)
         summary_lines.append("DIRECTORY STRUCTURE")
         summary_lines.append("=" * 60)
-        for main_dir, projects in projects_by_main_dir.items():
-            summary_lines.append(f"{main_dir}/")
-            summary_lines.append(f"  └── {len(projects)} project files")
+        for group in index.main_dirs:
+            summary_lines.append(f"{group.name}/")
+            summary_lines.append(f"  └── {group.project_files} project files")
         
-        # Write summary
-        try:
-            with open(summary_file, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(summary_lines))
-            print(f"\n[INFO] Summary created: {summary_file}")
-        except Exception as e:
-            print(f"Error creating summary: {e}")
+        # Write summary (skipped if only the timestamp would change)
+        status = (writer or ChangeAwareWriter()).write(summary_file, summary_lines)
+        if status != 'failed':
+            print(f"\n[INFO] Summary {'created' if status == 'written' else 'unchanged'}: {summary_file}")
     
-    def create_vst_requirements_list(self, base_path: Path, projects_by_main_dir: dict) -> None:
+    def create_vst_requirements_list(self, base_path: Path, index: InventoryIndex,
+                                     writer: Optional['ChangeAwareWriter'] = None) -> None:
         """Creates a VST requirements list"""
         requirements_file = base_path / "00_VST_REQUIREMENTS.txt"
         
-        # Collect all VSTs with details
-        all_vsts_detailed = {}
-        total_projects = 0
-        
-        for main_dir, projects in projects_by_main_dir.items():
-            total_projects += len(projects)
-            for project in projects:
-                for vst in project['vsts']:
-                    vst_key = f"{vst['manufacturer']} - {vst['name']}"
-                    
-                    if vst_key not in all_vsts_detailed:
-                        all_vsts_detailed[vst_key] = {
-                            'manufacturer': vst['manufacturer'],
-                            'name': vst['name'],
-                            'filename': vst.get('filename', ''),
-                            'version': vst.get('version', ''),
-                            'usage_count': 0,
-                            'projects': set(),
-                            'main_dirs': set()
-                        }
-                    
-                    all_vsts_detailed[vst_key]['usage_count'] += 1
-                    all_vsts_detailed[vst_key]['projects'].add(project['name'])
-                    all_vsts_detailed[vst_key]['main_dirs'].add(main_dir)
-        
-        # Sort VSTs by usage frequency
-        sorted_vsts = sorted(all_vsts_detailed.items(), 
-                           key=lambda x: x[1]['usage_count'], reverse=True)
-        
         requirements_lines = []
         requirements_lines.append("VST REQUIREMENTS")
         requirements_lines.append("=" * 60)
         requirements_lines.append(f"Created: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        requirements_lines.append(f"Analyzed projects: {total_projects}")
-        requirements_lines.append(f"Different VSTs found: {len(all_vsts_detailed)}")
+        requirements_lines.append(f"Analyzed projects: {index.total_projects}")
+        requirements_lines.append(f"Different VSTs found: {len(index.plugins)}")
         requirements_lines.append("=" * 60)
         requirements_lines.append("")
         requirements_lines.append("📋 VST LIST (sorted by frequency)")
         requirements_lines.append("-" * 60)
         
-        for i, (vst_key, details) in enumerate(sorted_vsts, 1):
-            requirements_lines.append(f"{i:2d}. {vst_key}")
-            requirements_lines.append(f"    Manufacturer: {details['manufacturer']}")
-            requirements_lines.append(f"    Plugin Name: {details['name']}")
-            if details['filename']:
-                requirements_lines.append(f"    Filename: {details['filename']}")
-            if details['version']:
-                requirements_lines.append(f"    Version: {details['version']}")
-            requirements_lines.append(f"    Used in: {details['usage_count']} projects")
-            requirements_lines.append(f"    Main directories: {', '.join(sorted(details['main_dirs']))}")
+        for i, usage in enumerate(index.plugins, 1):
+            requirements_lines.append(f"{i:2d}. {usage.key}")
+            requirements_lines.append(f"    Manufacturer: {usage.manufacturer}")
+            requirements_lines.append(f"    Plugin Name: {usage.name}")
+            if usage.filename:
+                requirements_lines.append(f"    Filename: {usage.filename}")
+            if usage.version:
+                requirements_lines.append(f"    Version: {usage.version}")
+            requirements_lines.append(f"    Used in: {usage.usage_count} projects")
+            requirements_lines.append(f"    Main directories: {', '.join(usage.main_dirs)}")
             requirements_lines.append("")
         
         requirements_lines.append("=" * 60)
@@ -600,28 +3474,14 @@ class AbletonProjectAnalyzer:
         requirements_lines.append("=" * 60)
         
         # Statistics by manufacturer
-        manufacturer_stats = {}
-        for vst_key, details in all_vsts_detailed.items():
-            manufacturer = details['manufacturer']
-            if manufacturer not in manufacturer_stats:
-                manufacturer_stats[manufacturer] = {'count': 0, 'usage': 0}
-            manufacturer_stats[manufacturer]['count'] += 1
-            manufacturer_stats[manufacturer]['usage'] += details['usage_count']
-        
         requirements_lines.append("By Manufacturer:")
-        for manufacturer, stats in sorted(manufacturer_stats.items(), 
-                                        key=lambda x: x[1]['usage'], reverse=True):
-            requirements_lines.append(f"  • {manufacturer}: {stats['count']} Plugins, {stats['usage']} usages")
+        for stats in index.manufacturers:
+            requirements_lines.append(f"  • {stats.manufacturer}: {stats.plugin_count} Plugins, {stats.usage_count} usages")
         
         requirements_lines.append("")
         requirements_lines.append("By Main Directory:")
-        for main_dir, projects in projects_by_main_dir.items():
-            main_dir_vsts = set()
-            for project in projects:
-                for vst in project['vsts']:
-                    vst_key = f"{vst['manufacturer']} - {vst['name']}"
-                    main_dir_vsts.add(vst_key)
-            requirements_lines.append(f"  • {main_dir}: {len(main_dir_vsts)} different VSTs")
+        for group in index.main_dirs:
+            requirements_lines.append(f"  • {group.name}: {len(group.plugin_keys)} different VSTs")
         
         requirements_lines.append("")
         requirements_lines.append("=" * 60)
@@ -638,16 +3498,31 @@ class AbletonProjectAnalyzer:
         requirements_lines.append("• iZotope: https://www.izotope.com")
         requirements_lines.append("• Youlean: https://youlean.co")
         
-        # Write VST requirements list
+        # Write VST requirements list (skipped if only the timestamp would change)
+        status = (writer or ChangeAwareWriter()).write(requirements_file, requirements_lines)
+        if status != 'failed':
+            print(f"\n[INFO] VST requirements list {'created' if status == 'written' else 'unchanged'}: "
+                  f"{requirements_file}")
+    
+    def export_columnar(self, output_dir: str, format: str = 'parquet') -> None:
+        """Exports normalized inventory and statistics tables as Parquet or Arrow IPC files"""
         try:
-            with open(requirements_file, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(requirements_lines))
-            print(f"\n[INFO] VST requirements list created: {requirements_file}")
+            tables = ColumnarInventory.from_analyzer(self).write(Path(output_dir).resolve(), format)
+            print(f"\n[INFO] Columnar inventory created: {len(tables)} {format} tables in {Path(output_dir).resolve()}")
+        except ImportError as e:
+            print(f"Columnar export needs pyarrow (pip install pyarrow): {e}")
         except Exception as e:
-            print(f"Error creating VST requirements list: {e}")
+            print(f"Error creating columnar export: {e}")
     
-    def export_to_excel(self, filename: str = "ableton_vst_analysis.xlsx") -> None:
-        """Exports analysis results as a comprehensive Excel spreadsheet"""
+    def export_to_excel(self, filename: str = "ableton_vst_analysis.xlsx",
+                        project_sheets: Optional[Tuple['StreamingSheet', ...]] = None) -> None:
+        """Exports analysis results as a comprehensive Excel spreadsheet
+        
+        Uses openpyxl's write-only mode: rows are streamed into the file and
+        column widths are tracked while the rows are generated. project_sheets
+        are the Project Overview, VST Overview and Track Details sheets a
+        bounded-memory run already filled during the analysis.
+        """
         try:
             # Convert to absolute path to ensure correct save location
             excel_path = Path(filename).resolve()
@@ -655,19 +3530,20 @@ class AbletonProjectAnalyzer:
             # Create parent directory if it doesn't exist
             excel_path.parent.mkdir(parents=True, exist_ok=True)
             
-            wb = Workbook()
-            
-            # Entferne Standard-Sheet
-            wb.remove(wb.active)
-            
-            # 1. Project Overview
-            self.create_project_overview_sheet(wb)
-            
-            # 2. VST Overview
-            self.create_vst_overview_sheet(wb)
+            wb = openpyxl.Workbook(write_only=True)
             
-            # 3. Track Details
-            self.create_track_details_sheet(wb)
+            if project_sheets is not None:
+                for sheet in project_sheets:
+                    sheet.write_to(wb)
+            else:
+                # 1. Project Overview
+                self.create_project_overview_sheet(wb)
+                
+                # 2. VST Overview
+                self.create_vst_overview_sheet(wb)
+                
+                # 3. Track Details
+                self.create_track_details_sheet(wb)
             
             # 4. VST Requirements
             self.create_vst_requirements_sheet(wb)
@@ -675,6 +3551,10 @@ class AbletonProjectAnalyzer:
             # 5. Statistics
             self.create_statistics_sheet(wb)
             
+            # 6. Missing Samples (nur mit --samples)
+            if self.samples:
+                self.create_missing_samples_sheet(wb)
+            
             # Save Excel file
             wb.save(str(excel_path))
             print(f"\n[INFO] Excel analysis created: {excel_path}")
@@ -682,286 +3562,833 @@ class AbletonProjectAnalyzer:
         except Exception as e:
             print(f"Error creating Excel file: {e}")
     
-    def create_project_overview_sheet(self, wb: Workbook) -> None:
+    def create_project_overview_sheet(self, wb: 'openpyxl.Workbook') -> None:
         """Creates Project Overview Sheet"""
-        ws = wb.create_sheet("Project Overview")
-        
-        # Header
-        headers = ["Project", "Path", "Tracks", "Scenes", "VSTs", "Main Directory"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
+        sheet = self.project_overview_sheet()
         
         # Daten
-        for row, project in enumerate(self.projects, 2):
-            ws.cell(row=row, column=1, value=project['name'])
-            ws.cell(row=row, column=2, value=project['path'])
-            ws.cell(row=row, column=3, value=len(project['tracks']))
-            ws.cell(row=row, column=4, value=project['scenes'])
-            ws.cell(row=row, column=5, value=len(project['vsts']))
-            
-            # Hauptverzeichnis extrahieren
-            try:
-                project_path = Path(project['path'])
-                relative_path = project_path.relative_to(self.project_path)
-                main_dir = relative_path.parts[0] if relative_path.parts else "Root"
-            except ValueError:
-                main_dir = project_path.parent.name if project_path.parent.name else "Root"
-            
-            ws.cell(row=row, column=6, value=main_dir)
+        for project, main_dir in self.inventory().entries:
+            self.append_project_overview_row(sheet, project, main_dir)
         
-        # Auto-fit Spalten
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-    
-    def create_vst_overview_sheet(self, wb: Workbook) -> None:
+        sheet.write_to(wb)
+    
+    def create_vst_overview_sheet(self, wb: 'openpyxl.Workbook') -> None:
         """Creates VST Overview Sheet"""
-        ws = wb.create_sheet("VST Overview")
+        sheet = self.vst_overview_sheet()
         
-        # Collect all VSTs with details
-        vst_data = []
-        for project in self.projects:
-            for vst in project['vsts']:
-                vst_data.append({
-                    'Project': project['name'],
-                    'Manufacturer': vst['manufacturer'],
-                    'VST Name': vst['name'],
-                    'Filename': vst.get('filename', ''),
-                    'Version': vst.get('version', '')
-                })
+        # Data (in Pfad-Reihenfolge wie die Project Overview)
+        for project, _ in self.inventory().entries:
+            self.append_vst_overview_rows(sheet, project)
         
-        # Header
-        headers = ["Project", "Manufacturer", "VST Name", "Filename", "Version"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="70AD47", end_color="70AD47", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-        
-        # Data
-        for row, vst in enumerate(vst_data, 2):
-            ws.cell(row=row, column=1, value=vst['Project'])
-            ws.cell(row=row, column=2, value=vst['Manufacturer'])
-            ws.cell(row=row, column=3, value=vst['VST Name'])
-            ws.cell(row=row, column=4, value=vst['Filename'])
-            ws.cell(row=row, column=5, value=vst['Version'])
-        
-        # Auto-fit Spalten
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-    
-    def create_track_details_sheet(self, wb: Workbook) -> None:
+        sheet.write_to(wb)
+    
+    def create_track_details_sheet(self, wb: 'openpyxl.Workbook') -> None:
         """Creates Track Details Sheet"""
-        ws = wb.create_sheet("Track Details")
+        sheet = self.track_details_sheet()
         
-        # Collect all track data
-        track_data = []
-        for project in self.projects:
-            for track in project['tracks']:
-                track_data.append({
-                    'Project': project['name'],
-                    'Track Name': track['name'],
-                    'Track Type': track['type'],
-                    'VST Count': len(track['vsts']),
-                    'VSTs': ', '.join([f"{vst['manufacturer']} - {vst['name']}" for vst in track['vsts']])
-                })
+        # Data (in Pfad-Reihenfolge wie die Project Overview)
+        for project, _ in self.inventory().entries:
+            self.append_track_detail_rows(sheet, project)
         
-        # Header
-        headers = ["Project", "Track Name", "Track Type", "VST Count", "VSTs"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="C55A11", end_color="C55A11", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-        
-        # Data
-        for row, track in enumerate(track_data, 2):
-            ws.cell(row=row, column=1, value=track['Project'])
-            ws.cell(row=row, column=2, value=track['Track Name'])
-            ws.cell(row=row, column=3, value=track['Track Type'])
-            ws.cell(row=row, column=4, value=track['VST Count'])
-            ws.cell(row=row, column=5, value=track['VSTs'])
-        
-        # Auto-fit Spalten
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-    
-    def create_vst_requirements_sheet(self, wb: Workbook) -> None:
+        sheet.write_to(wb)
+    
+    def create_missing_samples_sheet(self, wb: 'openpyxl.Workbook') -> None:
+        """Creates Missing Samples Sheet"""
+        sheet = StreamingSheet("Missing Samples")
+        sheet.append(["Project", "Project Path", "Sample", "Expected Location", "Stored Path"], style="header:8E44AD")
+        
+        for project in self.missing_samples()['projects']:
+            for sample in project['missing']:
+                sheet.append([project['name'], project['path'], sample['name'], sample['location'], sample['path']])
+        
+        sheet.write_to(wb)
+    
+    @staticmethod
+    def project_overview_sheet(sort_by_key: bool = False) -> 'StreamingSheet':
+        sheet = StreamingSheet("Project Overview", sort_by_key)
+        sheet.append(["Project", "Path", "Tracks", "Scenes", "VSTs", "Main Directory"], style="header:366092")
+        return sheet
+    
+    @staticmethod
+    def vst_overview_sheet(sort_by_key: bool = False) -> 'StreamingSheet':
+        sheet = StreamingSheet("VST Overview", sort_by_key)
+        sheet.append(["Project", "Manufacturer", "VST Name", "Filename", "Version"], style="header:70AD47")
+        return sheet
+    
+    @staticmethod
+    def track_details_sheet(sort_by_key: bool = False) -> 'StreamingSheet':
+        sheet = StreamingSheet("Track Details", sort_by_key)
+        sheet.append(["Project", "Track Name", "Track Type", "VST Count", "VSTs"], style="header:C55A11")
+        return sheet
+    
+    @staticmethod
+    def append_project_overview_row(sheet: 'StreamingSheet', project: Dict, main_dir: str) -> None:
+        sheet.append([project['name'], project['path'], len(project['tracks']), project['scenes'],
+                      len(project['vsts']), main_dir], key=project['path'])
+    
+    def append_vst_overview_rows(self, sheet: 'StreamingSheet', project: Dict) -> None:
+        for vst in self.plugins.resolve(project['vsts']):
+            sheet.append([project['name'], vst['manufacturer'], vst['name'],
+                          vst.get('filename', ''), vst.get('version', '')], key=project['path'])
+    
+    def append_track_detail_rows(self, sheet: 'StreamingSheet', project: Dict) -> None:
+        for track in project['tracks']:
+            sheet.append([
+                project['name'],
+                track['name'],
+                track['type'],
+                len(track['vsts']),
+                ', '.join([vst.key for vst in self.plugins.resolve(track['vsts'])])
+            ], key=project['path'])
+    
+    def create_vst_requirements_sheet(self, wb: 'openpyxl.Workbook') -> None:
         """Creates VST Requirements Sheet"""
-        ws = wb.create_sheet("VST Requirements")
+        sheet = StreamingSheet("VST Requirements")
+        sheet.append(["Rank", "Manufacturer", "VST Name", "Filename", "Version", "Usage Count", "Projects"],
+                     style="header:E74C3C")
         
-        # Collect VST statistics
-        vst_stats = {}
-        for project in self.projects:
-            for vst in project['vsts']:
-                vst_key = f"{vst['manufacturer']} - {vst['name']}"
-                if vst_key not in vst_stats:
-                    vst_stats[vst_key] = {
-                        'Manufacturer': vst['manufacturer'],
-                        'VST Name': vst['name'],
-                        'Filename': vst.get('filename', ''),
-                        'Version': vst.get('version', ''),
-                        'Usage Count': 0,
-                        'Projects': set()
-                    }
-                vst_stats[vst_key]['Usage Count'] += 1
-                vst_stats[vst_key]['Projects'].add(project['name'])
-        
-        # Sort by frequency
-        sorted_vsts = sorted(vst_stats.items(), key=lambda x: x[1]['Usage Count'], reverse=True)
+        # Data (sorted by frequency)
+        for rank, usage in enumerate(self.inventory().plugins, 1):
+            sheet.append([rank, usage.manufacturer, usage.name, usage.filename, usage.version,
+                          usage.usage_count, ', '.join(usage.projects)])
         
-        # Header
-        headers = ["Rank", "Manufacturer", "VST Name", "Filename", "Version", "Usage Count", "Projects"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="E74C3C", end_color="E74C3C", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-        
-        # Data
-        for rank, (vst_key, data) in enumerate(sorted_vsts, 1):
-            row = rank + 1
-            ws.cell(row=row, column=1, value=rank)
-            ws.cell(row=row, column=2, value=data['Manufacturer'])
-            ws.cell(row=row, column=3, value=data['VST Name'])
-            ws.cell(row=row, column=4, value=data['Filename'])
-            ws.cell(row=row, column=5, value=data['Version'])
-            ws.cell(row=row, column=6, value=data['Usage Count'])
-            ws.cell(row=row, column=7, value=', '.join(sorted(data['Projects'])))
-        
-        # Auto-fit Spalten
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-    
-    def create_statistics_sheet(self, wb: Workbook) -> None:
+        sheet.write_to(wb)
+    
+    def create_statistics_sheet(self, wb: 'openpyxl.Workbook') -> None:
         """Creates Statistics Sheet"""
-        ws = wb.create_sheet("Statistics")
+        sheet = StreamingSheet("Statistics")
         
-        # Calculate statistics
-        total_projects = len(self.projects)
-        total_vsts = len(self.all_vsts)
-        total_tracks = sum(len(project['tracks']) for project in self.projects)
-        
-        # Manufacturer statistics
-        manufacturer_stats = {}
-        for project in self.projects:
-            for vst in project['vsts']:
-                manufacturer = vst['manufacturer']
-                if manufacturer not in manufacturer_stats:
-                    manufacturer_stats[manufacturer] = 0
-                manufacturer_stats[manufacturer] += 1
+        index = self.inventory()
+        total_projects = index.total_projects
+        total_tracks = index.total_tracks
         
         # Header
-        ws.cell(row=1, column=1, value="ABLETON STUDIO - VST ANALYSIS STATISTICS")
-        ws.cell(row=1, column=1).font = Font(bold=True, size=16, color="FFFFFF")
-        ws.cell(row=1, column=1).fill = PatternFill(start_color="2C3E50", end_color="2C3E50", fill_type="solid")
+        sheet.append(["ABLETON STUDIO - VST ANALYSIS STATISTICS"], style="title:2C3E50")
+        sheet.append([])
         
         # General statistics
         stats_data = [
             ("Total Projects", total_projects),
-            ("Different VSTs", total_vsts),
+            ("Different VSTs", len(index.all_plugin_keys)),
             ("Total Tracks", total_tracks),
-            ("Average VSTs per Project", round(sum(len(p['vsts']) for p in self.projects) / total_projects, 2) if total_projects > 0 else 0),
+            ("Average VSTs per Project", round(index.total_plugin_uses / total_projects, 2) if total_projects > 0 else 0),
             ("Average Tracks per Project", round(total_tracks / total_projects, 2) if total_projects > 0 else 0)
         ]
         
-        for row, (label, value) in enumerate(stats_data, 3):
-            ws.cell(row=row, column=1, value=label)
-            ws.cell(row=row, column=2, value=value)
-            ws.cell(row=row, column=1).font = Font(bold=True)
+        for label, value in stats_data:
+            sheet.append([label, value], style="label")
+        sheet.append([])
         
         # Manufacturer statistics
-        ws.cell(row=9, column=1, value="VST MANUFACTURER STATISTICS")
-        ws.cell(row=9, column=1).font = Font(bold=True, size=14)
-        
-        ws.cell(row=10, column=1, value="Manufacturer")
-        ws.cell(row=10, column=2, value="VST Count")
-        ws.cell(row=10, column=1).font = Font(bold=True)
-        ws.cell(row=10, column=2).font = Font(bold=True)
-        
-        for row, (manufacturer, count) in enumerate(sorted(manufacturer_stats.items(), key=lambda x: x[1], reverse=True), 11):
-            ws.cell(row=row, column=1, value=manufacturer)
-            ws.cell(row=row, column=2, value=count)
-        
-        # Auto-fit Spalten
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
+        sheet.append(["VST MANUFACTURER STATISTICS"], style="section")
+        sheet.append(["Manufacturer", "VST Count"], style="bold")
+        
+        for stats in index.manufacturers:
+            sheet.append([stats.manufacturer, stats.usage_count])
+        
+        sheet.write_to(wb)
+
+
+class StreamingSheet:
+    """Worksheet rows for openpyxl's write-only mode with column widths tracked on the fly.
+    
+    Write-only sheets need their column widths before the first row, so rows
+    are spooled to a temporary file in blocks while the maximum cell length
+    per column is recorded; write_to() then sets the widths and streams the
+    rows into the workbook. Memory stays constant regardless of row count.
+    
+    With sort_by_key, rows that arrive in any order (bounded-memory runs) are
+    written ordered by their key, rows with equal keys in append order: the
+    spool holds sorted runs that rows() merges, reading a few rows per run
+    at a time.
+    """
+    
+    BLOCK_SIZE = 1000
+    SORT_RUN_SIZE = 50000
+    SORT_READ_SIZE = 256
+    
+    def __init__(self, title: str, sort_by_key: bool = False):
+        self.title = title
+        self.spool = tempfile.TemporaryFile()
+        self.block = []
+        self.max_lengths = []
+        self.shortest_row = None
+        self.sort_by_key = sort_by_key
+        # Sortierte Läufe im Spool: (Startposition, Anzahl Lese-Blöcke)
+        self.runs = []
+        self.sequence = itertools.count()
+    
+    def append(self, values: List, style: Optional[str] = None, key: str = '') -> None:
+        for index, value in enumerate(values):
+            length = len(str(value))
+            if index == len(self.max_lengths):
+                self.max_lengths.append(length)
+            elif length > self.max_lengths[index]:
+                self.max_lengths[index] = length
+        if self.shortest_row is None or len(values) < self.shortest_row:
+            self.shortest_row = len(values)
+        
+        if self.sort_by_key:
+            # Laufende Nummer hält gleiche Schlüssel in Anfügereihenfolge (und vergleicht nie die Werte)
+            self.block.append((key, next(self.sequence), values, style))
+            if len(self.block) >= self.SORT_RUN_SIZE:
+                self.spool_run()
+            return
+        self.block.append((values, style))
+        if len(self.block) >= self.BLOCK_SIZE:
+            pickle.dump(self.block, self.spool, protocol=pickle.HIGHEST_PROTOCOL)
+            self.block = []
+    
+    def column_widths(self) -> List[int]:
+        widths = []
+        for index, max_length in enumerate(self.max_lengths):
+            # Fehlende Zellen zählen wie leere Zellen als str(None)
+            if self.shortest_row is not None and index >= self.shortest_row:
+                max_length = max(max_length, len(str(None)))
+            widths.append(min(max_length + 2, 50))
+        return widths
+    
+    def spool_run(self) -> None:
+        """Writes the current block as one sorted run"""
+        self.block.sort()
+        self.spool.seek(0, os.SEEK_END)
+        start = self.spool.tell()
+        for offset in range(0, len(self.block), self.SORT_READ_SIZE):
+            pickle.dump(self.block[offset:offset + self.SORT_READ_SIZE], self.spool,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        self.runs.append((start, -(-len(self.block) // self.SORT_READ_SIZE)))
+        self.block = []
+    
+    def read_run(self, start: int, blocks: int):
+        position = start
+        for _ in range(blocks):
+            self.spool.seek(position)
+            rows = pickle.load(self.spool)
+            position = self.spool.tell()
+            yield from rows
+    
+    def rows(self):
+        if self.sort_by_key:
+            if self.block:
+                self.spool_run()
+            for _, _, values, style in heapq.merge(*(self.read_run(start, blocks) for start, blocks in self.runs)):
+                yield values, style
+            return
+        if self.block:
+            pickle.dump(self.block, self.spool, protocol=pickle.HIGHEST_PROTOCOL)
+            self.block = []
+        self.spool.seek(0)
+        while True:
+            try:
+                block = pickle.load(self.spool)
+            except EOFError:
+                break
+            yield from block
+    
+    def write_to(self, wb: 'openpyxl.Workbook') -> None:
+        ws = wb.create_sheet(self.title)
+        for index, width in enumerate(self.column_widths(), 1):
+            ws.column_dimensions[openpyxl_utils.get_column_letter(index)].width = width
+        
+        for values, style in self.rows():
+            ws.append(self.styled_cells(ws, values, style) if style else values)
+        self.spool.close()
+    
+    @staticmethod
+    def styled_cells(ws, values: List, style: str) -> List:
+        kind, _, color = style.partition(':')
+        cells = []
+        for index, value in enumerate(values):
+            cell = openpyxl_cell.WriteOnlyCell(ws, value=value)
+            if kind == 'header':
+                cell.font = openpyxl_styles.Font(bold=True, color="FFFFFF")
+                cell.fill = openpyxl_styles.PatternFill(start_color=color, end_color=color, fill_type="solid")
+                cell.alignment = openpyxl_styles.Alignment(horizontal="center")
+            elif kind == 'title' and index == 0:
+                cell.font = openpyxl_styles.Font(bold=True, size=16, color="FFFFFF")
+                cell.fill = openpyxl_styles.PatternFill(start_color=color, end_color=color, fill_type="solid")
+            elif kind == 'section' and index == 0:
+                cell.font = openpyxl_styles.Font(bold=True, size=14)
+            elif kind == 'bold' or (kind == 'label' and index == 0):
+                cell.font = openpyxl_styles.Font(bold=True)
+            cells.append(cell)
+        return cells
+
+
+# Dateiendungen der spaltenorientierten Exportformate
+COLUMNAR_FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+
+class ColumnarInventory:
+    """Normalized pandas tables of an analysis run plus vectorized statistics.
+    
+    projects, tracks and plugins are built straight from the compact project
+    data; plugin_occurrences (project-level) and track_plugins hold one row per
+    plugin ID, concatenated from the per-project ID arrays. The requirement and
+    statistics tables are group-bys over them.
+    """
+    
+    def __init__(self, projects: 'pd.DataFrame', tracks: 'pd.DataFrame', plugins: 'pd.DataFrame',
+                 plugin_occurrences: 'pd.DataFrame', track_plugins: 'pd.DataFrame'):
+        self.projects = projects
+        self.tracks = tracks
+        self.plugins = plugins
+        self.plugin_occurrences = plugin_occurrences
+        self.track_plugins = track_plugins
+        self.usage = None
+    
+    @classmethod
+    def from_analyzer(cls, analyzer: 'AbletonProjectAnalyzer') -> 'ColumnarInventory':
+        # Pfad-Reihenfolge wie in allen anderen Ausgaben
+        project_list = sorted(analyzer.projects, key=lambda project: project['path'])
+        
+        projects = pd.DataFrame({
+            'project_id': np.arange(len(project_list), dtype=np.int64),
+            'name': [project['name'] for project in project_list],
+            'path': [project['path'] for project in project_list],
+            'main_dir': [analyzer.main_dir_of(project) for project in project_list],
+            'scenes': np.array([project['scenes'] for project in project_list], dtype=np.int64),
+            'tracks': np.array([len(project['tracks']) for project in project_list], dtype=np.int64),
+            'vsts': np.array([len(project['vsts']) for project in project_list], dtype=np.int64),
+            'counted': np.array([analyzer.is_counted(project) for project in project_list], dtype=bool),
+            'duplicate_of': [project.get('duplicate_of') for project in project_list]
+        })
+        
+        track_counts = projects['tracks'].to_numpy()
+        track_project_ids = np.repeat(projects['project_id'].to_numpy(), track_counts)
+        track_rows = [track for project in project_list for track in project['tracks']]
+        # Laufende Nummer innerhalb des Projekts: Position minus Startposition des Projekts
+        track_starts = np.repeat(np.cumsum(track_counts) - track_counts, track_counts)
+        tracks = pd.DataFrame({
+            'project_id': track_project_ids,
+            'track_index': np.arange(len(track_rows), dtype=np.int64) - track_starts,
+            'name': [track['name'] for track in track_rows],
+            'type': [track['type'] for track in track_rows],
+            'vsts': np.array([len(track['vsts']) for track in track_rows], dtype=np.int64)
+        })
+        
+        records = analyzer.plugins.records
+        plugins = pd.DataFrame({
+            'plugin_id': np.array([vst.id for vst in records], dtype=np.uint32),
+            'key': [vst.key for vst in records],
+            'manufacturer': [vst.manufacturer for vst in records],
+            'name': [vst.name for vst in records],
+            'filename': [vst.filename or '' for vst in records],
+            'version': [vst.version or '' for vst in records]
+        })
+        
+        # Plugin-ID-Arrays werden direkt aneinandergehängt (keine Dicts pro Vorkommen)
+        plugin_occurrences = pd.DataFrame({
+            'project_id': np.repeat(projects['project_id'].to_numpy(), projects['vsts'].to_numpy()),
+            'plugin_id': cls.concat_ids([project['vsts'] for project in project_list])
+        })
+        track_plugins = pd.DataFrame({
+            'project_id': np.repeat(track_project_ids, tracks['vsts'].to_numpy()),
+            'track_index': np.repeat(tracks['track_index'].to_numpy(), tracks['vsts'].to_numpy()),
+            'plugin_id': cls.concat_ids([track['vsts'] for track in track_rows])
+        })
+        return cls(projects, tracks, plugins, plugin_occurrences, track_plugins)
+    
+    @staticmethod
+    def concat_ids(id_arrays: List[array]) -> 'np.ndarray':
+        """Joins array('I') plugin ID arrays as zero-copy views (no Python step per ID)"""
+        if not id_arrays:
+            return np.empty(0, dtype=np.uint32)
+        return np.concatenate([np.frombuffer(ids, dtype=np.uint32) for ids in id_arrays])
+    
+    def key_codes(self) -> Tuple['np.ndarray', 'pd.Index']:
+        """Integer code of the plugin key (manufacturer - name) for every plugin ID"""
+        codes, keys = pd.factorize(self.plugins['key'])
+        key_codes = np.zeros(int(self.plugins['plugin_id'].max()) + 1 if len(self.plugins) else 0, dtype=np.int64)
+        key_codes[self.plugins['plugin_id'].to_numpy()] = codes
+        return key_codes, keys
+    
+    def plugin_usage(self) -> 'pd.DataFrame':
+        """Usage per plugin key over the counted projects, in first-seen order
+        
+        Grouping runs on integer codes (plugin key, project name, main dir);
+        strings are only touched for the final, per-key columns.
+        """
+        if self.usage is not None:
+            return self.usage
+        key_codes, keys = self.key_codes()
+        counted = self.projects['counted'].to_numpy()
+        project_ids = self.plugin_occurrences['project_id'].to_numpy()
+        mask = counted[project_ids]
+        project_ids = project_ids[mask]
+        plugin_ids = self.plugin_occurrences['plugin_id'].to_numpy()[mask]
+        occurrence_keys = key_codes[plugin_ids]
+        
+        usage_count = np.bincount(occurrence_keys, minlength=len(keys))
+        # Erste Position je Schlüssel ohne Sortieren aller Vorkommen
+        first_seen = np.full(len(keys), len(occurrence_keys), dtype=np.int64)
+        np.minimum.at(first_seen, occurrence_keys, np.arange(len(occurrence_keys), dtype=np.int64))
+        used_keys = np.flatnonzero(first_seen < len(occurrence_keys))
+        first_index = first_seen[used_keys]
+        # Erstes Vorkommen bestimmt Dateiname/Version und die Reihenfolge bei Gleichstand
+        order = used_keys[np.argsort(first_index, kind='stable')]
+        first_plugin = np.empty(len(keys), dtype=np.int64)
+        first_plugin[used_keys] = plugin_ids[first_index]
+        
+        plugins = self.plugins.set_index('plugin_id').loc[first_plugin[order]]
+        usage = pd.DataFrame({
+            'key': keys[order],
+            'manufacturer': plugins['manufacturer'].to_numpy(),
+            'name': plugins['name'].to_numpy(),
+            'filename': plugins['filename'].to_numpy(),
+            'version': plugins['version'].to_numpy(),
+            'usage_count': usage_count[order],
+            'projects': self.joined_values(occurrence_keys, self.projects['name'], project_ids, order),
+            'main_dirs': self.joined_values(occurrence_keys, self.projects['main_dir'], project_ids, order)
+        })
+        self.usage = usage
+        return usage
+    
+    def vst_requirements(self) -> 'pd.DataFrame':
+        """VST Requirements: plugin usage sorted by frequency (ties keep first-seen order)"""
+        requirements = self.plugin_usage().sort_values('usage_count', ascending=False, kind='stable')
+        requirements = requirements.reset_index(drop=True)
+        requirements.insert(0, 'rank', np.arange(1, len(requirements) + 1, dtype=np.int64))
+        return requirements
+    
+    @staticmethod
+    def joined_values(group_codes: 'np.ndarray', project_column: 'pd.Series', project_ids: 'np.ndarray',
+                      order: 'np.ndarray') -> List[str]:
+        """Sorted distinct project values per group, joined with ', ' (groups in the given order)"""
+        # Sortierte Codes pro Projekt, damit Paare (Gruppe, Wert) als Ganzzahlen sortiert werden können
+        value_codes, uniques = pd.factorize(project_column, sort=True)
+        width = max(len(uniques), 1)
+        # Sortieren und Nachbarn vergleichen ist deutlich schneller als np.unique (Hash-Tabelle)
+        pairs = np.sort(group_codes * width + value_codes[project_ids])
+        pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))] if len(pairs) else pairs
+        pair_groups = pairs // width
+        uniques = np.asarray(uniques, dtype=object)[pairs % width]
+        bounds = np.searchsorted(pair_groups, order)
+        ends = np.searchsorted(pair_groups, order, side='right')
+        return [', '.join(uniques[start:end]) for start, end in zip(bounds, ends)]
+    
+    def manufacturer_statistics(self) -> 'pd.DataFrame':
+        """Per manufacturer: distinct plugins and total usages over counted projects"""
+        usage = self.plugin_usage()
+        statistics = usage.groupby('manufacturer', sort=False).agg(plugin_count=('key', 'size'),
+                                                                   usage_count=('usage_count', 'sum'))
+        return statistics.sort_values('usage_count', ascending=False, kind='stable').reset_index()
+    
+    def statistics(self) -> 'pd.DataFrame':
+        """General statistics as a single row (same figures as the Statistics sheet)"""
+        counted = self.projects[self.projects['counted']]
+        total_projects = len(counted)
+        key_codes, _ = self.key_codes()
+        different_vsts = int(np.count_nonzero(np.bincount(key_codes[self.plugin_occurrences['plugin_id'].to_numpy()])))
+        total_tracks = int(counted['tracks'].sum())
+        return pd.DataFrame({
+            'total_projects': [total_projects],
+            'different_vsts': [different_vsts],
+            'total_tracks': [total_tracks],
+            'average_vsts_per_project': [round(int(counted['vsts'].sum()) / total_projects, 2) if total_projects else 0.0],
+            'average_tracks_per_project': [round(total_tracks / total_projects, 2) if total_projects else 0.0]
+        })
+    
+    def tables(self) -> Dict[str, 'pd.DataFrame']:
+        return {
+            'projects': self.projects,
+            'tracks': self.tracks,
+            'plugins': self.plugins,
+            'plugin_occurrences': self.plugin_occurrences,
+            'track_plugins': self.track_plugins,
+            'vst_requirements': self.vst_requirements(),
+            'manufacturer_statistics': self.manufacturer_statistics(),
+            'statistics': self.statistics()
+        }
+    
+    def write(self, output_dir: Path, format: str = 'parquet') -> List[Path]:
+        """Writes every table as <name>.parquet or <name>.arrow (Arrow IPC); both need pyarrow"""
+        output_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+        for name, table in self.tables().items():
+            table_file = output_dir / f"{name}{COLUMNAR_FORMATS[format]}"
+            if format == 'parquet':
+                table.to_parquet(table_file, index=False)
+            else:
+                table.to_feather(table_file)
+            written.append(table_file)
+        return written
+
+
+def extract_batch_worker(project_path: str, options: Dict, project_batch: List[Path],
+                         sources: Optional[List[Optional[bytes]]] = None, hash_content: bool = False
+                         ) -> Tuple[List[Dict], Optional[Dict[str, str]], Optional[Profiler]]:
+    """Process-pool entry point: returns the picklable project dicts of a batch,
+    the content hashes of the parsed bytes (with hash_content) and the worker's
+    profiler when profiling
+    
+    Plugin dicts are shared between a project's 'vsts' list and its tracks, so
+    pickle sends each of them only once. sources carries prefetched file
+    content when the read-ahead stage is active.
+    """
+    analyzer = AbletonProjectAnalyzer(project_path, **options)
+    hashes = {} if hash_content else None
+    batch_results = analyzer.extract_batch(project_batch, sources, hashes)
+    return batch_results, hashes, (analyzer.profiler if analyzer.profiler.enabled else None)
+
+
+class Exporter(NamedTuple):
+    """An output selected by the command line option args.<option>.
+    
+    export(analyzer, args) runs after the analysis; sink(analyzer, args)
+    returns a stream writer that receives the projects during the analysis
+    instead, whenever streams(args) is true (always if streams is None).
+    requires names the modules the exporter imports lazily; they are checked
+    before the run starts and only loaded once the exporter is used.
+    """
+    name: str
+    option: str
+    requires: Tuple[str, ...] = ()
+    export: Optional[Callable] = None
+    sink: Optional[Callable] = None
+    streams: Optional[Callable] = None
+    
+    def uses_sink(self, args: argparse.Namespace) -> bool:
+        return self.sink is not None and (self.streams is None or bool(self.streams(args)))
+
+
+# Registrierte Exporter in Ausführungsreihenfolge (Sinks und Exporte)
+EXPORTERS: Dict[str, Exporter] = {}
+
+
+def register_exporter(exporter: Exporter) -> Exporter:
+    EXPORTERS[exporter.name] = exporter
+    return exporter
+
+
+def selected_exporters(args: argparse.Namespace) -> List[Exporter]:
+    return [exporter for exporter in EXPORTERS.values() if getattr(args, exporter.option, None)]
+
+
+def missing_requirements(exporters: List[Exporter]) -> Optional[str]:
+    """Error message for selected exporters whose modules are not installed (None if all are)"""
+    problems = []
+    for exporter in exporters:
+        missing = [module for module in exporter.requires if importlib.util.find_spec(module) is None]
+        if missing:
+            problems.append(f"--{exporter.option.replace('_', '-')} needs {', '.join(missing)} "
+                            f"(pip install {' '.join(missing)})")
+    return '; '.join(problems) or None
+
+
+def low_memory(args: argparse.Namespace) -> bool:
+    return getattr(args, 'low_memory', False)
+
+
+def export_txt(analyzer: AbletonProjectAnalyzer, args: argparse.Namespace) -> None:
+    if not args.recursive:
+        print("Use --recursive for VST lists export")
+    else:
+        analyzer.export_vst_lists_recursive("vst_lists", max_workers=args.workers)
+
+
+register_exporter(Exporter(
+    'ndjson', 'ndjson',
+    sink=lambda analyzer, args: ProjectStreamWriter(args.ndjson, analyzer.project_path, 'ndjson')))
+register_exporter(Exporter(
+    'json', 'json',
+    export=lambda analyzer, args: analyzer.export_to_json(args.json),
+    sink=lambda analyzer, args: ProjectStreamWriter(args.json, analyzer.project_path, 'json',
+                                                    shard=analyzer.shard_info()),
+    streams=lambda args: args.stream_json))
+register_exporter(Exporter(
+    'db', 'db',
+    sink=lambda analyzer, args: InventoryDatabase(args.db, analyzer.project_path, analyzer.plugins,
+                                                  analyzer.main_dir_of)))
+# Ohne gehaltene Projekte schreiben VstListSink/ExcelSink diese Ausgaben schon während der Analyse
+register_exporter(Exporter(
+    'txt', 'txt',
+    export=export_txt,
+    sink=lambda analyzer, args: VstListSink(analyzer, "vst_lists"),
+    streams=lambda args: low_memory(args) and args.recursive))
+register_exporter(Exporter(
+    'samples', 'samples',
+    export=lambda analyzer, args: analyzer.export_missing_samples(args.samples)))
+register_exporter(Exporter(
+    'excel', 'excel', requires=('openpyxl',),
+    export=lambda analyzer, args: analyzer.export_to_excel(args.excel),
+    sink=lambda analyzer, args: ExcelSink(analyzer, args.excel),
+    streams=low_memory))
+register_exporter(Exporter(
+    'columnar', 'columnar', requires=('numpy', 'pandas', 'pyarrow'),
+    export=lambda analyzer, args: analyzer.export_columnar(args.columnar, args.columnar_format)))
+
+
+def add_exporter_sinks(analyzer: AbletonProjectAnalyzer, args: argparse.Namespace) -> None:
+    """Attaches the stream writers of the selected exporters before the analysis"""
+    for exporter in selected_exporters(args):
+        if exporter.uses_sink(args):
+            analyzer.stream_writers.append(exporter.sink(analyzer, args))
+
+
+def run_exporters(analyzer: AbletonProjectAnalyzer, args: argparse.Namespace,
+                  profiler: NullProfiler = NULL_PROFILER) -> None:
+    """Runs the exporters selected on the command line that did not stream during the analysis"""
+    for exporter in selected_exporters(args):
+        if exporter.export is not None and not exporter.uses_sink(args):
+            with profiler.stage(f"export_{exporter.name}"):
+                exporter.export(analyzer, args)
+
+
+def merge_partial_results(partial_files: List[str], root: Optional[str] = None, count_mode: str = 'paths'
+                          ) -> AbletonProjectAnalyzer:
+    """Combines the --json results of sharded runs into one analyzer.
+    
+    Project paths are rebased onto root (default: the analyzed directory
+    of the first part), so nodes may mount the share at different places.
+    Warns about missing or repeated shards and skips projects that appear
+    in more than one part.
+    """
+    parts = []
+    for filename in partial_files:
+        with open(filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or 'projects' not in data or 'project_path' not in data:
+            raise ValueError(f"{filename} is not a --json result of this analyzer")
+        parts.append((filename, data))
+    
+    root_path = Path(root or parts[0][1]['project_path'])
+    analyzer = AbletonProjectAnalyzer(str(root_path), count_mode=count_mode)
+    shards = {}
+    seen = set()
+    skipped = 0
+    for filename, data in parts:
+        shard = data.get('shard')
+        if shard is not None:
+            shard_key = (shard['index'], shard['count'])
+            if shard_key in shards:
+                print(f"Warning: shard {shard_key[0]}/{shard_key[1]} in both {shards[shard_key]} and {filename}")
+            shards[shard_key] = filename
+        
+        part_root = Path(data['project_path'])
+        projects = []
+        for project in data['projects']:
+            if part_root != root_path:
+                project['path'] = rebase_path(project['path'], part_root, root_path)
+                if 'duplicate_of' in project:
+                    project['duplicate_of'] = rebase_path(project['duplicate_of'], part_root, root_path)
+            if project['path'] in seen:
+                skipped += 1
+                continue
+            seen.add(project['path'])
+            projects.append(project)
+        analyzer.add_projects(projects)
+        print(f"{filename}: {len(projects)} projects" + (f" (shard {shard['index']}/{shard['count']})" if shard else ""))
+    
+    counts = {count for _, count in shards}
+    if len(counts) > 1:
+        print(f"Warning: parts come from different shard counts {sorted(counts)}")
+    elif counts:
+        count = counts.pop()
+        missing = [str(index) for index in range(1, count + 1) if (index, count) not in shards]
+        if missing:
+            print(f"Warning: shard(s) {', '.join(missing)} of {count} missing - the merged result is incomplete")
+    if skipped:
+        print(f"Warning: {skipped} projects appeared in more than one part and were merged once")
+    print(f"Merged {len(parts)} partial results: {analyzer.analyzed} projects")
+    return analyzer
+
+
+def rebase_path(path: str, old_root: Path, new_root: Path) -> str:
+    try:
+        return str(new_root / Path(path).relative_to(old_root))
+    except ValueError:
+        return path
+
+
+def merge_main(argv: List[str]) -> None:
+    """'merge' subcommand: combines partial results of --shard runs and runs the exporters"""
+    parser = argparse.ArgumentParser(prog='ableton_project_analyzer.py merge',
+                                     description='Merge the --json results of --shard runs and export them')
+    parser.add_argument('parts', nargs='+', help='Partial --json results (one per shard)')
+    parser.add_argument('--root', help='Analyzed directory for the merged result (default: the one of the first part)')
+    parser.add_argument('--json', help='Export the merged results as JSON')
+    parser.add_argument('--txt', action='store_true', help='Export VST lists as text files (vst_lists/)')
+    parser.add_argument('--excel', help='Export the merged results as Excel file')
+    parser.add_argument('--columnar', metavar='DIR', help='Export the merged results as columnar tables')
+    parser.add_argument('--columnar-format', choices=list(COLUMNAR_FORMATS), default='parquet',
+                        help='File format of the --columnar tables: parquet (default) or arrow (IPC)')
+    parser.add_argument('--db', metavar='FILE', help='Store the merged inventory in an indexed SQLite database')
+    parser.add_argument('--count', choices=['paths', 'unique'], default='paths',
+                        help='Count every file (paths) or identical copies only once (unique) in reports')
+    parser.add_argument('--workers', type=int, default=16, help='Threads for the TXT export (default: 16)')
+    parser.set_defaults(stream_json=False, recursive=True, samples=None)
+    args = parser.parse_args(argv)
+    missing = missing_requirements(selected_exporters(args))
+    if missing:
+        parser.error(missing)
+    
+    try:
+        analyzer = merge_partial_results(args.parts, root=args.root, count_mode=args.count)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    
+    if args.db:
+        database = InventoryDatabase(args.db, analyzer.project_path, analyzer.plugins, analyzer.main_dir_of)
+        try:
+            database.write_projects(analyzer.projects)
+            database.finish(analyzer.json_summary())
+        finally:
+            database.abort()
+    analyzer.print_summary()
+    run_exporters(analyzer, args)
+
 
 def main():
-    parser = argparse.ArgumentParser(description='Ableton Live Project Analyzer - OPTIMIZED')
+    if sys.argv[1:2] == ['query']:
+        query_main(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ['merge']:
+        merge_main(sys.argv[2:])
+        return
+    
+    parser = argparse.ArgumentParser(description='Ableton Live Project Analyzer - OPTIMIZED',
+                                     epilog='Search a --db inventory: %(prog)s query FILE --plugin NAME [--version V]; '
+                                            'combine --shard results: %(prog)s merge PART.json ... [--json/--excel/--txt]')
     parser.add_argument('path', help='Path to Ableton projects')
     parser.add_argument('--json', help='Export results as JSON')
+    parser.add_argument('--stream-json', action='store_true',
+                        help='Write the --json file incrementally while projects are analyzed')
+    parser.add_argument('--ndjson', metavar='FILE',
+                        help='Write one JSON line per project as soon as it is analyzed, plus a summary trailer')
     parser.add_argument('--txt', action='store_true', help='Export VST lists as text files')
     parser.add_argument('--excel', help='Export results as Excel file')
+    parser.add_argument('--columnar', metavar='DIR',
+                        help='Export projects, tracks, plugin occurrences and statistics as columnar tables')
+    parser.add_argument('--columnar-format', choices=list(COLUMNAR_FORMATS), default='parquet',
+                        help='File format of the --columnar tables: parquet (default) or arrow (IPC)')
     parser.add_argument('--recursive', action='store_true', help='Recursive analysis with subdirectories')
     parser.add_argument('--quiet', action='store_true', help='Reduced output')
-    parser.add_argument('--workers', type=int, default=16, help='Number of parallel threads (default: 16)')
+    parser.add_argument('--workers', type=int, default=16, help='Number of parallel workers (default: 16)')
+    parser.add_argument('--cache-dir', help='Directory for the persistent result cache (skips unchanged files)')
+    parser.add_argument('--cache-hash', action='store_true',
+                        help='Also accept cached results whose mtime changed but whose content hash matches')
+    parser.add_argument('--exclude', action='append', default=[], metavar='PATTERN',
+                        help='Skip files/directories matching this glob (repeatable, e.g. Backup, Samples)')
+    parser.add_argument('--dedup', action='store_true',
+                        help='Parse byte-identical .als copies (e.g. Backup folders) only once')
+    parser.add_argument('--count', choices=['paths', 'unique'], default='paths',
+                        help='Count every file (paths) or identical copies only once (unique) in reports')
+    parser.add_argument('--parser', choices=PARSER_BACKENDS, default='auto',
+                        help='XML parser backend: lxml (C, if installed), etree (stdlib) or auto (default)')
+    parser.add_argument('--manufacturer-rules', metavar='FILE',
+                        help='JSON rules for inferring manufacturers from plugin filenames '
+                             '(default: manufacturer_rules.json next to this script)')
+    parser.add_argument('--executor', choices=['thread', 'process'], default='thread',
+                        help='Run the analysis in threads or in separate processes (default: thread)')
+    parser.add_argument('--profile', metavar='FILE',
+                        help='Write per-stage timings, histograms, the slowest files and failures as JSON')
+    parser.add_argument('--profile-top', type=int, default=20, metavar='N',
+                        help='Number of slowest files listed in the --profile report (default: 20)')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running and update the inventory, --json and --txt outputs when .als files change')
+    parser.add_argument('--debounce', type=float, default=2.0, metavar='SECONDS',
+                        help='With --watch: update once no file changed for this long (default: 2)')
+    parser.add_argument('--poll-interval', type=float, metavar='SECONDS',
+                        help='With --watch: poll at this interval instead of using inotify (e.g. on network shares)')
+    parser.add_argument('--io-workers', type=int, default=0, metavar='N',
+                        help='Read files ahead with N I/O threads; --workers then only limits parsing '
+                             '(default: 0, workers read their own files)')
+    parser.add_argument('--prefetch-mb', type=int, default=256, metavar='MB',
+                        help='With --io-workers: maximum raw file data held in memory (default: 256)')
+    parser.add_argument('--db', metavar='FILE',
+                        help='Store projects, tracks and plugin occurrences in an indexed SQLite database '
+                             '(search it with the query subcommand)')
+    parser.add_argument('--shard', type=parse_shard, metavar='i/N',
+                        help='Analyze only shard i of N (split by path hash); combine the --json results with merge')
+    parser.add_argument('--mode', choices=ANALYSIS_MODES, default='full',
+                        help='full (default) or plugins-only: scan the raw XML for plugins only, '
+                             'much faster but without track details')
+    parser.add_argument('--low-memory', action='store_true',
+                        help='Do not keep analyzed projects in memory: --json, --txt, --excel, --ndjson and --db '
+                             'are written while the analysis runs (not with --watch or --columnar)')
+    
+    parser.add_argument('--samples', metavar='FILE',
+                        help='Collect sample references (SampleRef/FileRef), check that the files exist and write '
+                             'the missing ones as JSON (--excel adds a Missing Samples sheet)')
+    parser.add_argument('--samples-case', choices=['auto', 'sensitive', 'insensitive'], default='auto',
+                        help='Compare sample file names case-sensitively or not; auto (default) is insensitive '
+                             'on Windows and macOS (use insensitive for SMB shares mounted on Linux)')
     
     args = parser.parse_args()
+    if args.stream_json and not args.json:
+        parser.error("--stream-json requires --json FILE")
+    if args.samples and (args.watch or args.mode == 'plugins-only'):
+        parser.error("--samples cannot be combined with --watch or --mode plugins-only")
+    if args.low_memory and (args.watch or args.columnar):
+        parser.error("--low-memory cannot be combined with --watch or --columnar (they need all projects)")
+    if args.low_memory and args.json:
+        args.stream_json = True
+    missing = missing_requirements(selected_exporters(args))
+    if missing:
+        parser.error(missing)
     
-    analyzer = AbletonProjectAnalyzer(args.path)
+    profiler = Profiler(top=args.profile_top) if args.profile else NULL_PROFILER
+    run_started = time.perf_counter()
+    try:
+        analyzer = AbletonProjectAnalyzer(args.path, dedup=args.dedup, count_mode=args.count,
+                                          exclude=args.exclude, parser=args.parser,
+                                          manufacturer_rules=args.manufacturer_rules, profiler=profiler,
+                                          shard=args.shard, mode=args.mode, retain_projects=not args.low_memory,
+                                          samples=bool(args.samples),
+                                          samples_ignore_case={'auto': CASE_INSENSITIVE_PLATFORM,
+                                                               'sensitive': False,
+                                                               'insensitive': True}[args.samples_case])
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    cache = None
+    if args.cache_dir:
+        cache = ProjectCache(args.cache_dir, use_hash=args.cache_hash, version=analyzer.result_version())
+        analyzer.cache = cache
     
-    analyzer.analyze_projects(quiet=args.quiet, max_workers=args.workers)
-    analyzer.print_summary()
+    add_exporter_sinks(analyzer, args)
     
-    if args.json:
-        analyzer.export_to_json(args.json)
+    # Vor der Analyse starten, damit Änderungen während des ersten Laufs nicht verloren gehen
+    watcher = create_watcher(analyzer.project_path, args.exclude, args.poll_interval) if args.watch else None
     
-    if args.txt:
-        if args.recursive:
-            analyzer.export_vst_lists_recursive("vst_lists")
-        else:
-            print("Use --recursive for VST lists export")
+    try:
+        with profiler.stage('analysis'):
+            analyzer.analyze_projects(quiet=args.quiet, max_workers=args.workers, executor=args.executor,
+                                      io_workers=args.io_workers, prefetch_mb=args.prefetch_mb)
+        with profiler.stage('export_stream'):
+            analyzer.finish_stream_writers()
+    finally:
+        if cache is not None and watcher is None:
+            cache.close()
+        for writer in analyzer.stream_writers:
+            writer.abort()
+    analyzer.print_summary()
+    try:
+        run_exporters(analyzer, args, profiler)
+    finally:
+        if analyzer.accumulator is not None and not analyzer.retain_projects:
+            analyzer.accumulator.close()
     
-    if args.excel:
-        analyzer.export_to_excel(args.excel)
+    if args.profile:
+        profiler.write_report(args.profile, {
+            'path': str(analyzer.project_path),
+            'wall_seconds': round(time.perf_counter() - run_started, 6),
+            'workers': args.workers,
+            'executor': args.executor,
+            'parser': analyzer.parser,
+            'mode': analyzer.mode,
+            'projects': analyzer.analyzed,
+            'prefetch': analyzer.prefetch_stats
+        })
+    
+    if watcher is not None:
+        try:
+            analyzer.watch(watcher, args.debounce, json_file=args.json,
+                           txt_dir="vst_lists" if args.txt and args.recursive else None, max_workers=args.workers)
+        finally:
+            if cache is not None:
+                cache.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
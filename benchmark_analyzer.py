@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the Ableton Project Analyzer
+"""
+import argparse
+import contextlib
+import gzip
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+from ableton_project_analyzer import (AbletonProjectAnalyzer, ProjectScanner, ProjectStreamWriter, lxml_etree,
+                                      merge_partial_results)
+from generate_corpus import CorpusSpec, generate_corpus
+
+
+def run_analysis(path: str, executor: str, workers: int):
+    """Runs one full analysis and returns (projects, seconds)"""
+    analyzer = AbletonProjectAnalyzer(path)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer.analyze_projects(quiet=True, max_workers=workers, executor=executor)
+    return len(analyzer.projects), time.perf_counter() - start
+
+
+def worker_counts(max_workers: int):
+    """1, 2, 4, ... up to max_workers (always including max_workers)"""
+    counts = []
+    count = 1
+    while count < max_workers:
+        counts.append(count)
+        count *= 2
+    counts.append(max_workers)
+    return counts
+
+
+def benchmark_scaling(path: str, executors, max_workers: int, repeat: int) -> None:
+    """Shows analysis throughput per executor as the worker count grows"""
+    print(f"Scaling benchmark: {path} (best of {repeat})")
+    print(f"{'Executor':<10}{'Workers':>8}{'Projects':>10}{'Seconds':>10}{'Files/s':>10}{'Speedup':>9}")
+    print("-" * 57)
+    for executor in executors:
+        baseline = None
+        for workers in worker_counts(max_workers):
+            projects, seconds = min((run_analysis(path, executor, workers) for _ in range(repeat)),
+                                    key=lambda result: result[1])
+            rate = projects / seconds if seconds > 0 else 0.0
+            if baseline is None:
+                baseline = rate
+            speedup = rate / baseline if baseline else 0.0
+            print(f"{executor:<10}{workers:>8}{projects:>10}{seconds:>10.2f}{rate:>10.1f}{speedup:>8.2f}x")
+
+
+def benchmark_shards(path: str, max_nodes: int, workers: int, executor: str) -> None:
+    """Runs N analyzer processes with --shard i/N side by side (stand-ins for render nodes), then merges them"""
+    analyzer_script = Path(__file__).with_name('ableton_project_analyzer.py')
+    print(f"Shard benchmark: {path} ({workers} {executor} workers per node)")
+    print(f"{'Nodes':>6}{'Projects':>10}{'Seconds':>10}{'Files/s':>10}{'Speedup':>9}{'Merge s':>9}")
+    print("-" * 54)
+    baseline = None
+    for nodes in worker_counts(max_nodes):
+        with tempfile.TemporaryDirectory() as output_dir:
+            parts = [str(Path(output_dir) / f"part{index}.json") for index in range(1, nodes + 1)]
+            start = time.perf_counter()
+            processes = [
+                subprocess.Popen([sys.executable, str(analyzer_script), path, '--quiet', '--shard', f"{index}/{nodes}",
+                                  '--json', part, '--workers', str(workers), '--executor', executor],
+                                 stdout=subprocess.DEVNULL)
+                for index, part in enumerate(parts, 1)
+            ]
+            if any(process.wait() != 0 for process in processes):
+                raise RuntimeError(f"a shard run failed with {nodes} nodes")
+            seconds = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                projects = len(merge_partial_results(parts).projects)
+            merge_seconds = time.perf_counter() - start
+        rate = projects / seconds if seconds > 0 else 0.0
+        if baseline is None:
+            baseline = rate
+        speedup = rate / baseline if baseline else 0.0
+        print(f"{nodes:>6}{projects:>10}{seconds:>10.2f}{rate:>10.1f}{speedup:>8.2f}x{merge_seconds:>9.2f}")
+
+
+def benchmark_parsers(path: str, backends, repeat: int) -> None:
+    """Per-file parse time of each parser backend on the same files
+    
+    The pseudo backend 'scan' is the plugins-only byte scan (--mode plugins-only);
+    it is checked against the reference on the plugin list and scene count only.
+    """
+    project_files = AbletonProjectAnalyzer(path).find_ableton_projects()
+    print(f"Parser benchmark: {len(project_files)} files in {path} (best of {repeat} per file)")
+    print(f"{'Backend':<8}{'Files/s':>10}{'Mean ms':>10}{'Median ms':>11}{'P95 ms':>10}{'Total s':>10}")
+    print("-" * 59)
+    
+    results = {}
+    for backend in backends:
+        if backend == 'scan':
+            analyzer = AbletonProjectAnalyzer(path, mode='plugins-only')
+        else:
+            analyzer = AbletonProjectAnalyzer(path, parser=backend)
+        timings = []
+        results[backend] = []
+        for project_file in project_files:
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                project = analyzer.extract_project_info(project_file)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            timings.append(best)
+            results[backend].append(project)
+        
+        total = sum(timings)
+        ordered = sorted(timings)
+        p95 = ordered[int(len(ordered) * 0.95)] if ordered else 0.0
+        rate = len(timings) / total if total > 0 else 0.0
+        mean = statistics.mean(timings) if timings else 0.0
+        median = statistics.median(timings) if timings else 0.0
+        print(f"{backend:<8}{rate:>10.1f}{mean * 1000:>10.2f}{median * 1000:>11.2f}{p95 * 1000:>10.2f}{total:>10.2f}")
+    
+    reference = backends[0]
+    for backend in backends[1:]:
+        if backend == 'scan':
+            mismatches = sum(1 for a, b in zip(results[reference], results[backend])
+                             if (a and (a['vsts'], a['scenes'])) != (b and (b['vsts'], b['scenes'])))
+        else:
+            mismatches = sum(1 for a, b in zip(results[reference], results[backend]) if a != b)
+        status = "identical" if mismatches == 0 else f"{mismatches} file(s) differ"
+        print(f"Output {backend} vs {reference}: {status}")
+
+
+def decompress(raw: bytes) -> bytes:
+    """Project XML of an .als file held in memory (same format detection as the analyzer)"""
+    if raw.startswith(b'PK'):
+        with zipfile.ZipFile(io.BytesIO(raw)) as zip_file:
+            return zip_file.read('Project.xml')
+    if raw.startswith(b'\x1f\x8b'):
+        return gzip.decompress(raw)
+    return raw
+
+
+def timed(function, repeat: int):
+    """Best wall time of repeat runs (console output suppressed); returns (result, seconds)"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def measure_stages(path: str, workers: int, repeat: int, output_dir: str) -> dict:
+    """Times every stage of the pipeline separately: {stage: {items, bytes, seconds}}"""
+    stages = {}
+    
+    def record(stage, items, size, seconds):
+        stages[stage] = {'items': items, 'bytes': size, 'seconds': seconds}
+    
+    analyzer = AbletonProjectAnalyzer(path)
+    project_files, seconds = timed(lambda: sorted(ProjectScanner(Path(path)).scan()), repeat)
+    record('discovery', len(project_files), 0, seconds)
+    
+    raw_files, seconds = timed(lambda: [Path(project_file).read_bytes() for project_file in project_files], repeat)
+    raw_bytes = sum(len(raw) for raw in raw_files)
+    record('read', len(raw_files), raw_bytes, seconds)
+    
+    def decompress_all():
+        documents = []
+        for raw in raw_files:
+            try:
+                documents.append(decompress(raw))
+            except Exception:
+                documents.append(None)
+        return documents
+    
+    documents, seconds = timed(decompress_all, repeat)
+    xml_bytes = sum(len(document) for document in documents if document is not None)
+    record('decompress', len(raw_files), xml_bytes, seconds)
+    
+    def parse_all():
+        parsed = []
+        for project_file, document in zip(project_files, documents):
+            if document is None:
+                continue
+            try:
+                parsed.append(analyzer.parse_stream_fast(io.BytesIO(document), project_file))
+            except Exception:
+                pass
+        return parsed
+    
+    parsed, seconds = timed(parse_all, repeat)
+    record('parse', len(parsed), xml_bytes, seconds)
+    
+    def analyze():
+        run = AbletonProjectAnalyzer(path)
+        run.analyze_projects(quiet=True, max_workers=workers)
+        return run
+    
+    analyzer, seconds = timed(analyze, repeat)
+    record('analysis', len(analyzer.projects), raw_bytes, seconds)
+    
+    def aggregate():
+        analyzer.inventory_index = None
+        analyzer.accumulator = None
+        return analyzer.inventory()
+    
+    _, seconds = timed(aggregate, repeat)
+    record('aggregation', len(analyzer.projects), 0, seconds)
+    
+    output = Path(output_dir)
+    
+    def export_ndjson():
+        writer = ProjectStreamWriter(str(output / 'inventory.ndjson'), analyzer.project_path)
+        writer.write_projects(list(analyzer.expanded_projects()))
+        writer.finish(analyzer.json_summary())
+    
+    exporters = [
+        ('export_json', lambda: analyzer.export_to_json(str(output / 'inventory.json')), 'inventory.json'),
+        ('export_ndjson', export_ndjson, 'inventory.ndjson'),
+        ('export_txt', lambda: analyzer.export_vst_lists_recursive(str(output / 'vst_lists'), max_workers=workers),
+         None),
+        ('export_excel', lambda: analyzer.export_to_excel(str(output / 'inventory.xlsx')), 'inventory.xlsx'),
+    ]
+    try:
+        import pyarrow  # noqa: F401
+        exporters.append(('export_columnar', lambda: analyzer.export_columnar(str(output / 'columnar')), None))
+    except ImportError:
+        pass
+    
+    for stage, export, filename in exporters:
+        _, seconds = timed(export, repeat)
+        size = (output / filename).stat().st_size if filename else 0
+        record(stage, len(analyzer.projects), size, seconds)
+    return stages
+
+
+def synthetic_columnar(occurrences: int, projects: int, plugins: int, seed: int):
+    """ColumnarInventory with random plugin occurrences (no .als files needed)"""
+    import numpy as np
+    import pandas as pd
+    from ableton_project_analyzer import ColumnarInventory
+    
+    random = np.random.default_rng(seed)
+    # Wenige Plugins sind sehr häufig, die meisten selten (wie in echten Archiven)
+    plugin_ids = np.minimum(random.zipf(1.3, occurrences) - 1, plugins - 1).astype(np.uint32)
+    project_ids = np.sort(random.integers(0, projects, occurrences))
+    vsts = np.bincount(project_ids, minlength=projects)
+    tracks = random.integers(1, 32, projects)
+    project_table = pd.DataFrame({
+        'project_id': np.arange(projects, dtype=np.int64),
+        'name': [f"Project {index}" for index in range(projects)],
+        'path': [f"/Projects/Dir {index % 50}/Project {index}.als" for index in range(projects)],
+        'main_dir': [f"Dir {index % 50}" for index in range(projects)],
+        'scenes': np.zeros(projects, dtype=np.int64),
+        'tracks': tracks,
+        'vsts': vsts,
+        'counted': np.ones(projects, dtype=bool),
+        'duplicate_of': [None] * projects
+    })
+    plugin_table = pd.DataFrame({
+        'plugin_id': np.arange(plugins, dtype=np.uint32),
+        'key': [f"Vendor {index % 200} - Plugin {index}" for index in range(plugins)],
+        'manufacturer': [f"Vendor {index % 200}" for index in range(plugins)],
+        'name': [f"Plugin {index}" for index in range(plugins)],
+        'filename': [f"Plugin {index}.dll" for index in range(plugins)],
+        'version': [''] * plugins
+    })
+    occurrence_table = pd.DataFrame({'project_id': project_ids.astype(np.int64), 'plugin_id': plugin_ids})
+    return ColumnarInventory(project_table, pd.DataFrame(), plugin_table, occurrence_table, pd.DataFrame())
+
+
+def benchmark_statistics(occurrences, projects: int, plugins: int, repeat: int, seed: int) -> None:
+    """Times the columnar Statistics and VST Requirements group-bys at growing occurrence counts"""
+    print(f"Columnar statistics benchmark: {projects} projects, {plugins} plugins (best of {repeat})")
+    print(f"{'Occurrences':>12}{'Seconds':>10}{'Occ/s':>14}")
+    print("-" * 36)
+    for count in occurrences:
+        columnar = synthetic_columnar(count, projects, plugins, seed)
+        
+        def compute():
+            columnar.usage = None
+            columnar.vst_requirements()
+            columnar.manufacturer_statistics()
+            columnar.statistics()
+        
+        _, seconds = timed(compute, repeat)
+        print(f"{count:>12}{seconds:>10.3f}{count / seconds if seconds > 0 else 0.0:>14.0f}")
+
+
+def print_stages(stages: dict, baseline: dict = None, tolerance: float = 0.2) -> list:
+    """Prints files/s and MB/s per stage; returns the stages slower than baseline by more than tolerance"""
+    print(f"{'Stage':<17}{'Items':>8}{'Seconds':>10}{'Files/s':>11}{'MB/s':>9}{'Baseline':>11}{'Change':>9}")
+    print("-" * 75)
+    regressions = []
+    for stage, result in stages.items():
+        seconds = result['seconds']
+        rate = result['items'] / seconds if seconds > 0 else 0.0
+        megabytes = result['bytes'] / seconds / 1024 / 1024 if seconds > 0 and result['bytes'] else 0.0
+        line = f"{stage:<17}{result['items']:>8}{seconds:>10.3f}{rate:>11.1f}"
+        line += f"{megabytes:>9.1f}" if megabytes else f"{'-':>9}"
+        reference = (baseline or {}).get(stage)
+        if reference and reference['seconds'] > 0 and reference['items']:
+            reference_rate = reference['items'] / reference['seconds']
+            change = rate / reference_rate - 1 if reference_rate else 0.0
+            line += f"{reference_rate:>11.1f}{change:>+8.0%}"
+            if change < -tolerance:
+                regressions.append(stage)
+                line += "  REGRESSION"
+        print(line)
+    return regressions
+
+
+def benchmark_stages(path: str, workers: int, repeat: int, save_baseline: str = None,
+                     baseline_file: str = None, tolerance: float = 0.2, corpus: dict = None) -> int:
+    """Per-stage benchmark; saves or compares against a baseline file, returns the exit code"""
+    print(f"Stage benchmark: {path} (best of {repeat}, {workers} workers)")
+    with tempfile.TemporaryDirectory() as output_dir:
+        stages = measure_stages(path, workers, repeat, output_dir)
+    
+    baseline = None
+    if baseline_file:
+        with open(baseline_file, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['stages']
+    regressions = print_stages(stages, baseline, tolerance)
+    
+    if save_baseline:
+        data = {
+            'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'workers': workers,
+            'corpus': corpus or {'path': path},
+            'stages': stages
+        }
+        with open(save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        print(f"Baseline saved to {save_baseline}")
+    
+    if regressions:
+        print(f"Slower than baseline by more than {tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ableton Project Analyzer - Benchmarks')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+    
+    scaling = subparsers.add_parser('scaling', help='Throughput vs. number of workers per executor')
+    scaling.add_argument('path', help='Path to a directory with .als files')
+    scaling.add_argument('--executor', choices=['thread', 'process'], action='append',
+                         help='Executor(s) to benchmark (default: both)')
+    scaling.add_argument('--max-workers', type=int, default=os.cpu_count() or 1,
+                         help='Highest worker count to test (default: CPU count)')
+    scaling.add_argument('--repeat', type=int, default=1, help='Runs per configuration (best is reported)')
+    
+    parsers = subparsers.add_parser('parsers', help='Per-file parse time per XML parser backend')
+    parsers.add_argument('path', help='Path to a directory with .als files')
+    parsers.add_argument('--repeat', type=int, default=1, help='Runs per file (best is reported)')
+    
+    stages = subparsers.add_parser('stages', help='Discovery, read, decompression, parse, aggregation and '
+                                                  'exporters timed separately, with saved baselines')
+    stages.add_argument('path', nargs='?', help='Path to a directory with .als files (omit with --generate)')
+    stages.add_argument('--generate', type=int, metavar='N',
+                        help='Benchmark a temporary synthetic corpus of N sets instead of a path')
+    stages.add_argument('--target-kb', type=int, default=0, help='With --generate: Project XML size per set')
+    stages.add_argument('--seed', type=int, default=1, help='With --generate: corpus seed')
+    stages.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Workers for analysis/TXT export')
+    stages.add_argument('--repeat', type=int, default=1, help='Runs per stage (best is reported)')
+    stages.add_argument('--save-baseline', metavar='FILE', help='Store the results as a baseline JSON file')
+    stages.add_argument('--baseline', metavar='FILE', help='Compare against a saved baseline (exit code 1 on regression)')
+    stages.add_argument('--tolerance', type=float, default=0.2,
+                        help='Allowed slowdown vs. baseline before a stage counts as regression (default: 0.2)')
+    
+    shards = subparsers.add_parser('shards', help='Throughput of 1, 2, 4, ... parallel --shard runs plus merge')
+    shards.add_argument('path', help='Path to a directory with .als files')
+    shards.add_argument('--max-nodes', type=int, default=os.cpu_count() or 1,
+                        help='Highest number of shard processes (default: CPU count)')
+    shards.add_argument('--workers', type=int, default=1, help='Workers per shard process (default: 1)')
+    shards.add_argument('--executor', choices=['thread', 'process'], default='thread',
+                        help='Executor of every shard process (default: thread)')
+    
+    columnar = subparsers.add_parser('statistics', help='Columnar Statistics/VST Requirements group-bys on '
+                                                        'synthetic tables with millions of plugin occurrences')
+    columnar.add_argument('--occurrences', type=int, nargs='+', default=[1000000, 2000000, 5000000],
+                          help='Plugin occurrence counts to benchmark (default: 1M 2M 5M)')
+    columnar.add_argument('--projects', type=int, default=200000, help='Projects the occurrences spread over')
+    columnar.add_argument('--plugins', type=int, default=5000, help='Distinct plugins')
+    columnar.add_argument('--repeat', type=int, default=3, help='Runs per size (best is reported)')
+    columnar.add_argument('--seed', type=int, default=1, help='Random seed of the synthetic tables')
+    
+    args = parser.parse_args()
+    
+    if args.benchmark == 'scaling':
+        benchmark_scaling(args.path, args.executor or ['thread', 'process'], args.max_workers, args.repeat)
+    elif args.benchmark == 'parsers':
+        backends = ['etree', 'lxml'] if lxml_etree is not None else ['etree']
+        if lxml_etree is None:
+            print("lxml is not installed, only benchmarking etree")
+        benchmark_parsers(args.path, backends + ['scan'], args.repeat)
+    elif args.benchmark == 'shards':
+        benchmark_shards(args.path, args.max_nodes, args.workers, args.executor)
+    elif args.benchmark == 'statistics':
+        benchmark_statistics(args.occurrences, args.projects, args.plugins, args.repeat, args.seed)
+    elif args.benchmark == 'stages':
+        if args.generate:
+            spec = CorpusSpec(projects=args.generate, target_kb=args.target_kb, seed=args.seed)
+            with tempfile.TemporaryDirectory() as corpus_dir:
+                generate_corpus(corpus_dir, spec, manifest=False)
+                code = benchmark_stages(corpus_dir, args.workers, args.repeat, args.save_baseline, args.baseline,
+                                        args.tolerance, corpus={'synthetic': spec._asdict()})
+        elif args.path:
+            code = benchmark_stages(args.path, args.workers, args.repeat, args.save_baseline, args.baseline,
+                                    args.tolerance)
+        else:
+            parser.error("stages needs a path or --generate N")
+        sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+# test_smb_path.py is a manual smoke script for a mounted share, not a test module
+collect_ignore = ["test_smb_path.py"]
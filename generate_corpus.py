@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Synthetic Ableton Live set generator for tests and benchmarks
+
+Creates deterministic .als files (ZIP, gzip or raw XML) with the structures
+the analyzer handles: Audio/MIDI/Return/Master tracks, device chains with
+nested instrument racks, VstPluginInfo blocks (with and without explicit
+manufacturer) and scenes. Clip note data pads the sets to a target size.
+"""
+import argparse
+import gzip
+import json
+import random
+import zipfile
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+FORMATS = ('zip', 'gzip', 'xml')
+
+# Hersteller, Dateinamen-Muster, Manufacturer-Element vorhanden?
+VENDORS = (
+    ('Xfer Records', 'Serum', True),
+    ('FabFilter', 'FabFilter', False),
+    ('iZotope', 'iZotope', False),
+    ('Native Instruments', 'Massive', False),
+    ('Youlean', 'Youlean', False),
+    ('Valhalla DSP', 'Valhalla', True),
+    ('Acme Audio', 'Acme', False),
+)
+
+TRACK_TAGS = ('AudioTrack', 'MidiTrack', 'ReturnTrack')
+
+
+class CorpusSpec(NamedTuple):
+    """Shape of a synthetic corpus (all counts are per project unless noted)"""
+    projects: int = 100
+    main_dirs: int = 4
+    tracks: Tuple[int, int] = (4, 16)
+    devices: Tuple[int, int] = (0, 4)
+    rack_probability: float = 0.2
+    scenes: Tuple[int, int] = (1, 8)
+    plugin_pool: int = 40
+    formats: Tuple[str, ...] = FORMATS
+    target_kb: int = 0
+    seed: int = 1
+
+
+def plugin_pool(size: int) -> List[Dict]:
+    """Deterministic list of distinct plugins (name, filename, optional manufacturer)"""
+    plugins = []
+    for index in range(size):
+        vendor, pattern, explicit = VENDORS[index % len(VENDORS)]
+        name = f"{pattern} {index // len(VENDORS) + 1}"
+        plugins.append({
+            'name': name,
+            'filename': f"{pattern} Plugin {index}.dll",
+            'version': str(2400 + index % 3),
+            'manufacturer': vendor if explicit else None
+        })
+    return plugins
+
+
+def plugin_xml(plugin: Dict) -> str:
+    parts = ['<VstPluginInfo Id="0">', f'<PlugName Value="{plugin["name"]}"/>',
+             f'<FileName Value="{plugin["filename"]}"/>', f'<VstVersion Value="{plugin["version"]}"/>']
+    if plugin['manufacturer'] is not None:
+        parts.append(f'<Manufacturer Value="{plugin["manufacturer"]}"/>')
+    parts.append('<Preset><VstPreset Id="0"/></Preset></VstPluginInfo>')
+    return ''.join(parts)
+
+
+def device_xml(rng: random.Random, plugins: List[Dict], spec: CorpusSpec, used: set, depth: int = 0) -> str:
+    if depth < 2 and rng.random() < spec.rack_probability:
+        chains = ''.join(
+            '<InstrumentBranch><DeviceChain><MidiToAudioDeviceChain><Devices>'
+            + device_xml(rng, plugins, spec, used, depth + 1)
+            + '</Devices></MidiToAudioDeviceChain></DeviceChain></InstrumentBranch>'
+            for _ in range(rng.randint(1, 3))
+        )
+        return f'<InstrumentGroupDevice><Branches>{chains}</Branches></InstrumentGroupDevice>'
+    plugin = rng.choice(plugins)
+    used.add(plugin['name'])
+    return f'<PluginDevice><PluginDesc>{plugin_xml(plugin)}</PluginDesc></PluginDevice>'
+
+
+def clip_xml(rng: random.Random, notes: int) -> str:
+    events = ''.join(
+        f'<MidiNoteEvent Time="{index * 0.25:.2f}" Duration="0.25" Velocity="{rng.randint(1, 127)}"/>'
+        for index in range(notes)
+    )
+    return f'<MidiClip><Notes><KeyTracks><KeyTrack><Notes>{events}</Notes></KeyTrack></KeyTracks></Notes></MidiClip>'
+
+
+def synthetic_live_set(rng: random.Random, spec: CorpusSpec, plugins: List[Dict]) -> Tuple[bytes, Dict]:
+    """Returns the Project XML and what it contains (tracks, scenes, plugin names)"""
+    used = set()
+    track_count = rng.randint(*spec.tracks)
+    tracks = []
+    for index in range(track_count):
+        tag = rng.choice(TRACK_TAGS)
+        devices = ''.join(device_xml(rng, plugins, spec, used) for _ in range(rng.randint(*spec.devices)))
+        tracks.append(f'<{tag} Id="{index}"><Name Value="Track {index + 1}"/>'
+                      f'<DeviceChain><DeviceChain><Devices>{devices}</Devices></DeviceChain></DeviceChain></{tag}>')
+    master = device_xml(rng, plugins, spec, used) if rng.random() < 0.5 else ''
+    scene_count = rng.randint(*spec.scenes)
+    scenes = ''.join(f'<Scene Id="{index}"/>' for index in range(scene_count))
+    
+    head = f'<?xml version="1.0" encoding="UTF-8"?>\n<Ableton MajorVersion="5"><LiveSet><Tracks>{"".join(tracks)}'
+    tail = (f'</Tracks><MasterTrack><Name Value="Master"/><DeviceChain><DeviceChain><Devices>{master}'
+            f'</Devices></DeviceChain></DeviceChain></MasterTrack><Scenes>{scenes}</Scenes></LiveSet></Ableton>\n')
+    
+    # Clips füllen das Set bis zur Zielgröße auf (liegen außerhalb der Tracks, ändern das Ergebnis nicht)
+    padding = []
+    missing = spec.target_kb * 1024 - len(head) - len(tail)
+    while missing > 0:
+        clip = clip_xml(rng, min(512, max(1, missing // 60)))
+        padding.append(clip)
+        missing -= len(clip)
+    xml = head + tail.replace('<Scenes>', f'<ClipSlots>{"".join(padding)}</ClipSlots><Scenes>', 1)
+    
+    return xml.encode('utf-8'), {'tracks': track_count, 'scenes': scene_count, 'plugins': sorted(used)}
+
+
+def write_live_set(path: Path, xml: bytes, fmt: str) -> int:
+    """Writes the set as ZIP (Project.xml), gzip or raw XML; returns the file size"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == 'zip':
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            # Fester Zeitstempel hält die Dateien byte-identisch zwischen Läufen
+            zip_file.writestr(zipfile.ZipInfo('Project.xml', date_time=(1980, 1, 1, 0, 0, 0)), xml,
+                              compress_type=zipfile.ZIP_DEFLATED)
+    elif fmt == 'gzip':
+        path.write_bytes(gzip.compress(xml, mtime=0))
+    else:
+        path.write_bytes(xml)
+    return path.stat().st_size
+
+
+def generate_corpus(output_dir: str, spec: CorpusSpec = CorpusSpec(), manifest: bool = True) -> Dict:
+    """Writes spec.projects sets below output_dir and returns the manifest"""
+    root = Path(output_dir)
+    plugins = plugin_pool(spec.plugin_pool)
+    files = []
+    total_bytes = 0
+    xml_bytes = 0
+    for index in range(spec.projects):
+        # Eigener Zufallsgenerator pro Projekt: jede Datei ist unabhängig reproduzierbar
+        rng = random.Random(f"{spec.seed}:{index}")
+        xml, contents = synthetic_live_set(rng, spec, plugins)
+        fmt = spec.formats[index % len(spec.formats)]
+        name = f"Song {index:05d}"
+        path = root / f"Main {index % spec.main_dirs:02d}" / f"{name} Project" / f"{name}.als"
+        size = write_live_set(path, xml, fmt)
+        total_bytes += size
+        xml_bytes += len(xml)
+        files.append(dict(contents, path=str(path.relative_to(root)), format=fmt, bytes=size, xml_bytes=len(xml)))
+    
+    data = {
+        'spec': spec._asdict(),
+        'files': len(files),
+        'bytes': total_bytes,
+        'xml_bytes': xml_bytes,
+        'projects': files
+    }
+    if manifest:
+        with open(root / 'corpus_manifest.json', 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+    return data
+
+
+def int_range(value: str) -> Tuple[int, int]:
+    """'4' oder '4-16' -> (min, max)"""
+    low, _, high = value.partition('-')
+    return int(low), int(high or low)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic corpus of Ableton Live sets')
+    parser.add_argument('output', help='Target directory')
+    parser.add_argument('--projects', type=int, default=100, help='Number of .als files (default: 100)')
+    parser.add_argument('--main-dirs', type=int, default=4, help='Number of first-level folders (default: 4)')
+    parser.add_argument('--tracks', type=int_range, default=(4, 16), help='Tracks per set, N or MIN-MAX')
+    parser.add_argument('--devices', type=int_range, default=(0, 4), help='Plugin devices per track, N or MIN-MAX')
+    parser.add_argument('--racks', type=float, default=0.2, help='Probability that a device is a nested rack')
+    parser.add_argument('--scenes', type=int_range, default=(1, 8), help='Scenes per set, N or MIN-MAX')
+    parser.add_argument('--plugins', type=int, default=40, help='Number of distinct plugins in the pool')
+    parser.add_argument('--format', choices=FORMATS, action='append',
+                        help='File format(s), used round-robin (default: zip, gzip and xml)')
+    parser.add_argument('--target-kb', type=int, default=0,
+                        help='Pad every Project XML with clip data up to this size in KB')
+    parser.add_argument('--seed', type=int, default=1, help='Seed (same seed + options = identical files)')
+    args = parser.parse_args(argv)
+    
+    spec = CorpusSpec(projects=args.projects, main_dirs=max(1, args.main_dirs), tracks=args.tracks,
+                      devices=args.devices, rack_probability=args.racks, scenes=args.scenes,
+                      plugin_pool=max(1, args.plugins), formats=tuple(args.format or FORMATS),
+                      target_kb=args.target_kb, seed=args.seed)
+    data = generate_corpus(args.output, spec)
+    print(f"Created {data['files']} sets in {args.output}: {data['bytes'] / 1024 / 1024:.1f} MB on disk, "
+          f"{data['xml_bytes'] / 1024 / 1024:.1f} MB XML")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1168 @@
+#!/usr/bin/env python3
+"""
+Tests for the Ableton Project Analyzer
+"""
+import gzip
+import io
+import json
+import os
+import re
+import sqlite3
+import subprocess
+import sys
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import openpyxl
+import pandas as pd
+import pytest
+
+import ableton_project_analyzer
+import benchmark_analyzer
+import generate_corpus
+from ableton_project_analyzer import (AbletonProjectAnalyzer, ColumnarInventory, InventoryAccumulator,
+                                      InventoryDatabase, InotifyWatcher, ManufacturerResolver, PollingWatcher, Profiler, ProjectCache,
+                                      ProjectScanner, ProjectStreamWriter, StreamingSheet, WorkQueue)
+
+
+def plugin_xml(name, filename=None, manufacturer=None, version='2400'):
+    parts = ['<VstPluginInfo Id="0">']
+    if name is not None:
+        parts.append(f'<PlugName Value="{name}"/>')
+    if filename is not None:
+        parts.append(f'<FileName Value="{filename}"/>')
+    parts.append(f'<VstVersion Value="{version}"/>')
+    if manufacturer is not None:
+        parts.append(f'<Manufacturer Value="{manufacturer}"/>')
+    parts.append('<Preset><VstPreset Id="0"/></Preset></VstPluginInfo>')
+    return ''.join(parts)
+
+
+def device_xml(plugin):
+    return f'<PluginDevice><PluginDesc>{plugin}</PluginDesc></PluginDevice>'
+
+
+def rack_xml(*plugins):
+    chains = ''.join(
+        f'<InstrumentBranch><DeviceChain><MidiToAudioDeviceChain><Devices>{device_xml(p)}'
+        f'</Devices></MidiToAudioDeviceChain></DeviceChain></InstrumentBranch>'
+        for p in plugins
+    )
+    return f'<InstrumentGroupDevice><Branches>{chains}</Branches></InstrumentGroupDevice>'
+
+
+SERUM = plugin_xml('Serum', 'Serum_x64.dll', 'Xfer Records')
+PRO_Q = plugin_xml('Pro-Q 3', 'FabFilter Pro-Q 3.dll')
+MASSIVE = plugin_xml('Massive', 'Massive.dll')
+OZONE = plugin_xml('Ozone 9', 'iZotope Ozone 9.dll')
+UNKNOWN = plugin_xml('Mystery', 'Mystery.vst3')
+NAMELESS = plugin_xml(None, 'Nameless.dll')
+
+LIVE_SET = f'''<?xml version="1.0" encoding="UTF-8"?>
+<Ableton MajorVersion="5">
+  <LiveSet>
+    <Tracks>
+      <MidiTrack Id="1">
+        <Name><EffectiveName Value="Lead"/></Name>
+        <DeviceChain><DeviceChain><Devices>
+          {device_xml(SERUM)}{rack_xml(MASSIVE, UNKNOWN)}{device_xml(NAMELESS)}
+        </Devices></DeviceChain></DeviceChain>
+      </MidiTrack>
+      <AudioTrack Id="2">
+        <Name Value="Drums"/>
+        {PRO_Q}{SERUM}
+        <DeviceChain><DeviceChain><Devices>{device_xml(PRO_Q)}</Devices></DeviceChain></DeviceChain>
+      </AudioTrack>
+      <GroupTrack Id="3">
+        <Name Value="Group"/>
+        <DeviceChain><Devices>{device_xml(OZONE)}</Devices></DeviceChain>
+      </GroupTrack>
+      <ReturnTrack Id="4">
+        <Name Value="Reverb"/>
+        <DeviceChain><DeviceChain><Devices></Devices></DeviceChain></DeviceChain>
+      </ReturnTrack>
+      <Track>
+        <Name Value="Wrapper"/>
+        <MidiTrack><Name Value="Inner"/><DeviceChain>{MASSIVE}</DeviceChain></MidiTrack>
+      </Track>
+    </Tracks>
+    <MasterTrack>
+      <Name Value="Master"/>
+      <DeviceChain><DeviceChain><Devices>{device_xml(OZONE)}</Devices></DeviceChain></DeviceChain>
+    </MasterTrack>
+    <Scenes><Scene Id="0"/><Scene Id="1"/><Scene Id="2"/></Scenes>
+  </LiveSet>
+</Ableton>
+'''
+
+
+def legacy_vst(vst_info):
+    """Reference copy of the original per-element VST extraction"""
+    plug_name_elem = vst_info.find('PlugName')
+    if plug_name_elem is None or 'Value' not in plug_name_elem.attrib:
+        return None
+    plugin_data = {'name': plug_name_elem.attrib['Value']}
+    file_name_elem = vst_info.find('FileName')
+    plugin_data['filename'] = file_name_elem.attrib.get('Value', '') if file_name_elem is not None else ''
+    version_elem = vst_info.find('VstVersion')
+    plugin_data['version'] = version_elem.attrib.get('Value', '') if version_elem is not None else ''
+    manufacturer_elem = vst_info.find('Manufacturer')
+    if manufacturer_elem is not None and 'Value' in manufacturer_elem.attrib:
+        plugin_data['manufacturer'] = manufacturer_elem.attrib['Value']
+    else:
+        filename = plugin_data['filename']
+        for needle, vendor in (('Maschine', 'Native Instruments'), ('Serum', 'Xfer Records'),
+                               ('Massive', 'Native Instruments'), ('FabFilter', 'FabFilter'),
+                               ('iZotope', 'iZotope'), ('Youlean', 'Youlean'), ('AR TG', 'AR TG')):
+            if needle in filename:
+                plugin_data['manufacturer'] = vendor
+                break
+        else:
+            plugin_data['manufacturer'] = 'Unbekannt'
+    return plugin_data
+
+
+def legacy_parse(root, project_file):
+    """Reference copy of the original multi-scan parse_xml_fast"""
+    vsts = [v for v in (legacy_vst(e) for e in root.findall('.//VstPluginInfo')) if v]
+    track_elements = []
+    for track_type in ('.//AudioTrack', './/MidiTrack', './/ReturnTrack', './/MasterTrack', './/Track'):
+        for track in root.findall(track_type):
+            if track not in track_elements:
+                track_elements.append(track)
+    tracks = []
+    for track in track_elements:
+        track_info = {'name': 'Unbekannter Track', 'type': 'Audio', 'vsts': []}
+        name_elem = track.find('Name')
+        if name_elem is not None and 'Value' in name_elem.attrib:
+            track_info['name'] = name_elem.attrib['Value']
+        for tag, track_type in (('AudioTrack', 'Audio'), ('MidiTrack', 'MIDI'),
+                                ('ReturnTrack', 'Return'), ('MasterTrack', 'Master')):
+            if track.tag == tag or track.find('.//' + tag) is not None:
+                track_info['type'] = track_type
+                break
+        track_vsts = []
+        for device_chain in track.findall('.//DeviceChain'):
+            for vst_info in device_chain.findall('.//VstPluginInfo'):
+                plugin_data = legacy_vst(vst_info)
+                if plugin_data:
+                    track_vsts.append(plugin_data)
+        for vst_info in track.findall('.//VstPluginInfo'):
+            plugin_data = legacy_vst(vst_info)
+            if plugin_data and plugin_data not in track_vsts:
+                track_vsts.append(plugin_data)
+        track_info['vsts'] = track_vsts
+        tracks.append(track_info)
+    return {
+        'name': project_file.stem,
+        'path': str(project_file),
+        'vsts': vsts,
+        'tracks': tracks,
+        'scenes': len(root.findall('.//Scene'))
+    }
+
+
+def write_project(path: Path, xml: str, fmt: str) -> Path:
+    data = xml.encode('utf-8')
+    if fmt == 'gzip':
+        path.write_bytes(gzip.compress(data))
+    elif fmt == 'zip':
+        with zipfile.ZipFile(path, 'w') as zip_file:
+            zip_file.writestr('Project.xml', data)
+    else:
+        path.write_bytes(data)
+    return path
+
+
+def test_parse_xml_fast_matches_legacy_output():
+    root = ET.fromstring(LIVE_SET.encode('utf-8'))
+    project_file = Path('/projects/Song.als')
+    analyzer = AbletonProjectAnalyzer('/projects')
+    
+    assert analyzer.parse_xml_fast(root, project_file) == legacy_parse(root, project_file)
+
+
+@pytest.mark.parametrize('fmt', ['gzip', 'zip', 'xml'])
+def test_streaming_extraction_matches_legacy_output(tmp_path, fmt):
+    project_file = write_project(tmp_path / 'Song.als', LIVE_SET, fmt)
+    analyzer = AbletonProjectAnalyzer(str(tmp_path))
+    expected = legacy_parse(ET.fromstring(LIVE_SET.encode('utf-8')), project_file)
+    
+    assert analyzer.process_batch([project_file]) == [expected]
+    assert analyzer.all_vsts == {f"{v['manufacturer']} - {v['name']}" for v in expected['vsts']}
+
+
+def test_track_plugins_follow_device_chain_nesting():
+    root = ET.fromstring(LIVE_SET.encode('utf-8'))
+    project = AbletonProjectAnalyzer('/projects').parse_xml_fast(root, Path('/projects/Song.als'))
+    tracks = {track['name']: track for track in project['tracks']}
+    
+    assert [t['type'] for t in project['tracks']] == ['Audio', 'MIDI', 'MIDI', 'Return', 'Master', 'MIDI']
+    assert [v['name'] for v in tracks['Drums']['vsts']] == ['Pro-Q 3', 'Pro-Q 3', 'Serum']
+    assert tracks['Unbekannter Track']['vsts'][0]['manufacturer'] == 'Xfer Records'
+    assert project['scenes'] == 3
+
+
+def test_process_executor_matches_thread_executor(tmp_path):
+    for i, fmt in enumerate(['gzip', 'zip', 'xml', 'gzip']):
+        (tmp_path / f'Dir{i}').mkdir()
+        write_project(tmp_path / f'Dir{i}' / f'Song{i}.als', LIVE_SET, fmt)
+    (tmp_path / 'broken.als').write_bytes(b'not a live set')
+    
+    results = {}
+    for executor in ('thread', 'process'):
+        analyzer = AbletonProjectAnalyzer(str(tmp_path))
+        analyzer.analyze_projects(quiet=True, max_workers=2, executor=executor)
+        results[executor] = (sorted(analyzer.expanded_projects(), key=lambda p: p['path']), analyzer.all_vsts)
+    
+    assert len(results['process'][0]) == 4
+    assert results['process'] == results['thread']
+
+
+def test_cache_skips_unchanged_files_and_evicts_deleted(tmp_path, monkeypatch):
+    projects_dir = tmp_path / 'projects'
+    projects_dir.mkdir()
+    song = write_project(projects_dir / 'Song.als', LIVE_SET, 'gzip')
+    other = write_project(projects_dir / 'Other.als', LIVE_SET, 'zip')
+    (projects_dir / 'broken.als').write_bytes(b'not a live set')
+    
+    cache = ProjectCache(str(tmp_path / 'cache'))
+    first = AbletonProjectAnalyzer(str(projects_dir), cache=cache)
+    first.analyze_projects(quiet=True, max_workers=2)
+    
+    parsed = []
+    original = AbletonProjectAnalyzer.extract_project_info
+    monkeypatch.setattr(AbletonProjectAnalyzer, 'extract_project_info',
+                        lambda self, f: parsed.append(f.name) or original(self, f))
+    
+    second = AbletonProjectAnalyzer(str(projects_dir), cache=cache)
+    second.analyze_projects(quiet=True, max_workers=2)
+    assert parsed == []
+    assert (sorted(second.expanded_projects(), key=lambda p: p['path'])
+            == sorted(first.expanded_projects(), key=lambda p: p['path']))
+    assert second.all_vsts == first.all_vsts
+    
+    other.unlink()
+    os.utime(song, ns=(0, 10 ** 9))
+    third = AbletonProjectAnalyzer(str(projects_dir), cache=cache)
+    third.analyze_projects(quiet=True, max_workers=2)
+    assert parsed == ['Song.als']
+    assert [p['name'] for p in third.projects] == ['Song']
+    assert cache.conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0] == 2
+    cache.close()
+    
+    monkeypatch.setattr(ableton_project_analyzer, 'PARSER_VERSION', 'next')
+    reopened = ProjectCache(str(tmp_path / 'cache'))
+    assert reopened.conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0] == 0
+    reopened.close()
+
+
+def test_cache_keeps_entries_of_unavailable_root_and_unlistable_folders(tmp_path, monkeypatch, capsys):
+    projects_dir = tmp_path / 'projects'
+    for index in range(5):
+        folder = projects_dir / ('Locked' if index < 2 else 'Open')
+        folder.mkdir(parents=True, exist_ok=True)
+        write_project(folder / f'Song {index}.als', LIVE_SET, 'gzip')
+    cache = ProjectCache(str(tmp_path / 'cache'))
+    AbletonProjectAnalyzer(str(projects_dir), cache=cache).analyze_projects(quiet=True, max_workers=2)
+    rows = lambda: cache.conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
+    assert rows() == 5
+    
+    # Freigabe nicht eingehängt: kein Eintrag darf verschwinden
+    projects_dir.rename(tmp_path / 'moved')
+    AbletonProjectAnalyzer(str(projects_dir), cache=cache).analyze_projects(quiet=True, max_workers=2)
+    assert rows() == 5
+    assert 'could not be listed' in capsys.readouterr().out
+    (tmp_path / 'moved').rename(projects_dir)
+    
+    # Ein Ordner ist nicht lesbar, ein Set wurde wirklich gelöscht
+    (projects_dir / 'Open' / 'Song 4.als').unlink()
+    scandir = os.scandir
+    
+    def failing_scandir(path):
+        if os.path.basename(path) == 'Locked':
+            raise PermissionError(path)
+        return scandir(path)
+    
+    monkeypatch.setattr(ableton_project_analyzer.os, 'scandir', failing_scandir)
+    analyzer = AbletonProjectAnalyzer(str(projects_dir), cache=cache)
+    analyzer.analyze_projects(quiet=True, max_workers=2)
+    assert len(analyzer.projects) == 2
+    assert sorted(Path(row[0]).name for row in cache.conn.execute("SELECT path FROM projects")) == [
+        'Song 0.als', 'Song 1.als', 'Song 2.als', 'Song 3.als']
+    cache.close()
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_cache_hash_belongs_to_the_parsed_bytes(tmp_path, monkeypatch, executor):
+    projects_dir = tmp_path / 'projects'
+    projects_dir.mkdir()
+    song = write_project(projects_dir / 'Song.als', LIVE_SET, 'xml')
+    resaved = LIVE_SET.replace('Serum', 'Sirum')
+    
+    cache = ProjectCache(str(tmp_path / 'cache'), use_hash=True)
+    # Das Set wird zwischen Lesen und Speichern im Cache neu gespeichert (gleiche Größe)
+    original_store = ProjectCache.store
+    
+    def store_after_resave(self, project_file, stat, project, content_hash=None):
+        write_project(project_file, resaved, 'xml')
+        os.utime(project_file, ns=(stat.st_mtime_ns + 10 ** 9, stat.st_mtime_ns + 10 ** 9))
+        original_store(self, project_file, stat, project, content_hash)
+    
+    monkeypatch.setattr(ProjectCache, 'store', store_after_resave)
+    first = AbletonProjectAnalyzer(str(projects_dir), cache=cache)
+    first.analyze_projects(quiet=True, max_workers=2, executor=executor)
+    assert 'Serum' in str(list(first.expanded_projects()))
+    monkeypatch.setattr(ProjectCache, 'store', original_store)
+    
+    # Neuer Zeitstempel, anderer Inhalt: der Hash des alten Parse-Ergebnisses darf nicht passen
+    second = AbletonProjectAnalyzer(str(projects_dir), cache=cache)
+    second.analyze_projects(quiet=True, max_workers=2, executor=executor)
+    names = {vst['name'] for vst in next(second.expanded_projects())['vsts']}
+    assert 'Sirum' in names and 'Serum' not in names
+    assert song.read_text(encoding='utf-8') == resaved
+    cache.close()
+
+
+def test_dedup_parses_identical_copies_once(tmp_path, monkeypatch):
+    (tmp_path / 'Song' / 'Backup').mkdir(parents=True)
+    original = write_project(tmp_path / 'Song' / 'Song.als', LIVE_SET, 'gzip')
+    backup = tmp_path / 'Song' / 'Backup' / 'Song [2024-01-01 120000].als'
+    backup.write_bytes(original.read_bytes())
+    write_project(tmp_path / 'Other.als', LIVE_SET.replace('Drums', 'Beats'), 'gzip')
+    
+    parsed = []
+    extract = AbletonProjectAnalyzer.extract_project_info
+    monkeypatch.setattr(AbletonProjectAnalyzer, 'extract_project_info',
+                        lambda self, f: parsed.append(f.name) or extract(self, f))
+    
+    analyzer = AbletonProjectAnalyzer(str(tmp_path), dedup=True, count_mode='unique')
+    analyzer.analyze_projects(quiet=True, max_workers=2)
+    
+    assert sorted(parsed) == ['Other.als', 'Song.als']
+    projects = {project['path']: project for project in analyzer.projects}
+    assert len(projects) == 3
+    copy = projects[str(backup)]
+    assert copy['duplicate_of'] == str(original)
+    assert copy['name'] == backup.stem
+    assert copy['tracks'] == projects[str(original)]['tracks']
+    assert sum(1 for project in analyzer.projects if analyzer.is_counted(project)) == 2
+
+
+def test_dedup_cache_run_keeps_the_entries_of_identical_copies(tmp_path, monkeypatch):
+    projects_dir = tmp_path / 'projects'
+    (projects_dir / 'Song' / 'Backup').mkdir(parents=True)
+    original = write_project(projects_dir / 'Song' / 'Song.als', LIVE_SET, 'gzip')
+    backup = projects_dir / 'Song' / 'Backup' / 'Song [old].als'
+    backup.write_bytes(original.read_bytes())
+    
+    cache = ProjectCache(str(tmp_path / 'cache'))
+    AbletonProjectAnalyzer(str(projects_dir), cache=cache, dedup=True).analyze_projects(quiet=True, max_workers=2)
+    hashed = {row[0] for row in cache.conn.execute("SELECT path FROM hashes")}
+    assert hashed == {str(original), str(backup)}
+    
+    # Die Kopie wird nie geparst, gehört aber trotzdem zu den vorhandenen Dateien: ihr Hash bleibt erhalten
+    hashes = []
+    monkeypatch.setattr(ableton_project_analyzer, 'file_content_hash',
+                        lambda path: hashes.append(path) or 'unexpected')
+    again = AbletonProjectAnalyzer(str(projects_dir), cache=cache, dedup=True)
+    again.analyze_projects(quiet=True, max_workers=2)
+    assert hashes == []
+    assert {row[0] for row in cache.conn.execute("SELECT path FROM hashes")} == hashed
+    assert len(again.projects) == 2
+    cache.close()
+
+
+def test_scanner_streams_projects_and_honours_excludes(tmp_path):
+    for relative in ('A/Song.als', 'A/Backup/Song [old].als', 'B/Samples/x.als', 'B/Live.als',
+                     'B/Ableton Project Info/y.als', 'notes.txt'):
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'<Ableton/>')
+    
+    found = ProjectScanner(tmp_path, exclude=['Backup', 'B/Samples', 'Ableton Project Info']).scan()
+    assert sorted(p.relative_to(tmp_path).as_posix() for p in found) == ['A/Song.als', 'B/Live.als']
+    
+    analyzer = AbletonProjectAnalyzer(str(tmp_path))
+    assert analyzer.find_ableton_projects() == sorted(tmp_path.rglob('*.als'))
+
+
+def test_work_queue_hands_out_largest_files_first_in_adaptive_chunks():
+    work = WorkQueue(workers=2)
+    sizes = {'huge.als': 800, 'big.als': 400}
+    sizes.update({f'small{i}.als': 10 for i in range(20)})
+    for name, size in sizes.items():
+        work.put(Path(name), size)
+    work.close()
+    
+    chunks = []
+    while True:
+        chunk = work.get_chunk()
+        if chunk is None:
+            break
+        chunks.append([p.name for p in chunk])
+    
+    assert chunks[0] == ['huge.als']
+    assert chunks[1] == ['big.als']
+    assert len(chunks[2]) > 1
+    assert [len(chunk) for chunk in chunks[2:]] == sorted((len(chunk) for chunk in chunks[2:]), reverse=True)
+    assert sorted(name for chunk in chunks for name in chunk) == sorted(sizes)
+
+
+@pytest.mark.parametrize('fmt', ['gzip', 'zip', 'xml'])
+def test_lxml_backend_matches_etree_backend(tmp_path, fmt):
+    pytest.importorskip('lxml')
+    project_file = write_project(tmp_path / 'Song.als', LIVE_SET, fmt)
+    
+    lxml_result = AbletonProjectAnalyzer(str(tmp_path), parser='lxml').extract_project_info(project_file)
+    etree_result = AbletonProjectAnalyzer(str(tmp_path), parser='etree').extract_project_info(project_file)
+    assert lxml_result is not None
+    assert lxml_result == etree_result
+
+
+def test_plugins_are_interned_once_and_resolved_for_export(tmp_path):
+    for i in range(3):
+        write_project(tmp_path / f'Song{i}.als', LIVE_SET, 'gzip')
+    analyzer = AbletonProjectAnalyzer(str(tmp_path))
+    analyzer.analyze_projects(quiet=True, max_workers=2)
+    
+    expected = legacy_parse(ET.fromstring(LIVE_SET.encode('utf-8')), tmp_path / 'Song0.als')
+    distinct = {tuple(sorted(vst.items())) for vst in expected['vsts']}
+    assert len(analyzer.plugins) == len(distinct)
+    
+    project = next(p for p in analyzer.projects if p['name'] == 'Song0')
+    assert all(isinstance(plugin_id, int) for plugin_id in project['vsts'])
+    assert analyzer.expand_project(project) == expected
+    
+    json_file = tmp_path / 'out.json'
+    analyzer.export_to_json(str(json_file))
+    exported = json.loads(json_file.read_text(encoding='utf-8'))
+    assert sorted(exported['projects'], key=lambda p: p['name'])[0] == expected
+
+
+def test_manufacturer_rules_keep_priority_order_and_memoize(tmp_path):
+    resolver = ManufacturerResolver([
+        {'contains': 'Serum', 'manufacturer': 'Xfer Records'},
+        {'contains': 'Massive', 'manufacturer': 'Native Instruments'},
+        {'prefix': 'FF ', 'manufacturer': 'FabFilter'},
+        {'regex': r'^Valhalla\w+', 'manufacturer': 'Valhalla DSP'},
+        {'contains': 'soundtoys', 'ignore_case': True, 'manufacturer': 'Soundtoys'},
+    ], default='Unbekannt')
+    
+    assert resolver.resolve('Massive Serum Bundle.dll') == 'Xfer Records'
+    assert resolver.resolve('FF Pro-Q 3.vst3') == 'FabFilter'
+    assert resolver.resolve('My FF Pro-Q 3.vst3') == 'Unbekannt'
+    assert resolver.resolve('ValhallaRoom_x64.dll') == 'Valhalla DSP'
+    assert resolver.resolve('SoundToys EchoBoy.dll') == 'Soundtoys'
+    resolver.resolve('FF Pro-Q 3.vst3')
+    assert resolver.resolve.cache_info().hits == 1
+    
+    rules_file = tmp_path / 'rules.json'
+    rules_file.write_text(json.dumps({'rules': [{'contains': 'Mystery', 'manufacturer': 'Acme'}]}))
+    project_file = write_project(tmp_path / 'Song.als', LIVE_SET, 'gzip')
+    analyzer = AbletonProjectAnalyzer(str(tmp_path), manufacturer_rules=str(rules_file))
+    project = analyzer.extract_project_info(project_file)
+    assert {v['name']: v['manufacturer'] for v in project['vsts']}['Mystery'] == 'Acme'
+    assert analyzer.result_version() != AbletonProjectAnalyzer(str(tmp_path)).result_version()
+
+
+def test_manufacturer_regex_rules_with_inline_flags_and_backreferences(tmp_path):
+    resolver = ManufacturerResolver([
+        {'regex': r'(\w)\1-Verb', 'manufacturer': 'Double'},
+        {'contains': 'Echo', 'manufacturer': 'Echo Audio'},
+        {'regex': '(?i)serum', 'manufacturer': 'Xfer Records'},
+        {'regex': r'Ser(um)\1', 'manufacturer': 'Never reached'},
+        {'regex': r'(?P<series>Pro)-(?P=series)', 'manufacturer': 'Named'},
+    ])
+    assert resolver.resolve('SERUM_x64.dll') == 'Xfer Records'
+    assert resolver.resolve('Echo oo-Verb.dll') == 'Double'
+    assert resolver.resolve('Echo Serum.dll') == 'Echo Audio'
+    assert resolver.resolve('Serumum.dll') == 'Xfer Records'
+    assert resolver.resolve('Pro-Pro.dll') == 'Named'
+    assert resolver.resolve('ab-Verb.dll') == 'Unbekannt'
+    
+    with pytest.raises(ValueError, match=r"rule 1: invalid regex '\(unclosed'"):
+        ManufacturerResolver([{'contains': 'Ok', 'manufacturer': 'Ok'},
+                              {'regex': '(unclosed', 'manufacturer': 'Broken'}])
+    rules_file = tmp_path / 'rules.json'
+    rules_file.write_text(json.dumps({'rules': [{'regex': '(?i)mystery', 'manufacturer': 'Acme'}]}))
+    project = AbletonProjectAnalyzer(str(tmp_path), manufacturer_rules=str(rules_file)).extract_project_info(
+        write_project(tmp_path / 'Song.als', LIVE_SET, 'gzip'))
+    assert {v['name']: v['manufacturer'] for v in project['vsts']}['Mystery'] == 'Acme'
+
+
+def test_excel_export_streams_rows_with_computed_widths(tmp_path, monkeypatch):
+    monkeypatch.setattr(StreamingSheet, 'BLOCK_SIZE', 2)
+    for index in range(3):
+        write_project(tmp_path / f'Song {index}.als', LIVE_SET, 'gzip')
+    analyzer = AbletonProjectAnalyzer(str(tmp_path))
+    analyzer.analyze_projects(quiet=True, max_workers=1)
+    
+    excel_file = tmp_path / 'out.xlsx'
+    analyzer.export_to_excel(str(excel_file))
+    wb = openpyxl.load_workbook(excel_file)
+    assert wb.sheetnames == ['Project Overview', 'VST Overview', 'Track Details', 'VST Requirements', 'Statistics']
+    
+    overview = wb['Project Overview']
+    assert [cell.value for cell in overview[1]][:3] == ['Project', 'Path', 'Tracks']
+    assert overview['A1'].font.b and overview['A1'].fill.fgColor.rgb.endswith('366092')
+    assert sorted(row[0] for row in overview.iter_rows(min_row=2, values_only=True)) == ['Song 0', 'Song 1', 'Song 2']
+    longest_path = max(len(str(tmp_path / f'Song {index}.als')) for index in range(3))
+    assert overview.column_dimensions['B'].width == min(longest_path + 2, 50)
+    assert overview.column_dimensions['C'].width == len('Tracks') + 2
+    
+    statistics = wb['Statistics']
+    assert statistics['A3'].value == 'Total Projects' and statistics['B3'].value == 3
+    assert statistics['A3'].font.b and not statistics['B3'].font.b
+    assert statistics['A9'].value == 'VST MANUFACTURER STATISTICS'
+
+
+def test_inventory_index_is_built_once_and_shared_by_all_exporters(tmp_path, monkeypatch):
+    for main_dir in ('Album', 'Album', 'Live'):
+        (tmp_path / main_dir).mkdir(exist_ok=True)
+    write_project(tmp_path / 'Album' / 'One.als', LIVE_SET, 'gzip')
+    write_project(tmp_path / 'Album' / 'Two.als', LIVE_SET, 'zip')
+    write_project(tmp_path / 'Live' / 'Three.als', LIVE_SET, 'xml')
+    analyzer = AbletonProjectAnalyzer(str(tmp_path))
+    analyzer.analyze_projects(quiet=True, max_workers=1)
+    
+    builds = []
+    freeze = InventoryAccumulator.freeze
+    monkeypatch.setattr(InventoryAccumulator, 'freeze', lambda self: builds.append(1) or freeze(self))
+    monkeypatch.chdir(tmp_path)
+    analyzer.print_summary()
+    analyzer.export_to_json('out.json')
+    analyzer.export_vst_lists_recursive('vst_lists')
+    analyzer.export_to_excel('out.xlsx')
+    assert len(builds) == 1
+    
+    index = analyzer.inventory()
+    assert index.total_projects == 3
+    assert sorted((group.name, len(group.projects)) for group in index.main_dirs) == [('Album', 2), ('Live', 1)]
+    assert list(index.all_plugin_keys) == sorted(analyzer.all_vsts)
+    usage_counts = [usage.usage_count for usage in index.plugins]
+    assert usage_counts == sorted(usage_counts, reverse=True)
+    assert all(usage.projects == ('One', 'Three', 'Two') for usage in index.plugins)
+    assert all(usage.main_dirs == ('Album', 'Live') for usage in index.plugins)
+    assert sum(stats.usage_count for stats in index.manufacturers) == index.total_plugin_uses
+    
+    analyzer.add_projects([analyzer.expand_project(analyzer.projects[0])])
+    assert analyzer.inventory().total_projects == 4 and len(builds) == 2
+
+
+def test_stream_writers_emit_projects_during_analysis(tmp_path):
+    projects_dir = tmp_path / 'projects'
+    projects_dir.mkdir()
+    for index in range(3):
+        write_project(projects_dir / f'Song {index}.als', LIVE_SET, 'gzip')
+    analyzer = AbletonProjectAnalyzer(str(projects_dir))
+    analyzer.stream_writers = [ProjectStreamWriter(str(tmp_path / 'out.ndjson'), analyzer.project_path, 'ndjson'),
+                               ProjectStreamWriter(str(tmp_path / 'stream.json'), analyzer.project_path, 'json')]
+    analyzer.analyze_projects(quiet=True, max_workers=2)
+    
+    # Vor dem Trailer liegen bereits alle Projekte auf der Platte
+    partial = (tmp_path / 'out.ndjson').read_text(encoding='utf-8').splitlines()
+    assert sorted(json.loads(line)['name'] for line in partial) == ['Song 0', 'Song 1', 'Song 2']
+    
+    analyzer.finish_stream_writers()
+    lines = [json.loads(line) for line in (tmp_path / 'out.ndjson').read_text(encoding='utf-8').splitlines()]
+    trailer = lines.pop()
+    assert trailer['type'] == 'summary' and trailer['projects'] == 3
+    assert trailer['all_vsts'] == sorted(analyzer.all_vsts)
+    
+    analyzer.export_to_json(str(tmp_path / 'regular.json'))
+    streamed = json.loads((tmp_path / 'stream.json').read_text(encoding='utf-8'))
+    regular = json.loads((tmp_path / 'regular.json').read_text(encoding='utf-8'))
+    for data in (streamed, regular):
+        data.pop('timestamp')
+        data['projects'].sort(key=lambda project: project['name'])
+    assert streamed == regular
+    assert sorted(lines, key=lambda project: project['name']) == regular['projects']
+
+
+def test_columnar_statistics_match_inventory_index(tmp_path):
+    (tmp_path / 'Album').mkdir()
+    (tmp_path / 'Live').mkdir()
+    write_project(tmp_path / 'Album' / 'One.als', LIVE_SET, 'gzip')
+    write_project(tmp_path / 'Album' / 'Two.als', LIVE_SET.replace('Serum', 'Serum 2'), 'zip')
+    write_project(tmp_path / 'Live' / 'Three.als', LIVE_SET, 'xml')
+    analyzer = AbletonProjectAnalyzer(str(tmp_path))
+    analyzer.analyze_projects(quiet=True, max_workers=1)
+    # Tabellen und Statistik entstehen direkt aus den Projekten, ohne die Aggregation zu durchlaufen
+    inventory = analyzer.inventory
+    analyzer.inventory = lambda: pytest.fail('columnar statistics must not need the inventory index')
+    columnar = ColumnarInventory.from_analyzer(analyzer)
+    requirements = columnar.vst_requirements()
+    manufacturers = columnar.manufacturer_statistics()
+    statistics = columnar.statistics().iloc[0]
+    analyzer.inventory = inventory
+    index = analyzer.inventory()
+    
+    assert list(columnar.projects['name']) == ['One', 'Two', 'Three']
+    ordered = sorted(analyzer.projects, key=lambda project: project['path'])
+    assert list(columnar.plugin_occurrences['plugin_id']) == [i for project in ordered for i in project['vsts']]
+    assert list(columnar.tracks['track_index']) == [i for project in ordered for i in range(len(project['tracks']))]
+    assert len(columnar.projects) == 3
+    assert len(columnar.tracks) == sum(len(project['tracks']) for project in analyzer.projects)
+    assert len(columnar.plugin_occurrences) == sum(len(project['vsts']) for project in analyzer.projects)
+    
+    assert list(requirements['rank']) == list(range(1, len(index.plugins) + 1))
+    assert [tuple(row) for row in requirements[['key', 'manufacturer', 'name', 'filename', 'version', 'usage_count']]
+            .itertuples(index=False)] == [usage[:6] for usage in index.plugins]
+    assert list(requirements['projects']) == [', '.join(usage.projects) for usage in index.plugins]
+    assert list(requirements['main_dirs']) == [', '.join(usage.main_dirs) for usage in index.plugins]
+    assert [tuple(row) for row in manufacturers.itertuples(index=False)] == \
+        [tuple(stats) for stats in index.manufacturers]
+    assert (statistics['total_projects'], statistics['different_vsts'], statistics['total_tracks']) == \
+        (index.total_projects, len(index.all_plugin_keys), index.total_tracks)
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'arrow'])
+def test_columnar_export_writes_readable_tables(tmp_path, fmt):
+    pytest.importorskip('pyarrow')
+    write_project(tmp_path / 'Song.als', LIVE_SET, 'gzip')
+    analyzer = AbletonProjectAnalyzer(str(tmp_path))
+    analyzer.analyze_projects(quiet=True, max_workers=1)
+    analyzer.export_columnar(str(tmp_path / 'tables'), fmt)
+    
+    read = pd.read_parquet if fmt == 'parquet' else pd.read_feather
+    projects = read(tmp_path / 'tables' / f'projects.{fmt}')
+    occurrences = read(tmp_path / 'tables' / f'plugin_occurrences.{fmt}')
+    assert list(projects['name']) == ['Song']
+    assert len(occurrences) == len(analyzer.projects[0]['vsts'])
+    assert len(read(tmp_path / 'tables' / f'vst_requirements.{fmt}')) == len(analyzer.inventory().plugins)
+
+
+def test_txt_export_only_rewrites_changed_files(tmp_path, monkeypatch, capsys):
+    projects_dir = tmp_path / 'projects'
+    (projects_dir / 'Album').mkdir(parents=True)
+    for name in ('One', 'Two', 'Three'):
+        write_project(projects_dir / 'Album' / f'{name}.als', LIVE_SET, 'gzip')
+    monkeypatch.chdir(tmp_path)
+    
+    def export():
+        analyzer = AbletonProjectAnalyzer(str(projects_dir))
+        analyzer.analyze_projects(quiet=True, max_workers=2)
+        capsys.readouterr()
+        analyzer.export_vst_lists_recursive('vst_lists', max_workers=4)
+        return capsys.readouterr().out
+    
+    output = export()
+    assert 'Total 5 files written, 0 unchanged' in output
+    one_file = tmp_path / 'vst_lists' / 'Album' / 'One_VSTs.txt'
+    one_file.write_text(re.sub(r'Created: .*', 'Created: 1999-01-01 00:00:00', one_file.read_text(encoding='utf-8')),
+                        encoding='utf-8')
+    first_written = one_file.read_text(encoding='utf-8')
+    
+    # Nur der Zeitstempel unterscheidet sich -> Datei bleibt unangetastet
+    output = export()
+    assert 'Total 0 files written, 5 unchanged' in output
+    assert 'VST list created' not in output
+    
+    write_project(projects_dir / 'Album' / 'Two.als', LIVE_SET.replace('Serum', 'Serum 2'), 'gzip')
+    output = export()
+    assert 'Album (3 projects) - 1 VST lists written, 2 unchanged' in output
+    assert 'Total 3 files written, 2 unchanged' in output
+    assert one_file.read_text(encoding='utf-8') == first_written
+
+
+def test_synthetic_corpus_is_deterministic_and_parses_as_generated(tmp_path):
+    spec = generate_corpus.CorpusSpec(projects=9, main_dirs=2, tracks=(1, 6), devices=(0, 3),
+                                      rack_probability=0.3, target_kb=20, seed=7)
+    manifest = generate_corpus.generate_corpus(str(tmp_path / 'a'), spec)
+    generate_corpus.generate_corpus(str(tmp_path / 'b'), spec)
+    for entry in manifest['projects']:
+        assert (tmp_path / 'a' / entry['path']).read_bytes() == (tmp_path / 'b' / entry['path']).read_bytes()
+    assert {entry['format'] for entry in manifest['projects']} == {'zip', 'gzip', 'xml'}
+    assert all(entry['xml_bytes'] >= 20 * 1024 for entry in manifest['projects'])
+    
+    analyzer = AbletonProjectAnalyzer(str(tmp_path / 'a'))
+    for entry in manifest['projects']:
+        project = analyzer.extract_project_info(tmp_path / 'a' / entry['path'])
+        # Generierte Tracks + Master
+        assert len(project['tracks']) == entry['tracks'] + 1
+        assert project['scenes'] == entry['scenes']
+        assert sorted({vst['name'] for vst in project['vsts']}) == entry['plugins']
+
+
+def test_stage_benchmark_flags_regressions_against_baseline(capsys):
+    baseline = {'parse': {'items': 100, 'bytes': 0, 'seconds': 1.0},
+                'export_json': {'items': 100, 'bytes': 0, 'seconds': 1.0}}
+    current = {'parse': {'items': 100, 'bytes': 0, 'seconds': 2.0},
+               'export_json': {'items': 100, 'bytes': 0, 'seconds': 1.1}}
+    assert benchmark_analyzer.print_stages(current, baseline, tolerance=0.2) == ['parse']
+    assert 'REGRESSION' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_profiler_reports_file_stages_and_failure_categories(tmp_path, executor):
+    for index, fmt in enumerate(('zip', 'gzip', 'xml')):
+        write_project(tmp_path / f'Song {index}.als', LIVE_SET, fmt)
+    (tmp_path / 'Broken.als').write_bytes(b'junk data')
+    (tmp_path / 'Cut.als').write_bytes(gzip.compress(LIVE_SET.encode('utf-8'))[:60])
+    profiler = Profiler(top=2)
+    analyzer = AbletonProjectAnalyzer(str(tmp_path), profiler=profiler)
+    analyzer.analyze_projects(quiet=True, max_workers=2, executor=executor)
+    
+    profiler.write_report(str(tmp_path / 'profile.json'), {'executor': executor})
+    report = json.loads((tmp_path / 'profile.json').read_text(encoding='utf-8'))
+    assert report['run']['files'] == 5 and report['run']['failed'] == 2
+    assert sum(bucket['count'] for bucket in report['histograms']['total']) == 5
+    assert len(report['slowest_files']) == 2
+    assert set(report['failures']) == {'unknown_format', 'truncated'}
+    assert report['failures']['unknown_format']['files'][0]['path'].endswith('Broken.als')
+    assert report['bytes']['decompressed'] > report['bytes']['read']
+    assert {'discovery', 'collect'} <= set(report['stages'])
+    
+    # Mit --cache-hash liest der Hash-Pfad jede Datei ganz, auch diese Zeit und Bytes zählen
+    hashed = Profiler()
+    cache = ProjectCache(str(tmp_path / 'cache'), use_hash=True)
+    AbletonProjectAnalyzer(str(tmp_path), profiler=hashed, cache=cache).analyze_projects(
+        quiet=True, max_workers=2, executor=executor)
+    cache.close()
+    assert hashed.bytes_read == sum(project_file.stat().st_size for project_file in tmp_path.glob('*.als'))
+    assert hashed.file_seconds['io'] > 0
+
+
+def test_incomplete_watcher_fails_when_created():
+    class Incomplete(ableton_project_analyzer.ProjectWatcher):
+        description = 'incomplete'
+    
+    with pytest.raises(TypeError, match='read_events'):
+        Incomplete()
+
+
+@pytest.mark.parametrize('backend', ['inotify', 'polling'])
+def test_watch_changes_update_inventory_like_a_fresh_run(tmp_path, backend):
+    root = tmp_path / 'projects'
+    for main_dir in ('Album', 'Live'):
+        (root / main_dir).mkdir(parents=True)
+    write_project(root / 'Album' / 'One.als', LIVE_SET, 'gzip')
+    write_project(root / 'Album' / 'Two.als', LIVE_SET, 'zip')
+    write_project(root / 'Live' / 'Three.als', LIVE_SET, 'xml')
+    if backend == 'inotify':
+        try:
+            watcher = InotifyWatcher(root)
+        except (OSError, AttributeError):
+            pytest.skip('inotify not available')
+    else:
+        watcher = PollingWatcher(root, interval=0.05)
+    analyzer = AbletonProjectAnalyzer(str(root))
+    analyzer.analyze_projects(quiet=True, max_workers=2)
+    analyzer.inventory()
+    
+    # Burst: geändert, gelöscht, neuer Ordner mit neuem Set
+    write_project(root / 'Album' / 'Two.als', LIVE_SET.replace('Serum', 'Serum 2'), 'zip')
+    (root / 'Live' / 'Three.als').unlink()
+    (root / 'Demos').mkdir()
+    write_project(root / 'Demos' / 'Four.als', LIVE_SET, 'gzip')
+    try:
+        paths = set()
+        # Das neue Set kommt je nach Zeitpunkt als Datei oder über seinen neuen Ordner
+        while not ({'Two.als', 'Three.als'} <= {path.name for path in paths}
+                   and {'Four.als', 'Demos'} & {path.name for path in paths}):
+            more = watcher.changes(debounce=0.2, timeout=5)
+            assert more, f"missing events, got {sorted(map(str, paths))}"
+            paths |= more
+    finally:
+        watcher.close()
+    
+    parsed = []
+    extract = analyzer.extract_project_info
+    analyzer.extract_project_info = lambda project_file: parsed.append(project_file.name) or extract(project_file)
+    updated, removed = analyzer.apply_changes(paths)
+    assert sorted(parsed) == ['Four.als', 'Two.als']
+    assert sorted(project['name'] for project in updated) == ['Four', 'Two']
+    assert [project['name'] for project in removed] == ['Three']
+    
+    fresh = AbletonProjectAnalyzer(str(root))
+    fresh.analyze_projects(quiet=True, max_workers=2)
+    expected = fresh.inventory()
+    index = analyzer.inventory()
+    assert [project['path'] for project, _ in index.entries] == [project['path'] for project, _ in expected.entries]
+    assert [(group.name, group.counted_projects, group.plugin_keys) for group in index.main_dirs] == \
+        [(group.name, group.counted_projects, group.plugin_keys) for group in expected.main_dirs]
+    assert sorted(index.plugins) == sorted(expected.plugins)
+    assert sorted(index.manufacturers) == sorted(expected.manufacturers)
+    assert index.all_plugin_keys == expected.all_plugin_keys and analyzer.all_vsts == fresh.all_vsts
+    assert index[5:] == expected[5:]
+
+
+def test_watch_dedup_regroups_copies_of_changed_originals(tmp_path):
+    root = tmp_path / 'projects'
+    for main_dir in ('A', 'B', 'C'):
+        (root / main_dir).mkdir(parents=True)
+    original = write_project(root / 'A' / 'Song.als', LIVE_SET, 'gzip')
+    copy = root / 'B' / 'Song.als'
+    copy.write_bytes(original.read_bytes())
+    other = root / 'C' / 'Song.als'
+    other.write_bytes(original.read_bytes())
+    analyzer = AbletonProjectAnalyzer(str(root), dedup=True, count_mode='unique')
+    analyzer.analyze_projects(quiet=True, max_workers=2)
+    assert analyzer.inventory().total_projects == 1
+    
+    # Original geändert: die Kopien sind untereinander weiter identisch, aber kein Duplikat von A mehr
+    write_project(original, LIVE_SET.replace('Serum', 'Serum 2'), 'gzip')
+    updated, removed = analyzer.apply_changes({original})
+    assert sorted(project['path'] for project in updated) == sorted(map(str, (original, copy, other)))
+    assert removed == []
+    
+    def assert_like_fresh_run():
+        fresh = AbletonProjectAnalyzer(str(root), dedup=True, count_mode='unique')
+        fresh.analyze_projects(quiet=True, max_workers=2)
+        projects = {project['path']: project for project in analyzer.expanded_projects()}
+        expected = {project['path']: project for project in fresh.expanded_projects()}
+        assert projects == expected
+        assert analyzer.inventory()[5:] == fresh.inventory()[5:]
+    
+    assert_like_fresh_run()
+    assert analyzer.inventory().total_projects == 2
+    assert next(p for p in analyzer.projects if p['path'] == str(other))['duplicate_of'] == str(copy)
+    
+    # Neues Original B gelöscht: C wird selbst zum Original
+    copy.unlink()
+    updated, removed = analyzer.apply_changes({copy})
+    assert [project['path'] for project in removed] == [str(copy)]
+    assert_like_fresh_run()
+
+
+def test_inventory_database_answers_plugin_queries(tmp_path, capsys):
+    (tmp_path / 'Album').mkdir()
+    (tmp_path / 'Live').mkdir()
+    write_project(tmp_path / 'Album' / 'One.als', LIVE_SET, 'gzip')
+    write_project(tmp_path / 'Album' / 'Two.als', LIVE_SET.replace('Serum', 'Serum 2'), 'zip')
+    write_project(tmp_path / 'Live' / 'Three.als', LIVE_SET, 'xml')
+    analyzer = AbletonProjectAnalyzer(str(tmp_path))
+    db_file = str(tmp_path / 'inventory.sqlite')
+    analyzer.stream_writers = [InventoryDatabase(db_file, analyzer.project_path, analyzer.plugins,
+                                                 analyzer.main_dir_of)]
+    analyzer.analyze_projects(quiet=True, max_workers=2)
+    analyzer.finish_stream_writers()
+    query = ableton_project_analyzer.query_inventory_db
+    
+    index = analyzer.inventory()
+    for usage in index.plugins:
+        rows = query(db_file, plugin=usage.name, manufacturer=usage.manufacturer)
+        # Teilstring-Suche: 'Serum' findet auch 'Serum 2'
+        assert {row['project'] for row in rows if row['name'] == usage.name} == set(usage.projects)
+    
+    assert {row['project'] for row in query(db_file, plugin='serum 2')} == {'Two'}
+    assert {row['project'] for row in query(db_file, plugin='Serum', version='2400', main_dir='live')} == {'Three'}
+    assert query(db_file, plugin='Serum', version='9999') == []
+    rows = query(db_file, manufacturer='fabfilter', track_type='audio')
+    assert {(row['project'], row['track']) for row in rows} == {('One', 'Drums'), ('Two', 'Drums'), ('Three', 'Drums')}
+    
+    ableton_project_analyzer.query_main([db_file, '--plugin', 'Serum 2', '--tracks'])
+    output = capsys.readouterr().out
+    assert 'Two.als  [Album]' in output and '1. [Audio] Drums: Xfer Records - Serum 2' in output
+    assert '1 project(s), 2 match(es)' in output
+
+
+def test_prefetch_pipeline_respects_buffer_cap_and_matches_direct_reads(tmp_path):
+    for index in range(12):
+        write_project(tmp_path / f'Song {index}.als', LIVE_SET, ('zip', 'gzip', 'xml')[index % 3])
+    (tmp_path / 'Broken.als').write_bytes(b'junk data')
+    direct = AbletonProjectAnalyzer(str(tmp_path))
+    direct.analyze_projects(quiet=True, max_workers=2)
+    
+    largest = max(path.stat().st_size for path in tmp_path.glob('*.als'))
+    analyzer = AbletonProjectAnalyzer(str(tmp_path))
+    analyzer.analyze_projects(quiet=True, max_workers=2, io_workers=3, prefetch_mb=0)
+    stats = analyzer.prefetch_stats
+    assert stats['files'] == 13 and stats['read_errors'] == 0
+    # Limit 0: jede Datei wartet, bis der Puffer leer ist
+    assert stats['peak_bytes'] <= largest
+    
+    def by_path(run):
+        return sorted(run.expanded_projects(), key=lambda project: project['path'])
+    assert by_path(analyzer) == by_path(direct)
+
+
+def test_shards_partition_the_archive_and_merge_like_a_full_run(tmp_path, capsys):
+    root = tmp_path / 'projects'
+    for index in range(24):
+        main_dir = root / f'Dir {index % 3}'
+        main_dir.mkdir(parents=True, exist_ok=True)
+        write_project(main_dir / f'Song {index}.als', LIVE_SET.replace('Serum', f'Serum {index % 5}'),
+                      ('zip', 'gzip', 'xml')[index % 3])
+    full = AbletonProjectAnalyzer(str(root))
+    full.analyze_projects(quiet=True, max_workers=2)
+    full.export_to_json(str(tmp_path / 'full.json'))
+    
+    parts = []
+    shard_paths = []
+    for index in (1, 2, 3):
+        node = AbletonProjectAnalyzer(str(root), shard=(index, 3))
+        node.analyze_projects(quiet=True, max_workers=2)
+        shard_paths.append({project['path'] for project in node.projects})
+        parts.append(str(tmp_path / f'part{index}.json'))
+        node.export_to_json(parts[-1])
+    # Disjunkt, vollständig und bei jedem Lauf gleich
+    assert sum(map(len, shard_paths)) == 24 and set.union(*shard_paths) == {p['path'] for p in full.projects}
+    assert all(shard_paths)
+    assert ableton_project_analyzer.shard_of('Dir 0/Song 0.als', 3) == ableton_project_analyzer.shard_of('Dir 0/Song 0.als', 3)
+    
+    merged = ableton_project_analyzer.merge_partial_results(parts)
+    merged.export_to_json(str(tmp_path / 'merged.json'))
+    expected, actual = (json.loads((tmp_path / name).read_text(encoding='utf-8')) for name in ('full.json', 'merged.json'))
+    for data in (expected, actual):
+        data.pop('timestamp')
+        data['projects'].sort(key=lambda project: project['path'])
+    assert actual == expected
+    assert merged.inventory()[2:] == full.inventory()[2:]
+    
+    capsys.readouterr()
+    ableton_project_analyzer.merge_partial_results(parts[:2])
+    assert 'shard(s) 3 of 3 missing' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('fmt', ['gzip', 'zip', 'xml'])
+def test_plugins_only_scan_matches_full_parser(tmp_path, fmt):
+    escaped = ('<VstPluginInfo Id="9"><PlugName Id="1" Value="Bass &amp; Drums&#10;Bus"/>'
+               '<FileName Value="Tone\n&quot;Pro&quot;.dll"/></VstPluginInfo>'
+               '<VstPluginInfo Id="10"/><VstPluginInfoCache><PlugName Value="Ghost"/></VstPluginInfoCache>')
+    # Gleichnamige Elemente tiefer im Block (Preset) zählen wie bei Element.find() nicht
+    nested = ('<VstPluginInfo Id="11"><Preset><VstPreset><PlugName Value="Preset Name"/>'
+              '<Manufacturer Value="Preset Vendor"/></VstPreset></Preset><PlugName Value="Real"/>'
+              '<FileName Value="FabFilter Real.dll"><FileName Value="inner.dll"/></FileName></VstPluginInfo>'
+              '<VstPluginInfo Id="12"><PlugName Value="Twice"/><Preset><Preset><VstVersion Value="7"/></Preset>'
+              '<VstVersion Value="8"/></Preset><VstVersion/><VstVersion Value="9"/>'
+              '<Manufacturer Value="Outer &gt; Vendor"/></VstPluginInfo>')
+    live_set = LIVE_SET.replace('<Scenes>', f'<Extras>{nested}{escaped}</Extras><Scenes>')
+    project_file = write_project(tmp_path / 'Song.als', live_set, fmt)
+    full = AbletonProjectAnalyzer(str(tmp_path)).extract_project_info(project_file)
+    fast = AbletonProjectAnalyzer(str(tmp_path), mode='plugins-only').extract_project_info(project_file)
+    
+    assert fast['vsts'] == full['vsts'] and fast['scenes'] == full['scenes'] == 3
+    assert fast['vsts'][-1]['name'] == 'Bass & Drums\nBus' and fast['tracks'] == []
+    assert [vst for vst in fast['vsts'] if vst['name'] in ('Real', 'Twice')] == [
+        {'name': 'Real', 'filename': 'FabFilter Real.dll', 'version': '', 'manufacturer': 'FabFilter'},
+        {'name': 'Twice', 'filename': '', 'version': '', 'manufacturer': 'Outer > Vendor'}]
+    # Gleiche Plugins teilen sich wie beim vollen Parser ein Dict
+    assert len({id(vst) for vst in fast['vsts']}) == len({id(vst) for vst in full['vsts']})
+    # Blöcke und Szenen über beliebige Chunk-Grenzen hinweg
+    data = live_set.encode('utf-8')
+    expected = ableton_project_analyzer.scan_plugin_blocks(io.BytesIO(data))
+    for chunk_size in (1, 7, 15, 16, 17, 100):
+        assert ableton_project_analyzer.scan_plugin_blocks(io.BytesIO(data), chunk_size) == expected
+    
+    spec = generate_corpus.CorpusSpec(projects=6, tracks=(1, 6), devices=(0, 3), rack_probability=0.3, seed=3)
+    generate_corpus.generate_corpus(str(tmp_path / 'corpus'), spec, manifest=False)
+    analyzers = [AbletonProjectAnalyzer(str(tmp_path / 'corpus'), mode=mode) for mode in ('full', 'plugins-only')]
+    for analyzer in analyzers:
+        analyzer.analyze_projects(quiet=True, max_workers=2)
+    assert analyzers[0].all_vsts == analyzers[1].all_vsts
+    assert analyzers[0].inventory().plugins == analyzers[1].inventory().plugins
+    assert analyzers[0].result_version() != analyzers[1].result_version()
+
+
+def test_low_memory_run_streams_outputs_without_keeping_projects(tmp_path, monkeypatch):
+    root = tmp_path / 'projects'
+    for index in range(12):
+        # Gleichnamige Sets in Unterordnern landen in derselben TXT-Datei (der letzte Pfad gewinnt)
+        folder = root / f'Dir {index % 3}' / f'Sub {index // 3 % 2}'
+        folder.mkdir(parents=True, exist_ok=True)
+        xml = LIVE_SET.replace('Serum', f'Serum {index % 4}').replace('Ozone 9', f'Ozone {index % 5}')
+        write_project(folder / f'Song {index // 6}.als', xml, ('zip', 'gzip', 'xml')[index % 3])
+    full = AbletonProjectAnalyzer(str(root))
+    full.analyze_projects(quiet=True, max_workers=2)
+    monkeypatch.chdir(tmp_path)
+    full.export_to_json('full.json')
+    full.export_vst_lists_recursive('full_lists')
+    full.export_to_excel('full.xlsx')
+    
+    # Kleine Läufe, damit die Excel-Zeilen über mehrere sortierte Läufe zusammengeführt werden
+    monkeypatch.setattr(ableton_project_analyzer.StreamingSheet, 'SORT_RUN_SIZE', 5)
+    monkeypatch.setattr(ableton_project_analyzer.StreamingSheet, 'SORT_READ_SIZE', 2)
+    lean = AbletonProjectAnalyzer(str(root), retain_projects=False)
+    lean.stream_writers = [ProjectStreamWriter('lean.json', lean.project_path, 'json'),
+                           ableton_project_analyzer.VstListSink(lean, 'lean_lists'),
+                           ableton_project_analyzer.ExcelSink(lean, 'lean.xlsx')]
+    lean.analyze_projects(quiet=True, max_workers=2)
+    lean.finish_stream_writers()
+    assert lean.projects == [] and lean.analyzed == 12
+    assert lean.accumulator.entries == {}
+    
+    expected, actual = full.inventory(), lean.inventory()
+    assert [usage._replace(projects=tuple(usage.projects)) for usage in actual.plugins] == list(expected.plugins)
+    assert actual.main_dirs == tuple(group._replace(projects=()) for group in expected.main_dirs)
+    assert actual[3:] == expected[3:]
+    
+    streamed, regular = (json.loads(Path(name).read_text(encoding='utf-8')) for name in ('lean.json', 'full.json'))
+    for data in (streamed, regular):
+        data.pop('timestamp')
+        data['projects'].sort(key=lambda project: project['path'])
+    assert streamed == regular
+    for txt_file in Path('full_lists').rglob('*.txt'):
+        lean_file = Path('lean_lists') / txt_file.relative_to('full_lists')
+        strip = ableton_project_analyzer.ChangeAwareWriter.strip_timestamps
+        assert strip(lean_file.read_text(encoding='utf-8')) == strip(txt_file.read_text(encoding='utf-8'))
+    assert len(list(Path('lean_lists').rglob('*.txt'))) == len(list(Path('full_lists').rglob('*.txt')))
+    
+    for name in ('Project Overview', 'VST Overview', 'Track Details', 'VST Requirements', 'Statistics'):
+        sheets = [openpyxl.load_workbook(workbook)[name] for workbook in ('full.xlsx', 'lean.xlsx')]
+        rows = [list(sheet.iter_rows(values_only=True)) for sheet in sheets]
+        assert rows[0] == rows[1]
+    
+    spool = lean.accumulator.names
+    lean.accumulator.close()
+    assert lean.accumulator.names is None
+    with pytest.raises(sqlite3.ProgrammingError):
+        spool.connection.execute("SELECT 1")
+
+
+def sample_ref_xml(path='', relative='', name=None, hint=None, relative_type='3'):
+    """Live 10+ layout (Path/RelativePath values) or, with name, the older element-based layout"""
+    if name is None:
+        file_ref = (f'<RelativePathType Value="{relative_type}"/><RelativePath Value="{relative}"/>'
+                    f'<Path Value="{path}"/>')
+    else:
+        folders = ''.join(f'<RelativePathElement Dir="{folder}"/>' for folder in relative.split('/') if folder)
+        hints = ''.join(f'<RelativePathElement Dir="{folder}"/>' for folder in (hint or []))
+        file_ref = (f'<RelativePath>{folders}</RelativePath><Name Value="{name}"/>'
+                    f'<SearchHint><PathHint>{hints}</PathHint></SearchHint>')
+    original = '<SourceContext><OriginalFileRef><FileRef><Path Value="/old/original.wav"/></FileRef></OriginalFileRef></SourceContext>'
+    return f'<AudioClip><SampleRef><FileRef>{file_ref}</FileRef>{original}</SampleRef></AudioClip>'
+
+
+@pytest.mark.parametrize('parser', ['etree', 'lxml'])
+def test_missing_samples_are_found_with_one_listing_per_directory(tmp_path, monkeypatch, parser):
+    if parser == 'lxml' and ableton_project_analyzer.lxml_etree is None:
+        pytest.skip('lxml is not installed')
+    library = tmp_path / 'Library'
+    library.mkdir()
+    (library / 'pad.wav').write_bytes(b'')
+    clips = (sample_ref_xml(relative='Samples/Imported/kick.wav', path='/Volumes/Old/Song Project/Samples/Imported/kick.wav')
+             + sample_ref_xml(relative='Samples/Imported/snare.wav', path='/Volumes/Old/snare.wav')
+             + sample_ref_xml(path=str(library / 'pad.wav'))
+             + sample_ref_xml(relative='Samples/Recorded', name='vox.wav', hint=['Volumes', 'Old', 'vox'])
+             + sample_ref_xml(path=str(library / 'pad.wav')))
+    live_set = LIVE_SET.replace('<Scenes>', f'<Clips>{clips}</Clips><Scenes>')
+    for index in range(3):
+        project_dir = tmp_path / 'Projects' / f'Song {index} Project'
+        (project_dir / 'Samples' / 'Imported').mkdir(parents=True)
+        (project_dir / 'Samples' / 'Imported' / 'kick.wav').write_bytes(b'')
+        write_project(project_dir / f'Song {index}.als', live_set, ('zip', 'gzip', 'xml')[index])
+    
+    analyzer = AbletonProjectAnalyzer(str(tmp_path / 'Projects'), parser=parser, samples=True)
+    project_files = analyzer.find_ableton_projects()
+    scans = []
+    scandir = os.scandir
+    monkeypatch.setattr(ableton_project_analyzer.os, 'scandir', lambda path: scans.append(path) or scandir(path))
+    for project_file in project_files:
+        analyzer.process_batch([project_file])
+    project = analyzer.extract_project_info(tmp_path / 'Projects' / 'Song 0 Project' / 'Song 0.als')
+    assert project['samples'][3] == {'name': 'vox.wav', 'path': '/Volumes/Old/vox/vox.wav',
+                                     'relative_path': 'Samples/Recorded/vox.wav'}
+    # Gleiches Sample zweimal im Set, OriginalFileRef zählt nicht
+    assert len(project['samples']) == 4
+    
+    report = analyzer.missing_samples()
+    assert (report['total_projects'], report['total_references'], report['missing_references']) == (3, 12, 6)
+    missing = [sample['name'] for sample in report['projects'][0]['missing']]
+    assert missing == ['snare.wav', 'vox.wav'] and report['projects_with_missing_samples'] == 3
+    assert report['missing_samples'][0]['projects'] == 1
+    # Jedes Verzeichnis genau einmal gelistet, egal wie viele Sets es referenzieren
+    assert len(scans) == len(set(scans)) == report['directories_listed']
+    
+    monkeypatch.chdir(tmp_path)
+    analyzer.export_missing_samples('missing.json')
+    assert json.loads(Path('missing.json').read_text(encoding='utf-8'))['missing_references'] == 6
+    analyzer.export_to_excel('out.xlsx')
+    rows = list(openpyxl.load_workbook('out.xlsx')['Missing Samples'].iter_rows(values_only=True))
+    assert len(rows) == 7 and rows[1][2] == 'snare.wav'
+
+
+def test_only_project_relative_sample_paths_are_joined_onto_the_set_folder(tmp_path):
+    project_dir = tmp_path / 'Projects' / 'Song Project'
+    (project_dir / 'Samples').mkdir(parents=True)
+    (project_dir / 'Samples' / 'kick.wav').write_bytes(b'')
+    # Typ 2: relativ zur User Library, die es auf diesem Rechner nicht gibt
+    clips = (sample_ref_xml(relative='Samples/kick.wav', path='/Volumes/Old/User Library/Samples/kick.wav',
+                            relative_type='2')
+             + sample_ref_xml(relative='Samples/kick.wav', path='/Volumes/Old/Song Project/Samples/kick.wav'))
+    write_project(project_dir / 'Song.als', LIVE_SET.replace('<Scenes>', f'<Clips>{clips}</Clips><Scenes>'), 'xml')
+    
+    analyzer = AbletonProjectAnalyzer(str(tmp_path / 'Projects'), samples=True)
+    analyzer.analyze_projects(quiet=True, max_workers=1)
+    samples = analyzer.projects[0]['samples']
+    assert [sample['relative_path'] for sample in samples] == ['', 'Samples/kick.wav']
+    report = analyzer.missing_samples()
+    assert [sample['location'] for sample in report['projects'][0]['missing']] == [
+        '/Volumes/Old/User Library/Samples/kick.wav']
+
+
+def test_sample_names_can_be_compared_case_insensitively(tmp_path):
+    project_dir = tmp_path / 'Projects' / 'Song Project'
+    (project_dir / 'Samples').mkdir(parents=True)
+    (project_dir / 'Samples' / 'Kick.WAV').write_bytes(b'')
+    clips = sample_ref_xml(relative='Samples/kick.wav', path='/Volumes/Old/Song Project/Samples/kick.wav')
+    write_project(project_dir / 'Song.als', LIVE_SET.replace('<Scenes>', f'<Clips>{clips}</Clips><Scenes>'), 'xml')
+    
+    missing = []
+    for ignore_case in (False, True):
+        analyzer = AbletonProjectAnalyzer(str(tmp_path / 'Projects'), samples=True, samples_ignore_case=ignore_case)
+        analyzer.analyze_projects(quiet=True, max_workers=1)
+        missing.append(analyzer.missing_samples()['missing_references'])
+    assert missing == [1, 0]
+    listings = ableton_project_analyzer.DirectoryListingCache(ignore_case=True)
+    assert listings.exists(str(project_dir / 'Samples' / 'KICK.wav'))
+    assert not listings.exists(str(project_dir / 'Samples' / 'snare.wav'))
+
+
+# Import-Budget: Start eines leeren Interpreters plus Marge. pandas allein kostet mehr als die Marge,
+# openpyxl etwa so viel; die Prüfung auf geladene Module fängt auch numpy
+IMPORT_MARGIN_SECONDS = 0.25
+EXPORTER_DEPENDENCIES = ('numpy', 'pandas', 'openpyxl', 'pyarrow')
+
+STARTUP_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import ableton_project_analyzer
+imported = time.perf_counter() - started
+sys.argv = ['ableton_project_analyzer.py'] + sys.argv[1:]
+ableton_project_analyzer.main()
+print(json.dumps({'import_seconds': imported,
+                  'loaded': [name for name in %r if name in sys.modules]}))
+""" % (EXPORTER_DEPENDENCIES,)
+
+
+def bare_interpreter_seconds(runs=3):
+    """Best wall time of `python -c pass` on this machine"""
+    best = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'], check=True)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_cli(*args, cwd):
+    result = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT, *args], cwd=cwd, capture_output=True, text=True,
+                            env=dict(os.environ, PYTHONPATH=str(Path(ableton_project_analyzer.__file__).parent)))
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_json_run_starts_fast_without_loading_exporter_dependencies(tmp_path):
+    root = tmp_path / 'projects'
+    root.mkdir()
+    for index, fmt in enumerate(('zip', 'gzip', 'xml')):
+        write_project(root / f'Song {index}.als', LIVE_SET, fmt)
+    
+    lean = run_cli(str(root), '--json', 'out.json', '--db', 'out.db', '--quiet', cwd=tmp_path)
+    assert lean['loaded'] == []
+    assert lean['import_seconds'] < bare_interpreter_seconds() + IMPORT_MARGIN_SECONDS
+    assert len(json.loads((tmp_path / 'out.json').read_text(encoding='utf-8'))['projects']) == 3
+    
+    # Erst ein gewählter Exporter lädt seine Abhängigkeit (openpyxl zieht numpy selbst nach, falls installiert)
+    excel = run_cli(str(root), '--excel', 'out.xlsx', '--quiet', cwd=tmp_path)
+    assert 'openpyxl' in excel['loaded'] and 'pandas' not in excel['loaded']
+    assert (tmp_path / 'out.xlsx').exists()
+    
+    exporter = ableton_project_analyzer.EXPORTERS['excel']._replace(requires=('openpyxl', 'no_such_module'))
+    assert ableton_project_analyzer.missing_requirements([exporter]) == \
+        '--excel needs no_such_module (pip install no_such_module)'